@@ -6,6 +6,7 @@ from sqlalchemy.future import select
 from ..core.security import verify_token
 from ..db.base import get_db
 from ..db.models import User
+from ..services.user_cache import user_cache
 
 # Security scheme
 security = HTTPBearer()
@@ -15,7 +16,12 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
 ) -> User:
-    """Get current authenticated user."""
+    """Get current authenticated user.
+
+    Users are served from ``user_cache`` for a short TTL and dropped from it
+    whenever a transaction that changes them commits; a cached user is a
+    detached object without its password hash.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -27,6 +33,10 @@ async def get_current_user(
     if username is None:
         raise credentials_exception
 
+    user = await user_cache.get(username)
+    if user is not None:
+        return user
+
     # Get user from database
     result = await db.execute(
         select(User).where(User.username == username)
@@ -36,6 +46,7 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
 
+    await user_cache.set(user)
     return user
 
 
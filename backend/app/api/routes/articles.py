@@ -1,13 +1,29 @@
+import hashlib
 from datetime import datetime
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import func
+from sqlalchemy import DateTime, false, func, literal, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import contains_eager, joinedload, load_only, selectinload
 
-from ...db.base import get_db
-from ...db.models import Article, ArticleTag, NewsSource, Tag
+from ...core.config import settings
+from ...db.base import get_read_db
+from ...db.models import Article, ArticleTag, NewsSource, Tag, published_sort_key
+from ...services.article_counts import article_count_cache, estimate_article_count
+from ...services.response_cache import (
+    ARTICLE_LISTINGS_TAG,
+    LOCAL,
+    STALE,
+    article_cache,
+    article_detail_lru,
+    article_tag,
+)
+from ...utils.pagination import decode_cursor, encode_cursor
+from ...utils.search import build_tsquery
+from ...utils.serialization import JSONBytesResponse, dumps
 
 router = APIRouter()
 
@@ -29,118 +45,326 @@ class ArticleResponse(BaseModel):
 
 class ArticleListResponse(BaseModel):
     articles: list[ArticleResponse]
-    total: int
+    total: int | None
     page: int
     per_page: int
-    total_pages: int
+    total_pages: int | None
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
 
 
-@router.get("/", response_model=ArticleListResponse)
-async def get_articles(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
-    category: str | None = None,
-    search: str | None = None,
-    db: AsyncSession = Depends(get_db)
-):
-    """Get paginated list of articles."""
+def _article_load_options():
+    """Eager-load source and tags so a page costs a fixed number of queries.
+
+    The source is populated from the explicit ``join(NewsSource)`` of the
+    query and the tags are fetched with a single ``IN`` query per page.
+    Only the columns ``ArticleResponse`` needs are selected.
+    """
+    return (
+        load_only(
+            Article.id,
+            Article.title,
+            Article.url,
+            Article.summary,
+            Article.author,
+            Article.published_at,
+            Article.sentiment_score,
+        ),
+        contains_eager(Article.source).load_only(NewsSource.name),
+        selectinload(Article.tags).options(
+            load_only(ArticleTag.article_id),
+            joinedload(ArticleTag.tag).load_only(Tag.name),
+        ),
+    )
+
+
+def _article_row(article: Article) -> dict[str, Any]:
+    """Build the ``ArticleResponse`` payload of an eagerly loaded article.
+
+    The columns are already typed by the database, so rows are turned into
+    plain dicts instead of being validated field by field again.
+    """
+    return {
+        "id": article.id,
+        "title": article.title,
+        "url": article.url,
+        "summary": article.summary,
+        "author": article.author,
+        "published_at": article.published_at,
+        "sentiment_score": article.sentiment_score,
+        "source_name": article.source.name,
+        "tags": [article_tag.tag.name for article_tag in article.tags],
+    }
+
+
+# Listings leave out near-duplicates: their canonical article stands for
+# them (the estimate, from planner statistics, still includes them)
+_CANONICAL = Article.duplicate_of_id.is_(None)
+
+
+def _after_cursor(published_at: datetime | None, article_id: int):
+    """Keyset condition for rows after ``(published_at, id)`` in listing order."""
+    return tuple_(published_sort_key(Article.published_at), Article.id) < tuple_(
+        published_sort_key(literal(published_at, DateTime(timezone=True))),
+        article_id,
+    )
+
+
+async def _count_articles(
+    db: AsyncSession,
+    filters: list,
+    category: str | None,
+    search: str | None,
+    mode: str,
+) -> tuple[int | None, bool]:
+    """Resolve the listing total for ``mode``.
+
+    Returns the total (None when skipped) and whether it is an estimate.
+    """
+    if mode == "none":
+        return None, False
+
+    if mode == "estimate" and not filters:
+        estimate = await estimate_article_count(db)
+        if estimate is not None:
+            return estimate, True
+
+    key = (category, search)
+    cached, generation = await article_count_cache.get(key)
+    if cached is not None and mode != "exact":
+        return cached, False
+
+    count_query = select(func.count(Article.id))
+    if category:
+        count_query = count_query.join(NewsSource)
+    result = await db.execute(count_query.where(_CANONICAL, *filters))
+    total = result.scalar()
+    await article_count_cache.set(key, total, generation)
+    return total, False
+
+
+async def _load_articles(
+    db: AsyncSession,
+    page: int,
+    per_page: int,
+    category: str | None,
+    search: str | None,
+    position: tuple[datetime | None, int] | None,
+    total: str,
+    sort: str,
+) -> dict[str, Any]:
+    """Query one listing page as an ``ArticleListResponse`` payload."""
 
     # Build query
-    query = select(Article).join(NewsSource)
+    query = select(Article).join(NewsSource).options(*_article_load_options())
 
     # Add filters
+    filters = []
     if category:
-        query = query.where(NewsSource.category == category)
+        filters.append(NewsSource.category == category)
 
+    ts_query = None
     if search:
-        query = query.where(Article.title.contains(search))
+        tsquery_text = build_tsquery(search)
+        if tsquery_text is None:
+            # Nothing searchable in the input, so nothing can match
+            filters.append(false())
+        else:
+            ts_query = func.to_tsquery("english", tsquery_text)
+            filters.append(Article.search_vector.op("@@")(ts_query))
+
+    query = query.where(_CANONICAL, *filters)
 
     # Add ordering
-    query = query.order_by(Article.published_at.desc())
+    if sort == "relevance" and ts_query is not None:
+        query = query.order_by(func.ts_rank(Article.search_vector, ts_query).desc())
+    query = query.order_by(
+        published_sort_key(Article.published_at).desc(), Article.id.desc()
+    )
 
     # Get total count
-    count_query = select(func.count(Article.id))
-    if category:
-        count_query = count_query.select_from(Article.join(NewsSource)).where(NewsSource.category == category)
-    if search:
-        count_query = count_query.where(Article.title.contains(search))
-
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total_count, total_is_estimate = await _count_articles(
+        db, filters, category, search, total
+    )
 
-    # Apply pagination
-    offset = (page - 1) * per_page
-    query = query.offset(offset).limit(per_page)
+    # Apply pagination, fetching one extra row to detect a following page
+    if position:
+        query = query.where(_after_cursor(*position))
+    else:
+        query = query.offset((page - 1) * per_page)
+    query = query.limit(per_page + 1)
 
     # Execute query
     result = await db.execute(query)
     articles = result.scalars().all()
 
-    # Transform to response model
-    article_responses = []
-    for article in articles:
-        # Get tags for each article
-        tags_result = await db.execute(
-            select(Tag.name)
-            .select_from(Tag.join(ArticleTag))
-            .where(ArticleTag.article_id == article.id)
-        )
-        tags = list(tags_result.scalars().all())
-
-        article_responses.append(ArticleResponse(
-            id=article.id,
-            title=article.title,
-            url=article.url,
-            summary=article.summary,
-            author=article.author,
-            published_at=article.published_at,
-            sentiment_score=article.sentiment_score,
-            source_name=article.source.name,
-            tags=tags
-        ))
-
-    total_pages = (total + per_page - 1) // per_page
-
-    return ArticleListResponse(
-        articles=article_responses,
-        total=total,
-        page=page,
-        per_page=per_page,
-        total_pages=total_pages
-    )
+    next_cursor = None
+    if len(articles) > per_page:
+        articles = articles[:per_page]
+        if sort == "published":
+            last = articles[-1]
+            next_cursor = encode_cursor(last.published_at, last.id)
 
+    total_pages = None
+    if total_count is not None:
+        total_pages = (total_count + per_page - 1) // per_page
 
-@router.get("/{article_id}", response_model=ArticleResponse)
-async def get_article(
-    article_id: int,
-    db: AsyncSession = Depends(get_db)
-):
-    """Get a specific article by ID."""
+    return {
+        "articles": [_article_row(article) for article in articles],
+        "total": total_count,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages,
+        "total_is_estimate": total_is_estimate,
+        "next_cursor": next_cursor,
+    }
+
+
+def _make_etag(body: bytes) -> str:
+    """Strong ETag of a serialized response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag``.
 
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+async def _load_article(db: AsyncSession, article_id: int) -> dict[str, Any]:
+    """Query a single article payload or raise 404."""
     result = await db.execute(
-        select(Article).join(NewsSource).where(Article.id == article_id)
+        select(Article)
+        .join(NewsSource)
+        .options(*_article_load_options())
+        .where(Article.id == article_id)
     )
     article = result.scalar_one_or_none()
 
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
 
-    # Get tags
-    tags_result = await db.execute(
-        select(Tag.name)
-        .select_from(Tag.join(ArticleTag))
-        .where(ArticleTag.article_id == article.id)
-    )
-    tags = list(tags_result.scalars().all())
-
-    return ArticleResponse(
-        id=article.id,
-        title=article.title,
-        url=article.url,
-        summary=article.summary,
-        author=article.author,
-        published_at=article.published_at,
-        sentiment_score=article.sentiment_score,
-        source_name=article.source.name,
-        tags=tags
+    return _article_row(article)
+
+
+@router.get("/", response_model=ArticleListResponse, response_class=JSONBytesResponse)
+async def get_articles(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    category: str | None = None,
+    search: str | None = None,
+    cursor: str | None = None,
+    total: Literal["exact", "cached", "estimate", "none"] = "cached",
+    sort: Literal["published", "relevance"] = "published",
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get paginated list of articles.
+
+    Pass the ``next_cursor`` of a previous response as ``cursor`` to fetch
+    the following page by keyset instead of ``page`` offsets; the cost of a
+    cursor page does not grow with how far the client has scrolled.
+
+    ``total`` selects how the result count is computed: ``exact`` always
+    counts, ``cached`` reuses a recent exact count for the same filters,
+    ``estimate`` uses planner statistics for unfiltered listings (falling
+    back to ``cached``) and ``none`` skips the count entirely.
+
+    ``search`` is matched against the title, summary and content with
+    Postgres full-text search; ``"quoted phrases"`` and ``prefix*`` terms
+    are supported. ``sort=relevance`` orders matches by ``ts_rank`` and is
+    paginated by ``page`` only.
+
+    Responses are served from the Redis response cache; the ``X-Cache``
+    header reports HIT, STALE, MISS or BYPASS. Payloads are built as plain
+    data and serialized once with orjson, bypassing ``response_model``
+    validation (which still documents the schema).
+    """
+
+    if sort == "relevance" and not search:
+        raise HTTPException(status_code=400, detail="sort=relevance requires search")
+    if sort == "relevance" and cursor:
+        raise HTTPException(
+            status_code=400, detail="Cursor pagination requires sort=published"
+        )
+
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+    params = {
+        "page": 1 if position else page,
+        "per_page": per_page,
+        "category": category or None,
+        "search": search or None,
+        "cursor": cursor,
+        "total": total,
+        "sort": sort,
+    }
+
+    async def loader(session: AsyncSession):
+        listing = await _load_articles(
+            session, params["page"], per_page, category, search, position, total, sort
+        )
+        tags = [ARTICLE_LISTINGS_TAG, *(article_tag(a["id"]) for a in listing["articles"])]
+        return listing, tags
+
+    payload, cache_status = await article_cache.get_or_load(
+        article_cache.key("list", params),
+        loader,
+        db,
+        ttl=settings.ARTICLE_LIST_CACHE_TTL,
+        stale_ttl=settings.ARTICLE_CACHE_STALE_TTL,
     )
+    return JSONBytesResponse(payload, headers={"X-Cache": cache_status})
+
+
+@router.get("/{article_id}", response_model=ArticleResponse, response_class=JSONBytesResponse)
+async def get_article(
+    article_id: int,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a specific article by ID.
+
+    Responses carry a strong ``ETag`` (a hash of the serialized article) and
+    a matching ``If-None-Match`` gets an empty 304. Serialized details are
+    kept in a size-bounded in-process LRU in front of the Redis cache.
+    """
+
+    cached = article_detail_lru.get(article_id)
+    if cached is not None:
+        etag, body = cached
+        cache_status = LOCAL
+    else:
+        async def loader(session: AsyncSession):
+            article = await _load_article(session, article_id)
+            return article, [article_tag(article_id)]
+
+        payload, cache_status = await article_cache.get_or_load(
+            article_cache.key("detail", {"id": article_id}),
+            loader,
+            db,
+            ttl=settings.ARTICLE_DETAIL_CACHE_TTL,
+            stale_ttl=settings.ARTICLE_CACHE_STALE_TTL,
+        )
+        body = dumps(payload)
+        etag = _make_etag(body)
+        if cache_status != STALE:
+            # Never fresher locally than in Redis: set() caps this at the
+            # LRU's own ARTICLE_DETAIL_LRU_TTL
+            article_detail_lru.set(
+                article_id, etag, body, ttl=settings.ARTICLE_DETAIL_CACHE_TTL
+            )
+
+    headers = {"ETag": etag, "X-Cache": cache_status}
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONBytesResponse(body, headers=headers)
@@ -1,15 +1,22 @@
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, ConfigDict, EmailStr
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from ...core.config import settings
-from ...core.security import create_access_token, get_password_hash, verify_password
+from ...core.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_and_update_password_async,
+)
 from ...db.base import get_db
 from ...db.models import User
+from ...services.login_throttle import login_throttle
 
 router = APIRouter()
 
@@ -40,49 +47,69 @@ async def register(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Register a new user."""
-    # Check if user exists
-    result = await db.execute(
-        select(User).where(
-            (User.email == user_data.email) | (User.username == user_data.username)
+    """Register a new user.
+
+    The user is created by a single ``INSERT ... ON CONFLICT DO NOTHING
+    RETURNING`` statement, so a duplicate email or username (including one
+    inserted concurrently) yields no row and a 400 instead of an
+    IntegrityError. ``get_db`` commits the transaction.
+    """
+    hashed_password = await get_password_hash_async(user_data.password)
+    db_user = await db.scalar(
+        insert(User)
+        .values(
+            email=user_data.email,
+            username=user_data.username,
+            hashed_password=hashed_password,
         )
+        .on_conflict_do_nothing()
+        .returning(User)
     )
-    existing_user = result.scalar_one_or_none()
 
-    if existing_user:
+    if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email or username already registered"
         )
 
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    db_user = User(
-        email=user_data.email,
-        username=user_data.username,
-        hashed_password=hashed_password
-    )
-
-    db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
-
     return db_user
 
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
-    """Login and get access token."""
+    """Login and get access token.
+
+    Attempts are throttled per username and per client IP before the user
+    is looked up or any password is hashed; over-limit attempts get a 429.
+    Behind a proxy listed in ``FORWARDED_ALLOW_IPS`` the client IP is the
+    one it forwards in ``X-Forwarded-For``.
+    """
+    retry_after = await login_throttle.check(
+        form_data.username, request.client.host if request.client else None
+    )
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
     # Get user
     result = await db.execute(
         select(User).where(User.username == form_data.username)
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await verify_and_update_password_async(
+            form_data.password, user.hashed_password
+        )
+    if not valid:
         # Tests expect 400 for invalid credentials
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -95,6 +122,12 @@ async def login(
             detail="Inactive user"
         )
 
+    # Store the hash at the current cost (see setup_password_hashing)
+    if new_hash:
+        await db.execute(
+            update(User).where(User.id == user.id).values(hashed_password=new_hash)
+        )
+
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy import text
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...db.base import get_db
+from ...core.security import token_cache
+from ...db.base import get_read_db
+from ...db.models import NewsSource
 
 router = APIRouter()
 
@@ -13,8 +15,32 @@ async def health_check():
     return {"status": "healthy", "service": "AI News Aggregator API"}
 
 
+@router.get("/caches")
+async def cache_stats():
+    """Hit/miss counters of in-process caches."""
+    return {"tokens": token_cache.stats()}
+
+
+@router.get("/polling")
+async def polling_schedule(db: AsyncSession = Depends(get_read_db)):
+    """Feed polling schedule of active sources, soonest due first."""
+    result = await db.execute(
+        select(
+            NewsSource.id,
+            NewsSource.name,
+            NewsSource.poll_interval,
+            NewsSource.poll_misses,
+            NewsSource.last_fetched_at,
+            NewsSource.next_poll_at,
+        )
+        .where(NewsSource.is_active.is_(True), NewsSource.rss_url.is_not(None))
+        .order_by(NewsSource.next_poll_at.asc().nulls_first(), NewsSource.id)
+    )
+    return {"sources": [dict(row._mapping) for row in result]}
+
+
 @router.get("/db")
-async def database_health(db: AsyncSession = Depends(get_db)):
+async def database_health(db: AsyncSession = Depends(get_read_db)):
     """Database health check endpoint."""
     try:
         # Test database connection
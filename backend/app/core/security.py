@@ -1,14 +1,73 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing pool has no room for more work."""
+
+
+class PasswordHashPool:
+    """Bounded worker pool for bcrypt, keeping it off the event loop.
+
+    At most ``max_workers`` hashes run at once (bcrypt releases the GIL, so
+    threads run them in parallel) and at most ``max_pending`` more wait for
+    a worker. Anything beyond that is rejected immediately with
+    ``PasswordHashingBusy`` instead of queueing behind seconds of work.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        # in_flight is released from worker threads
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` on the pool, or fail fast if it is full."""
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_pending:
+                raise PasswordHashingBusy
+            self.in_flight += 1
+        future = self._executor.submit(func, *args)
+        # Released when the hash is done, not when the caller stops waiting:
+        # a cancelled request (e.g. a client disconnect) leaves its hash
+        # running on a worker
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _: Future[Any]) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
 
 def create_access_token(
     subject: str | Any, expires_delta: timedelta = None
@@ -28,6 +87,53 @@ def create_access_token(
     return encoded_jwt
 
 
+def calibrate_bcrypt_rounds(
+    target_ms: float, min_rounds: int, max_rounds: int = 16, probe_rounds: int = 8
+) -> int:
+    """Pick the highest bcrypt cost whose hash time stays within ``target_ms``.
+
+    Times a few cheap hashes at ``probe_rounds`` and extrapolates, since
+    every extra round doubles the work. The result is clamped to
+    ``[min_rounds, max_rounds]``.
+    """
+    hasher = pwd_context.handler("bcrypt").using(rounds=probe_rounds)
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        hasher.hash("calibration")
+        timings.append(time.perf_counter() - start)
+    probe_seconds = min(timings)
+    rounds = probe_rounds + math.floor(math.log2(target_ms / 1000 / probe_seconds))
+    return max(min_rounds, min(max_rounds, rounds))
+
+
+def configure_bcrypt_rounds(rounds: int) -> None:
+    """Hash with ``rounds`` and flag hashes of a lower cost for rehashing.
+
+    Costlier hashes are kept: workers whose calibrations differ by a round
+    only ever rehash upwards, instead of flipping a user's hash between
+    their costs on every login.
+    """
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+def setup_password_hashing() -> int:
+    """Configure the bcrypt cost at startup and return it.
+
+    Uses ``BCRYPT_ROUNDS`` when set, otherwise calibrates against
+    ``PASSWORD_HASH_TARGET_MS`` on this machine. A calibrated cost never
+    downgrades stored hashes (see ``configure_bcrypt_rounds``).
+    """
+    rounds = settings.BCRYPT_ROUNDS
+    if rounds is None:
+        rounds = calibrate_bcrypt_rounds(
+            settings.PASSWORD_HASH_TARGET_MS, min_rounds=settings.BCRYPT_MIN_ROUNDS
+        )
+    configure_bcrypt_rounds(rounds)
+    logger.info("Hashing passwords with bcrypt cost %d", rounds)
+    return rounds
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -38,13 +144,96 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password and rehash it if its cost is no longer current.
+
+    Returns whether it matched and the replacement hash, if any.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """``verify_and_update_password`` on the password hashing pool."""
+    return await password_hash_pool.run(
+        verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hashing pool."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified tokens that forgets each one at its ``exp``.
+
+    Maps the raw token to its subject so repeated requests with the same
+    token skip decoding and signature verification. ``hits`` and ``misses``
+    count lookups; only valid tokens with an expiry are ever stored.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> str | None:
+        """Return the subject of a cached, unexpired ``token``."""
+        entry = self._entries.get(token)
+        if entry is not None:
+            expires_at, subject = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return subject
+            del self._entries[token]
+        self.misses += 1
+        return None
+
+    def set(self, token: str, subject: str, expires_at: float) -> None:
+        """Store a verified ``token`` until ``expires_at`` (a UNIX time)."""
+        if self.max_entries <= 0 or expires_at <= time.time():
+            return
+        self._entries[token] = (expires_at, subject)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        """Counters for monitoring the hit rate."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+token_cache = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_SIZE)
+
+
 def verify_token(token: str) -> str | None:
     """Verify JWT token and return the subject."""
+    subject = token_cache.get(token)
+    if subject is not None:
+        return subject
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         token_data = payload.get("sub")
-        return token_data
     except jwt.JWTError:
         return None
+    expires_at = payload.get("exp")
+    if isinstance(token_data, str) and isinstance(expires_at, int | float):
+        token_cache.set(token, token_data, expires_at)
+    return token_data
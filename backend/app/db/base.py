@@ -1,10 +1,28 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from ..core.config import settings
 
-# Convert postgres:// to postgresql:// for SQLAlchemy 2.0
-DATABASE_URL = str(settings.DATABASE_URL).replace("postgresql://", "postgresql+asyncpg://")
+logger = logging.getLogger(__name__)
+
+
+def _async_url(url) -> str:
+    """Convert postgres:// to postgresql+asyncpg:// for SQLAlchemy 2.0."""
+    return str(url).replace("postgresql://", "postgresql+asyncpg://")
+
+
+DATABASE_URL = _async_url(settings.DATABASE_URL)
 
 # Create async engine
 engine = create_async_engine(DATABASE_URL, echo=settings.DEBUG)
@@ -16,6 +34,32 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+
+def read_only_sessionmaker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Session factory whose transactions start as ``BEGIN READ ONLY``."""
+    return async_sessionmaker(
+        bind=bind.execution_options(postgresql_readonly=True),
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+# Read-only sessions on the replica pool when configured, else the primary
+AsyncPrimaryReadSessionLocal = read_only_sessionmaker(engine)
+if settings.READ_DATABASE_URL:
+    read_engine = create_async_engine(
+        _async_url(settings.READ_DATABASE_URL),
+        echo=settings.DEBUG,
+        connect_args={"timeout": settings.READ_DATABASE_CONNECT_TIMEOUT},
+    )
+    AsyncReadSessionLocal = read_only_sessionmaker(read_engine)
+else:
+    read_engine = engine
+    AsyncReadSessionLocal = AsyncPrimaryReadSessionLocal
+
+# Monotonic time before which reads skip a replica that failed
+_replica_retry_at = 0.0
+
 # Base class for all models
 class Base(DeclarativeBase):
     pass
@@ -33,3 +77,45 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+
+
+def _replica_error(error: Exception) -> bool:
+    """Whether ``error`` means the replica itself is unreachable."""
+    return isinstance(error, OSError) or (
+        isinstance(error, DBAPIError) and error.connection_invalidated
+    )
+
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """A read-only session on the replica, or on the primary while it is down.
+
+    Nothing connects until the first query, so requests answered from a
+    cache never touch either database. A query that cannot reach the
+    replica fails, and reads go to the primary for
+    ``READ_DATABASE_RETRY_AFTER`` seconds before the replica is tried again.
+    """
+    global _replica_retry_at
+    on_replica = (
+        AsyncReadSessionLocal is not AsyncPrimaryReadSessionLocal
+        and time.monotonic() >= _replica_retry_at
+    )
+    factory = AsyncReadSessionLocal if on_replica else AsyncPrimaryReadSessionLocal
+    async with factory() as session:
+        try:
+            yield session
+        except (DBAPIError, OSError) as e:
+            if on_replica and _replica_error(e):
+                _replica_retry_at = time.monotonic() + settings.READ_DATABASE_RETRY_AFTER
+                logger.warning("Read replica unavailable, using the primary", exc_info=True)
+            raise
+
+
+async def get_read_db() -> AsyncSession:
+    """Get a read-only database session for GET routes.
+
+    The transaction is opened read-only and is never committed; closing the
+    session simply ends it.
+    """
+    async with read_session() as session:
+        yield session
@@ -1,16 +1,24 @@
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
+    SmallInteger,
     String,
     Text,
+    literal_column,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
+from ..utils.urls import canonicalize_url
 from .base import Base
 
 
@@ -40,9 +48,19 @@ class NewsSource(Base):
     url = Column(String, nullable=False)
     rss_url = Column(String)
     is_active = Column(Boolean, default=True)
-    category = Column(String)
+    category = Column(String, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Feed polling state: validators for conditional GETs of rss_url
+    etag = Column(String)
+    last_modified = Column(String)
+    last_fetched_at = Column(DateTime(timezone=True))
+    # Adaptive schedule: current interval (seconds), next poll and how many
+    # polls in a row found nothing new
+    poll_interval = Column(Float)
+    next_poll_at = Column(DateTime(timezone=True))
+    poll_misses = Column(Integer, default=0)
+
     # Relationships
     articles = relationship("Article", back_populates="source")
 
@@ -54,13 +72,55 @@ class Article(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
     url = Column(String, nullable=False, unique=True)
-    content = Column(Text)
+    # Duplicate detection key (see canonicalize_url). NULL only on rows
+    # that duplicated an older article before canonical URLs existed.
+    canonical_url = Column(
+        String,
+        unique=True,
+        default=lambda context: canonicalize_url(context.get_current_parameters()["url"]),
+    )
+    # Full bodies are large and not part of API responses: load on demand
+    content = deferred(Column(Text))
     summary = Column(Text)
     author = Column(String)
     published_at = Column(DateTime(timezone=True))
     scraped_at = Column(DateTime(timezone=True), server_default=func.now())
     is_processed = Column(Boolean, default=False)
     sentiment_score = Column(Float)
+    # Worker lease on an unprocessed article: who claimed it and until when
+    processing_claim = Column(String)
+    processing_lease_until = Column(DateTime(timezone=True))
+    # Near-duplicate detection: the MinHash signature of a canonical
+    # article's text, indexed in article_lsh_buckets. Near-duplicates (e.g.
+    # syndicated copies) link to their canonical article instead and are
+    # stored already processed.
+    minhash = deferred(Column(LargeBinary))
+    duplicate_of_id = Column(
+        Integer, ForeignKey("articles.id", ondelete="SET NULL"), index=True
+    )
+
+    # Full-text search document, maintained by Postgres
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'C')",
+            persisted=True,
+        ),
+    ))
+    # Embedding passes read only articles whose text changed since they
+    # were last embedded: text_digest is maintained by Postgres on every
+    # write, embedded_digest is its value when the text was embedded
+    text_digest = deferred(Column(
+        LargeBinary,
+        Computed(
+            "decode(md5(md5(coalesce(title, '')) || md5(coalesce(summary, '')) || "
+            "md5(coalesce(content, ''))), 'hex')",
+            persisted=True,
+        ),
+    ))
+    embedded_digest = deferred(Column(LargeBinary))
 
     # Foreign keys
     source_id = Column(Integer, ForeignKey("news_sources.id"), nullable=False)
@@ -69,6 +129,60 @@ class Article(Base):
     source = relationship("NewsSource", back_populates="articles")
     tags = relationship("ArticleTag", back_populates="article")
 
+    __table_args__ = (
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+        # Processing backlog: stays small however many articles are stored
+        Index(
+            "ix_articles_unprocessed",
+            "id",
+            postgresql_where=literal_column("is_processed IS NOT TRUE"),
+        ),
+        # Embedding backlog: new and changed canonical articles
+        Index(
+            "ix_articles_unembedded",
+            "id",
+            postgresql_where=literal_column(
+                "is_processed IS TRUE AND duplicate_of_id IS NULL "
+                "AND embedded_digest IS DISTINCT FROM text_digest"
+            ),
+        ),
+    )
+
+
+def published_sort_key(published_at):
+    """Listing sort key for ``published_at``: NULL sorts below every date.
+
+    Unlike ``NULLS LAST`` this keeps the key a single comparable value, so
+    keyset predicates on ``(key, id)`` can be answered from the index below.
+    """
+    return func.coalesce(published_at, literal_column("'-infinity'::timestamptz"))
+
+
+# Listing order and cursor pagination
+Index(
+    "ix_articles_published_at_id",
+    published_sort_key(Article.published_at).desc(),
+    Article.id.desc(),
+)
+# Source/category filtered listings and the source_id foreign key
+Index(
+    "ix_articles_source_id_published_at_id",
+    Article.source_id,
+    published_sort_key(Article.published_at).desc(),
+    Article.id.desc(),
+)
+
+
+class ArticleLshBucket(Base):
+    """One LSH band bucket of a canonical article's MinHash signature."""
+    __tablename__ = "article_lsh_buckets"
+
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    article_id = Column(
+        Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True
+    )
+
 
 class Tag(Base):
     """Content tags for categorization."""
@@ -95,6 +209,11 @@ class ArticleTag(Base):
     article = relationship("Article", back_populates="tags")
     tag = relationship("Tag", back_populates="articles")
 
+    __table_args__ = (
+        Index("ix_article_tags_article_id_tag_id", "article_id", "tag_id"),
+        Index("ix_article_tags_tag_id_article_id", "tag_id", "article_id"),
+    )
+
 
 class UserPreference(Base):
     """User preferences for content personalization."""
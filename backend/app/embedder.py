@@ -0,0 +1,31 @@
+"""Embedding stage: encodes processed articles with sentence-transformers
+into the on-disk ``EmbeddingStore``.
+
+Run a single instance with ``python -m app.embedder``; see
+``ArticleEmbedder`` for how unchanged articles are skipped.
+"""
+import asyncio
+import logging
+import signal
+
+from .core.config import settings
+from .db.base import AsyncSessionLocal
+from .services.embeddings import ArticleEmbedder, SentenceEncoder, run_embedder
+from .utils.embedding_store import EmbeddingStore
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    encoder = SentenceEncoder(settings.EMBEDDING_MODEL, settings.EMBEDDING_BATCH_SIZE)
+    store = EmbeddingStore(settings.EMBEDDING_STORE_DIR, encoder.model_name, encoder.dim)
+    embedder = ArticleEmbedder(store, encoder, chunk_size=settings.EMBEDDING_CHUNK_SIZE)
+    await run_embedder(AsyncSessionLocal, embedder, stop, settings.EMBEDDING_INTERVAL)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    asyncio.run(main())
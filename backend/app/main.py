@@ -1,9 +1,23 @@
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import JSONResponse
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 from .api.routes import articles, auth, health
 from .core.config import settings
+from .core.security import PasswordHashingBusy, setup_password_hashing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Calibrate password hashing for this machine before serving."""
+    setup_password_hashing()
+    yield
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -12,6 +26,7 @@ app = FastAPI(
     description="Modern AI-powered news aggregator",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -30,6 +45,20 @@ app.add_middleware(
     allowed_hosts=["localhost", "127.0.0.1", "*"]
 )
 
+# Behind a trusted proxy, request.client is the client it forwards for
+if settings.FORWARDED_ALLOW_IPS:
+    app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=settings.FORWARDED_ALLOW_IPS)
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    """Shed authentication load instead of queueing it."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Include routers
 app.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
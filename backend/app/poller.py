@@ -0,0 +1,57 @@
+"""Feed poller: ingests each source's feed as it falls due, then extracts
+the bodies of new articles from their pages.
+
+Run a single instance with ``python -m app.poller``; see ``PollScheduler``
+for how sources are scheduled.
+"""
+import asyncio
+import logging
+import os
+import signal
+
+from .core.config import settings
+from .db.base import AsyncSessionLocal
+from .services.content_extraction import ContentExtractor, ExtractionStage
+from .services.feed_fetcher import FeedFetcher, create_http_client
+from .services.near_duplicates import near_duplicates
+from .services.poll_scheduler import poll_scheduler, run_poller
+from .services.seen_urls import seen_urls
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    async with create_http_client() as client:
+        fetcher = FeedFetcher(
+            client,
+            per_host_limit=settings.FEED_PER_HOST_LIMIT,
+            seen=seen_urls,
+            duplicates=near_duplicates,
+        )
+        extractor = ContentExtractor(
+            workers=settings.EXTRACTION_WORKERS or os.cpu_count() or 1,
+            timeout=settings.EXTRACTION_TIMEOUT,
+            memory_limit=settings.EXTRACTION_MEMORY_LIMIT,
+        )
+        extraction = ExtractionStage(
+            extractor,
+            AsyncSessionLocal,
+            client,
+            queue_size=settings.EXTRACTION_QUEUE_SIZE,
+            max_document_bytes=settings.EXTRACTION_MAX_DOCUMENT_BYTES,
+        )
+        extraction.start()
+        try:
+            await run_poller(AsyncSessionLocal, poll_scheduler, fetcher, stop, extraction)
+        finally:
+            await extraction.close()
+            extractor.close()
+            await seen_urls.save()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import logging
+from collections.abc import Hashable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleCountCache:
+    """Redis cache of exact article counts keyed by filter combination.
+
+    Shared by every worker, so an invalidation by the poller reaches the
+    API at once. Each count is stored with the generation it was computed
+    in; ``invalidate()`` bumps the generation, which turns every stored
+    count into a miss. A count computed from rows read before an
+    invalidation is stored under the older generation, so it is never
+    served after it. Entries also expire after ``ttl`` seconds. Redis
+    errors are logged and treated as misses.
+    """
+
+    def __init__(self, redis_url: str, ttl: int, prefix: str = "article_counts") -> None:
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.prefix = prefix
+        self._redis: Redis | None = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            )
+        return self._redis
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.prefix}:generation"
+
+    def _key(self, key: Hashable) -> str:
+        digest = hashlib.sha256(json.dumps(key, default=str).encode()).hexdigest()[:32]
+        return f"{self.prefix}:{digest}"
+
+    async def get(self, key: Hashable) -> tuple[int | None, int]:
+        """Return the count for ``key`` (None when missing, expired or
+        invalidated) and the current generation, to pass to ``set``.
+        """
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._generation_key)
+                pipe.get(self._key(key))
+                generation, entry = await pipe.execute()
+        except RedisError:
+            logger.warning("Article count cache unavailable", exc_info=True)
+            return None, -1
+        try:
+            generation = int(generation or 0)
+        except ValueError:
+            logger.warning("Discarding corrupt article count generation")
+            return None, -1
+        if entry is None:
+            return None, generation
+        try:
+            stored_generation, count = map(int, entry.split(b":"))
+        except ValueError:
+            # Overwritten by the caller's set, like any miss
+            logger.warning("Discarding corrupt article count entry")
+            return None, generation
+        return (count if stored_generation == generation else None), generation
+
+    async def set(self, key: Hashable, count: int, generation: int) -> None:
+        """Store ``count`` for ``key``, computed in ``generation``."""
+        if generation < 0:
+            return
+        try:
+            await self.redis.set(self._key(key), f"{generation}:{count}", ex=self.ttl)
+        except RedisError:
+            logger.warning("Article count cache write failed", exc_info=True)
+
+    async def invalidate(self) -> None:
+        """Drop every cached count."""
+        try:
+            await self.redis.incr(self._generation_key)
+        except RedisError:
+            logger.warning("Article count cache invalidation failed", exc_info=True)
+
+
+article_count_cache = ArticleCountCache(
+    settings.REDIS_URL,
+    ttl=settings.ARTICLE_COUNT_CACHE_TTL,
+)
+
+
+async def invalidate_article_counts() -> None:
+    """Invalidate cached article totals after articles are added or removed."""
+    await article_count_cache.invalidate()
+
+
+async def estimate_article_count(db: AsyncSession) -> int | None:
+    """Estimate the number of articles from Postgres planner statistics.
+
+    Returns None when the table has never been analyzed.
+    """
+    result = await db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = 'articles'::regclass")
+    )
+    reltuples = result.scalar()
+    if reltuples is None or reltuples < 0:
+        return None
+    return int(reltuples)
@@ -0,0 +1,264 @@
+import logging
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from uuid import uuid4
+
+from sqlalchemy import (
+    ARRAY,
+    Float,
+    Integer,
+    Text,
+    bindparam,
+    delete,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..db.models import Article, ArticleTag, Tag
+from .response_cache import invalidate_articles
+
+logger = logging.getLogger(__name__)
+
+# Extractive summaries keep the first sentences of the body, up to this size
+SUMMARY_SENTENCES = 2
+SUMMARY_MAX_CHARS = 500
+
+_POSITIVE_WORDS = frozenset(
+    "gain gains growth improve improved improves success successful win wins "
+    "breakthrough record strong boost boosts beat beats rise rises surge "
+    "promising benefit benefits advance advances launch launches".split()
+)
+_NEGATIVE_WORDS = frozenset(
+    "loss losses decline declines fail fails failure crash crashes weak "
+    "drop drops fall falls risk risks breach breaches lawsuit layoffs cut "
+    "cuts warning warns outage vulnerability delay delays".split()
+)
+# Tag name -> words that mark an article as being about it
+TOPIC_KEYWORDS = {
+    "ai": {"ai", "model", "models", "llm", "inference", "neural", "gpt", "machine-learning"},
+    "security": {"security", "breach", "vulnerability", "malware", "ransomware", "exploit"},
+    "hardware": {"chip", "chips", "processor", "gpu", "accelerator", "semiconductor"},
+    "software": {"software", "database", "release", "open", "source", "framework"},
+    "science": {"science", "research", "galaxy", "telescope", "physics", "study"},
+    "business": {"market", "revenue", "earnings", "startup", "acquisition", "funding"},
+}
+
+_MARKUP = re.compile(r"<[^>]+>")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z][a-z\-]*")
+
+
+@dataclass
+class ClaimedArticle:
+    """The fields of a claimed article the analysis reads."""
+
+    id: int
+    title: str
+    summary: str | None
+    content: str | None
+
+
+@dataclass
+class ArticleAnalysis:
+    """What processing adds to an article."""
+
+    summary: str | None
+    sentiment_score: float
+    # Tag name -> confidence in [0, 1]
+    tags: dict[str, float] = field(default_factory=dict)
+
+
+Analyzer = Callable[[ClaimedArticle], ArticleAnalysis]
+
+
+def _plain_text(value: str | None) -> str:
+    return " ".join(_MARKUP.sub(" ", value or "").split())
+
+
+def _summarize(content: str) -> str | None:
+    sentences = _SENTENCE_END.split(content)
+    summary = " ".join(sentences[:SUMMARY_SENTENCES]).strip()
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = summary[:SUMMARY_MAX_CHARS].rsplit(" ", 1)[0] + "…"
+    return summary or None
+
+
+def analyze_article(article: ClaimedArticle) -> ArticleAnalysis:
+    """Summarize, score and tag an article with lightweight heuristics.
+
+    The feed's summary is kept when there is one, otherwise the first
+    sentences of the body stand in. Sentiment is the balance of positive
+    and negative words in [-1, 1]; tags come from ``TOPIC_KEYWORDS``.
+    """
+    content = _plain_text(article.content)
+    summary = _plain_text(article.summary) or _summarize(content)
+    words = _WORD.findall(f"{article.title} {summary or ''} {content}".lower())
+
+    positive = sum(word in _POSITIVE_WORDS for word in words)
+    negative = sum(word in _NEGATIVE_WORDS for word in words)
+    sentiment = (positive - negative) / (positive + negative) if positive + negative else 0.0
+
+    tags = {}
+    for tag, keywords in TOPIC_KEYWORDS.items():
+        hits = sum(word in keywords for word in words)
+        if hits:
+            tags[tag] = min(1.0, hits / 3)
+    return ArticleAnalysis(summary=summary, sentiment_score=sentiment, tags=tags)
+
+
+async def claim_articles(
+    db: AsyncSession, batch_size: int, lease_seconds: float
+) -> tuple[str, list[ClaimedArticle]]:
+    """Lease up to ``batch_size`` unprocessed articles to the caller.
+
+    Rows other workers are claiming right now are skipped rather than
+    waited for (``FOR UPDATE SKIP LOCKED``), and rows under a live lease
+    are left alone, so concurrent workers always get disjoint batches.
+    Leases that ran out, e.g. because their worker died, are claimed
+    again. Commit to publish the claim; returns its token and the rows.
+    """
+    token = uuid4().hex
+    candidates = (
+        select(Article.id)
+        .where(
+            Article.is_processed.is_not(True),
+            or_(
+                Article.processing_lease_until.is_(None),
+                Article.processing_lease_until < func.now(),
+            ),
+        )
+        .order_by(Article.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("candidates")
+    )
+    result = await db.execute(
+        update(Article)
+        .where(Article.id == candidates.c.id)
+        .values(
+            processing_claim=token,
+            processing_lease_until=func.now() + timedelta(seconds=lease_seconds),
+        )
+        .returning(Article.id, Article.title, Article.summary, Article.content)
+        .execution_options(synchronize_session=False)
+    )
+    claimed = [ClaimedArticle(*row) for row in result]
+    claimed.sort(key=lambda article: article.id)
+    return token, claimed
+
+
+def _complete_from_arrays():
+    """``UPDATE articles ... FROM unnest(<one array per column>)``, like ingestion."""
+    table = Article.__table__
+    done = func.unnest(
+        bindparam("ids", type_=ARRAY(Integer)),
+        bindparam("summaries", type_=ARRAY(Text)),
+        bindparam("scores", type_=ARRAY(Float)),
+    ).table_valued("id", "summary", "sentiment_score").render_derived(name="done")
+    return (
+        update(table)
+        .where(table.c.id == done.c.id, table.c.processing_claim == bindparam("token"))
+        .values(
+            summary=done.c.summary,
+            sentiment_score=done.c.sentiment_score,
+            is_processed=True,
+            processing_claim=None,
+            processing_lease_until=None,
+        )
+        .returning(table.c.id)
+    )
+
+
+async def complete_articles(
+    db: AsyncSession, token: str, analyses: dict[int, ArticleAnalysis]
+) -> list[int]:
+    """Store the analyses of a claim and mark its articles processed.
+
+    Only articles still held under ``token`` are written: when a lease ran
+    out and another worker took the article over, or ingestion changed it
+    meanwhile, this worker's result is dropped. Returns the ids written;
+    the caller commits.
+    """
+    if not analyses:
+        return []
+    ids = list(analyses)
+    result = await db.execute(
+        _complete_from_arrays(),
+        {
+            "ids": ids,
+            "summaries": [analyses[i].summary for i in ids],
+            "scores": [analyses[i].sentiment_score for i in ids],
+            "token": token,
+        },
+    )
+    completed = sorted(result.scalars())
+    if completed:
+        await _replace_tags(db, {i: analyses[i].tags for i in completed})
+    return completed
+
+
+async def _replace_tags(db: AsyncSession, tags: dict[int, dict[str, float]]) -> None:
+    await db.execute(delete(ArticleTag).where(ArticleTag.article_id.in_(tags)))
+    names = sorted({name for article_tags in tags.values() for name in article_tags})
+    if not names:
+        return
+    await db.execute(
+        insert(Tag)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=[Tag.name])
+    )
+    tag_ids = dict((await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))).all())
+    await db.execute(
+        insert(ArticleTag),
+        [
+            {"article_id": article_id, "tag_id": tag_ids[name], "confidence": confidence}
+            for article_id, article_tags in tags.items()
+            for name, confidence in article_tags.items()
+        ],
+    )
+
+
+def _analyze_all(
+    claimed: Iterable[ClaimedArticle], analyze: Analyzer
+) -> dict[int, ArticleAnalysis]:
+    analyses = {}
+    for article in claimed:
+        try:
+            analyses[article.id] = analyze(article)
+        except Exception:
+            # Left claimed: it is retried once the lease runs out
+            logger.exception("Processing article %s failed", article.id)
+    return analyses
+
+
+async def process_article_batch(
+    session_factory: async_sessionmaker[AsyncSession],
+    batch_size: int,
+    lease_seconds: float,
+    analyze: Analyzer = analyze_article,
+) -> int:
+    """Claim, analyze and complete one batch; return how many were claimed.
+
+    The claim and the results are committed in two short transactions so
+    no row lock is held while articles are analyzed. Returns 0 once the
+    backlog has nothing left to claim.
+    """
+    async with session_factory() as session:
+        token, claimed = await claim_articles(session, batch_size, lease_seconds)
+        await session.commit()
+    if not claimed:
+        return 0
+
+    analyses = _analyze_all(claimed, analyze)
+    async with session_factory() as session:
+        completed = await complete_articles(session, token, analyses)
+        await session.commit()
+    if completed:
+        await invalidate_articles(completed)
+    return len(claimed)
@@ -0,0 +1,356 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import signal
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+import httpx
+from bs4 import BeautifulSoup
+from sqlalchemy import ARRAY, Integer, Text, bindparam, func, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..db.models import Article
+from .response_cache import invalidate_articles
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Tags that never hold article text
+_BOILERPLATE_TAGS = [
+    "script", "style", "noscript", "template", "nav", "header", "footer",
+    "aside", "form", "iframe", "svg", "button", "figure",
+]
+# class/id fragments of page furniture
+_BOILERPLATE_HINT = re.compile(
+    r"comment|share|social|related|promo|sponsor|advert|\bads?\b|cookie|"
+    r"newsletter|subscribe|sidebar|breadcrumb|popup|banner",
+    re.IGNORECASE,
+)
+# Shorter paragraphs are captions, bylines and buttons rather than text
+MIN_PARAGRAPH_CHARS = 40
+
+# Reasons an extraction produced no content
+TIMEOUT = "timeout"
+MEMORY = "memory"
+CRASHED = "crashed"
+
+
+def _is_boilerplate(tag) -> bool:
+    if tag.attrs is None:
+        return False
+    hints = " ".join([*tag.get("class", []), tag.get("id") or ""])
+    return bool(hints) and _BOILERPLATE_HINT.search(hints) is not None
+
+
+def extract_content(html: str) -> str | None:
+    """Main text of an article page, as paragraphs separated by blank lines.
+
+    Drops page furniture (navigation, scripts, comments, share widgets,
+    ...) and keeps the paragraphs of the container holding the most
+    paragraph text, preferring an ``<article>`` element when there is one.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(_is_boilerplate):
+        if not tag.decomposed:
+            tag.decompose()
+
+    roots = soup.find_all("article") or [soup.body or soup]
+    scores: dict[int, tuple[int, object]] = {}
+    for root in roots:
+        for paragraph in root.find_all("p"):
+            length = len(paragraph.get_text(" ", strip=True))
+            if length >= MIN_PARAGRAPH_CHARS:
+                score, _ = scores.get(id(paragraph.parent), (0, None))
+                scores[id(paragraph.parent)] = (score + length, paragraph.parent)
+    if not scores:
+        return None
+
+    _, container = max(scores.values(), key=lambda entry: entry[0])
+    paragraphs = [
+        " ".join(paragraph.get_text(" ", strip=True).split())
+        for paragraph in container.find_all("p")
+    ]
+    text = "\n\n".join(p for p in paragraphs if len(p) >= MIN_PARAGRAPH_CHARS)
+    return text or None
+
+
+@dataclass
+class ExtractionResult:
+    """Extracted text, or why there is none."""
+
+    content: str | None
+    error: str | None = None
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame) -> None:
+    raise _Timeout
+
+
+def _address_space() -> int | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _limit_memory(limit: int | None) -> None:
+    """Pool initializer: cap the worker's address space growth at ``limit``."""
+    if not limit or resource is None or (current := _address_space()) is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    soft = current + limit
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def _start_worker(pids, memory_limit: int | None) -> None:
+    """Pool initializer: report the worker's pid, then cap its memory."""
+    pids.put(os.getpid())
+    _limit_memory(memory_limit)
+
+
+def _run_extraction(
+    extract: Callable[[str], str | None], html: str, timeout: float
+) -> tuple[str | None, str | None]:
+    # Runs in a pool worker's main thread, where SIGALRM interrupts Python code
+    signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract(html), None
+    except _Timeout:
+        return None, TIMEOUT
+    except MemoryError:
+        return None, MEMORY
+    except Exception as e:
+        return None, repr(e)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ContentExtractor:
+    """Runs ``extract`` on HTML documents in a bounded process pool.
+
+    At most ``workers`` documents are parsed at once, each in its own
+    process, so extraction scales with cores and never holds the event
+    loop's GIL. A document is abandoned after ``timeout`` seconds and a
+    worker may grow by at most ``memory_limit`` bytes; either way the
+    document yields no content and the worker carries on. A worker stuck in
+    native code past the timeout, or one that dies, gets the pool
+    restarted, which also fails the documents it was running alongside.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        timeout: float,
+        memory_limit: int | None = None,
+        extract: Callable[[str], str | None] = extract_content,
+    ) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.extract_func = extract
+        self._pool: ProcessPoolExecutor | None = None
+        # Pids the current pool's workers report as they start
+        self._pids = None
+        self._slots = asyncio.Semaphore(workers)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Fresh interpreters: forking a threaded event loop is unsafe
+            context = multiprocessing.get_context("forkserver")
+            self._pids = context.SimpleQueue()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_start_worker,
+                initargs=(self._pids, self.memory_limit),
+            )
+        return self._pool
+
+    def _restart(self, pool: ProcessPoolExecutor, kill: bool) -> None:
+        """Replace ``pool``; with ``kill``, first kill its (stuck) workers.
+
+        A broken pool has already terminated its workers, whose pids may be
+        reused by now, so only a pool that is still running is killed.
+        """
+        if self._pool is not pool:
+            return
+        pids, self._pool, self._pids = self._pids, None, None
+        # The executor API cannot stop a running call: kill its processes
+        while kill and not pids.empty():
+            try:
+                os.kill(pids.get(), signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        pids.close()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, html: str) -> ExtractionResult:
+        """Extract the article text of ``html`` in a pool worker."""
+        async with self._slots:
+            pool = self._get_pool()
+            loop = asyncio.get_running_loop()
+            try:
+                future = loop.run_in_executor(
+                    pool, _run_extraction, self.extract_func, html, self.timeout
+                )
+                # The worker times itself out; this only catches native hangs
+                content, error = await asyncio.wait_for(future, self.timeout + 5)
+            except TimeoutError:
+                logger.warning("Extraction worker stuck, restarting the pool")
+                self._restart(pool, kill=True)
+                return ExtractionResult(None, TIMEOUT)
+            except BrokenProcessPool:
+                logger.warning("Extraction worker died, restarting the pool")
+                self._restart(pool, kill=False)
+                return ExtractionResult(None, CRASHED)
+        return ExtractionResult(content, error)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pids.close()
+            self._pool = self._pids = None
+
+
+def _store_from_arrays():
+    """``UPDATE articles ... FROM unnest(ids, contents)`` for articles still empty."""
+    table = Article.__table__
+    done = func.unnest(
+        bindparam("ids", type_=ARRAY(Integer)),
+        bindparam("contents", type_=ARRAY(Text)),
+    ).table_valued("id", "content").render_derived(name="done")
+    return (
+        update(table)
+        .where(table.c.id == done.c.id, table.c.content.is_(None))
+        .values(
+            content=done.c.content,
+            # Analyze again with the full text
+            is_processed=False,
+            processing_claim=None,
+            processing_lease_until=None,
+        )
+        .returning(table.c.id)
+    )
+
+
+async def store_contents(db: AsyncSession, contents: dict[int, str]) -> list[int]:
+    """Fill in extracted bodies of articles that have none; the caller commits.
+
+    Filled articles are queued for processing again. Returns the ids
+    written, whose cached responses the caller drops once committed.
+    """
+    if not contents:
+        return []
+    ids = list(contents)
+    result = await db.execute(
+        _store_from_arrays(), {"ids": ids, "contents": [contents[i] for i in ids]}
+    )
+    return sorted(result.scalars())
+
+
+class ExtractionStage:
+    """Async queue feeding article pages through a ``ContentExtractor``.
+
+    ``submit`` enqueues an article and only waits while ``queue_size``
+    articles are pending. Consumers download each page (up to
+    ``max_document_bytes``), extract it in the pool and store the text, so
+    neither slow hosts nor pathological pages hold up whoever submits.
+    """
+
+    def __init__(
+        self,
+        extractor: ContentExtractor,
+        session_factory: async_sessionmaker[AsyncSession],
+        client: httpx.AsyncClient,
+        queue_size: int,
+        max_document_bytes: int,
+    ) -> None:
+        self.extractor = extractor
+        self.session_factory = session_factory
+        self.client = client
+        self.max_document_bytes = max_document_bytes
+        self.queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue(maxsize=queue_size)
+        self.stored = 0
+        self.failed = 0
+        self._consumers: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        # Downloads overlap with parsing: twice as many consumers as workers
+        self._consumers = [
+            asyncio.create_task(self._consume())
+            for _ in range(2 * self.extractor.workers)
+        ]
+
+    async def submit(self, article_id: int, url: str) -> None:
+        """Queue an article whose page should be extracted."""
+        await self.queue.put((article_id, url))
+
+    async def join(self) -> None:
+        """Wait until every submitted article has been handled."""
+        await self.queue.join()
+
+    async def close(self) -> None:
+        """Stop the consumers; pending articles are dropped."""
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+    async def _consume(self) -> None:
+        while True:
+            article_id, url = await self.queue.get()
+            try:
+                await self._handle(article_id, url)
+            except Exception:
+                self.failed += 1
+                logger.exception("Extracting article %s failed", article_id)
+            finally:
+                self.queue.task_done()
+
+    async def _download(self, url: str) -> str | None:
+        async with self.client.stream("GET", url) as response:
+            if response.status_code != 200:
+                return None
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > self.max_document_bytes:
+                    return None
+            return body.decode(response.encoding or "utf-8", errors="replace")
+
+    async def _handle(self, article_id: int, url: str) -> None:
+        try:
+            html = await self._download(url)
+        except httpx.HTTPError as e:
+            html = None
+            logger.warning("Downloading %s failed: %r", url, e)
+        result = await self.extractor.extract(html) if html else ExtractionResult(None)
+        if result.content is None:
+            self.failed += 1
+            return
+        async with self.session_factory() as session:
+            stored = await store_contents(session, {article_id: result.content})
+            await session.commit()
+        if stored:
+            await invalidate_articles(stored)
+        self.stored += 1
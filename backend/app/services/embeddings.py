@@ -0,0 +1,225 @@
+import asyncio
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import (
+    Integer,
+    LargeBinary,
+    bindparam,
+    func,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..db.models import Article
+from ..utils.embedding_store import EmbeddingStore, text_digest
+
+logger = logging.getLogger(__name__)
+
+# Texts -> one float32 row per text
+Encoder = Callable[[list[str]], np.ndarray]
+
+# Canonical articles whose text changed since it was last embedded; the
+# same predicate as the partial index ix_articles_unembedded
+_UNEMBEDDED = literal_column(
+    "is_processed IS TRUE AND duplicate_of_id IS NULL "
+    "AND embedded_digest IS DISTINCT FROM text_digest"
+)
+
+
+class SentenceEncoder:
+    """Encodes texts on the CPU with a sentence-transformers model.
+
+    ``batch_size`` texts go through the model at once; within one call the
+    library sorts texts by length first, so the larger the call, the less
+    padding. Vectors are normalized: cosine similarity is a dot product.
+    """
+
+    def __init__(self, model_name: str, batch_size: int, device: str = "cpu") -> None:
+        # Pulls in torch: only imported where embeddings are computed
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model_name, device=device)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return vectors.astype(np.float32, copy=False)
+
+
+def article_text(title: str, summary: str | None, content: str | None) -> str:
+    """What is embedded for an article: its title and body, else its summary."""
+    return "\n\n".join(filter(None, (title, content or summary)))
+
+
+@dataclass
+class EmbedResult:
+    """What one embedding pass did."""
+
+    # Distinct texts run through the model
+    encoded: int = 0
+    # Articles given a vector stored for the same text, e.g. a copy
+    reused: int = 0
+    # Articles whose text has not changed since they were embedded
+    unchanged: int = 0
+
+    def __iadd__(self, other: "EmbedResult") -> "EmbedResult":
+        self.encoded += other.encoded
+        self.reused += other.reused
+        self.unchanged += other.unchanged
+        return self
+
+
+class ArticleEmbedder:
+    """Embeds texts by id into an ``EmbeddingStore``, encoding each text once.
+
+    Texts are keyed by their digest: an id whose text is unchanged keeps its
+    vector, and a text already stored for any id is reused, so re-scraped
+    articles cost a hash instead of a model call. The remaining texts are
+    encoded ``chunk_size`` at a time.
+    """
+
+    def __init__(self, store: EmbeddingStore, encode: Encoder, chunk_size: int) -> None:
+        self.store = store
+        self.encode = encode
+        self.chunk_size = chunk_size
+
+    def embed(self, texts: Iterable[tuple[int, str]]) -> EmbedResult:
+        """Embed ``(id, text)`` pairs; CPU bound, run it off the event loop."""
+        result = EmbedResult()
+        # Digest -> text and the ids waiting for its vector
+        pending: dict[bytes, tuple[str, list[int]]] = {}
+        assigned: list[tuple[int, int]] = []
+        for item_id, text in texts:
+            digest = text_digest(text)
+            row = self.store.row_of(digest)
+            if row is None:
+                pending.setdefault(digest, (text, []))[1].append(item_id)
+                if len(pending) >= self.chunk_size:
+                    self._encode(pending, result)
+                    pending = {}
+            elif self.store.row_for(item_id) == row:
+                result.unchanged += 1
+            else:
+                assigned.append((item_id, row))
+                result.reused += 1
+        if pending:
+            self._encode(pending, result)
+        self.store.assign(assigned)
+        return result
+
+    def _encode(self, pending: dict[bytes, tuple[str, list[int]]], result: EmbedResult) -> None:
+        digests = list(pending)
+        vectors = self.encode([pending[digest][0] for digest in digests])
+        rows = self.store.add(digests, vectors)
+        self.store.assign(
+            (item_id, row)
+            for digest, row in zip(digests, rows, strict=True)
+            for item_id in pending[digest][1]
+        )
+        result.encoded += len(digests)
+
+
+def _mark_embedded():
+    """``UPDATE articles ... FROM unnest(ids, digests)`` for texts unchanged since read."""
+    table = Article.__table__
+    done = func.unnest(
+        bindparam("ids", type_=ARRAY(Integer)),
+        bindparam("digests", type_=ARRAY(LargeBinary)),
+    ).table_valued("id", "digest").render_derived(name="done")
+    return (
+        update(table)
+        .where(table.c.id == done.c.id, table.c.text_digest == done.c.digest)
+        .values(embedded_digest=done.c.digest)
+    )
+
+
+async def embed_articles(
+    session_factory: async_sessionmaker[AsyncSession], embedder: ArticleEmbedder
+) -> EmbedResult:
+    """Embed the processed canonical articles that are new or changed.
+
+    Only articles whose ``text_digest`` differs from the ``embedded_digest``
+    recorded by an earlier pass are read, by ascending id, ``chunk_size``
+    per short transaction, and encoded in a worker thread between reads.
+    An article whose text changes while it is being embedded is not marked,
+    so the next pass reads it again. Near-duplicates are left out: their
+    canonical article stands for them.
+
+    The marks only hold for the store that recorded them: when the store is
+    empty (new, lost, or for another model), they are all cleared first and
+    every article is embedded again.
+    """
+    if not len(embedder.store):
+        async with session_factory() as session:
+            await session.execute(
+                update(Article)
+                .where(Article.embedded_digest.is_not(None))
+                .values(embedded_digest=None)
+            )
+            await session.commit()
+    result = EmbedResult()
+    last_id = 0
+    while True:
+        async with session_factory() as session:
+            rows = (await session.execute(
+                select(
+                    Article.id,
+                    Article.title,
+                    Article.summary,
+                    Article.content,
+                    Article.text_digest,
+                )
+                .where(Article.id > last_id, _UNEMBEDDED)
+                .order_by(Article.id)
+                .limit(embedder.chunk_size)
+            )).all()
+        if not rows:
+            return result
+        last_id = rows[-1].id
+        texts = [(row.id, article_text(row.title, row.summary, row.content)) for row in rows]
+        result += await asyncio.to_thread(embedder.embed, texts)
+        async with session_factory() as session:
+            await session.execute(_mark_embedded(), {
+                "ids": [row.id for row in rows],
+                "digests": [row.text_digest for row in rows],
+            })
+            await session.commit()
+
+
+async def run_embedder(
+    session_factory: async_sessionmaker[AsyncSession],
+    embedder: ArticleEmbedder,
+    stop: asyncio.Event,
+    interval: float,
+) -> None:
+    """Run an embedding pass every ``interval`` seconds until ``stop`` is set.
+
+    Run a single instance per store.
+    """
+    while not stop.is_set():
+        try:
+            result = await embed_articles(session_factory, embedder)
+            logger.info(
+                "Embedded articles: %d encoded, %d reused, %d unchanged",
+                result.encoded, result.reused, result.unchanged,
+            )
+        except Exception:
+            logger.exception("Embedding articles failed")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except TimeoutError:
+            pass
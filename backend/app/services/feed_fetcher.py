@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..db.models import NewsSource
+from ..utils.urls import canonicalize_url
+from .feed_parser import aparse_feed
+from .ingestion import ArticleRecord, IngestResult, ingest_article_stream
+from .near_duplicates import NearDuplicateIndex
+from .seen_urls import SeenUrlFilter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchResult:
+    """Outcome of polling one source's feed."""
+
+    source_id: int
+    url: str
+    # HTTP status, or None when the request failed or timed out
+    status: int | None
+    etag: str | None = None
+    last_modified: str | None = None
+    error: str | None = None
+    # Set when the feed was streamed straight into ingestion
+    ingested: IngestResult | None = None
+    # Feed items dropped as already stored by the seen URL filter
+    skipped: int = 0
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+def _conditional_headers(etag: str | None, last_modified: str | None) -> dict[str, str]:
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP client shared by every feed request of a polling run."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.FEED_FETCH_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.FEED_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.FEED_MAX_CONNECTIONS,
+        ),
+        follow_redirects=True,
+        headers={"User-Agent": settings.FEED_USER_AGENT},
+    )
+
+
+class FeedFetcher:
+    """Streams RSS/Atom feeds into ingestion with conditional GETs.
+
+    All requests go through one pooled ``client``; at most
+    ``per_host_limit`` run against the same host at a time. Failures are
+    reported in the results, never raised. With a ``seen`` filter,
+    streamed feeds skip items whose URL is known to be stored; with a
+    ``duplicates`` index, near-duplicates of stored articles are linked to
+    them.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        per_host_limit: int,
+        seen: SeenUrlFilter | None = None,
+        duplicates: NearDuplicateIndex | None = None,
+    ) -> None:
+        self.client = client
+        self.per_host_limit = per_host_limit
+        self.seen = seen
+        self.duplicates = duplicates
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def ingest_source(
+        self, db: AsyncSession, source: NewsSource, update_existing: bool = False
+    ) -> FetchResult:
+        """Stream a source's feed through the parser into ingestion.
+
+        Articles are written batch by batch while the feed downloads, so
+        large feeds never sit in memory whole. There is no overall deadline:
+        the client's timeouts apply to each read, so callers bound the whole
+        poll (see ``POLL_SOURCE_TIMEOUT``). Records the
+        validators on ``source``; the caller commits and must not share
+        ``db`` between concurrent calls.
+        """
+        url = source.rss_url
+        headers = _conditional_headers(source.etag, source.last_modified)
+        async with self._host_limit(url):
+            try:
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    fetched = FetchResult(source.id, url, status=response.status_code)
+                    if response.status_code == 200:
+                        fetched.etag = response.headers.get("ETag")
+                        fetched.last_modified = response.headers.get("Last-Modified")
+                        records = aparse_feed(response.aiter_bytes(), source.id)
+                        unseen: list[str] = []
+                        if self.seen is not None and not update_existing:
+                            records = self._skip_seen(records, fetched, unseen)
+                        fetched.ingested = await ingest_article_stream(
+                            db,
+                            records,
+                            update_existing=update_existing,
+                            duplicates=self.duplicates,
+                        )
+                        if self.seen is not None:
+                            self.seen.add_after_commit(db, unseen)
+                    elif response.status_code != 304:
+                        fetched.error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                logger.warning("Streaming feed %s failed: %r", url, e)
+                return FetchResult(source.id, url, status=None, error=repr(e))
+
+        source.last_fetched_at = datetime.now(UTC)
+        if fetched.status == 200:
+            source.etag = fetched.etag
+            source.last_modified = fetched.last_modified
+        return fetched
+
+    async def _skip_seen(
+        self,
+        records: AsyncIterator[ArticleRecord],
+        fetched: FetchResult,
+        unseen: list[str],
+    ) -> AsyncIterator[ArticleRecord]:
+        async for record in records:
+            canonical = canonicalize_url(record.url)
+            if canonical in self.seen:
+                fetched.skipped += 1
+                continue
+            # Stored by ingestion, or already there: seen once committed
+            unseen.append(canonical)
+            yield record
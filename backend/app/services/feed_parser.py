@@ -0,0 +1,161 @@
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+from .ingestion import ArticleRecord
+
+logger = logging.getLogger(__name__)
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+DC_CREATOR = "{http://purl.org/dc/elements/1.1/}creator"
+
+# Elements holding one article: RSS 2.0 items and Atom entries
+_ITEM_TAGS = {"item", f"{ATOM}entry"}
+
+
+def _text(element: Element | None) -> str | None:
+    if element is None:
+        return None
+    text = "".join(element.itertext()).strip()
+    return text or None
+
+
+def _parse_date(value: str | None) -> datetime | None:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom) dates; naive ones are UTC."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+def _atom_link(entry: Element) -> str | None:
+    for link in entry.iterfind(f"{ATOM}link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href").strip()
+    return None
+
+
+def _rss_record(item: Element, source_id: int) -> ArticleRecord | None:
+    url = _text(item.find("link"))
+    guid = item.find("guid")
+    if url is None and guid is not None and guid.get("isPermaLink", "true") == "true":
+        url = _text(guid)
+    title = _text(item.find("title"))
+    if not url or not title:
+        return None
+    return ArticleRecord(
+        url=url,
+        title=title,
+        source_id=source_id,
+        summary=_text(item.find("description")),
+        content=_text(item.find(CONTENT_ENCODED)),
+        author=_text(item.find(DC_CREATOR)) or _text(item.find("author")),
+        published_at=_parse_date(_text(item.find("pubDate"))),
+    )
+
+
+def _atom_record(entry: Element, source_id: int) -> ArticleRecord | None:
+    url = _atom_link(entry)
+    title = _text(entry.find(f"{ATOM}title"))
+    if not url or not title:
+        return None
+    return ArticleRecord(
+        url=url,
+        title=title,
+        source_id=source_id,
+        summary=_text(entry.find(f"{ATOM}summary")),
+        content=_text(entry.find(f"{ATOM}content")),
+        author=_text(entry.find(f"{ATOM}author/{ATOM}name")),
+        published_at=_parse_date(
+            _text(entry.find(f"{ATOM}published")) or _text(entry.find(f"{ATOM}updated"))
+        ),
+    )
+
+
+class FeedParser:
+    """Incremental RSS 2.0 / Atom parser with bounded memory.
+
+    Feed it the document in chunks of any size; every item or entry is
+    turned into an ``ArticleRecord`` as soon as its closing tag arrives and
+    then dropped from the tree, so memory depends on the largest item, not
+    on the size of the feed. Items without a link or title are skipped.
+    """
+
+    def __init__(self, source_id: int) -> None:
+        self.source_id = source_id
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._stack: list[Element] = []
+
+    def feed(self, chunk: bytes) -> Iterator[ArticleRecord]:
+        """Parse ``chunk`` and yield the records it completed.
+
+        Consume the records before feeding the next chunk. A syntax error is
+        raised only after the records that precede it have been yielded.
+        """
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> Iterator[ArticleRecord]:
+        """Finish the document and yield any remaining records."""
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> Iterator[ArticleRecord]:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._stack.append(element)
+                continue
+            self._stack.pop()
+            if element.tag not in _ITEM_TAGS:
+                continue
+            if element.tag == "item":
+                record = _rss_record(element, self.source_id)
+            else:
+                record = _atom_record(element, self.source_id)
+            # Drop the finished item so the tree never grows with the feed
+            if self._stack:
+                self._stack[-1].remove(element)
+            element.clear()
+            if record is not None:
+                yield record
+
+
+def parse_feed(chunks: Iterable[bytes], source_id: int) -> Iterator[ArticleRecord]:
+    """Yield the articles of a feed read from ``chunks``.
+
+    Malformed XML ends the feed early; the articles parsed until then are
+    still yielded.
+    """
+    parser = FeedParser(source_id)
+    try:
+        for chunk in chunks:
+            yield from parser.feed(chunk)
+        yield from parser.close()
+    except ParseError as e:
+        logger.warning("Malformed feed for source %s: %s", source_id, e)
+
+
+async def aparse_feed(
+    chunks: AsyncIterable[bytes], source_id: int
+) -> AsyncIterator[ArticleRecord]:
+    """``parse_feed`` over an async byte stream, e.g. ``response.aiter_bytes()``."""
+    parser = FeedParser(source_id)
+    try:
+        async for chunk in chunks:
+            for record in parser.feed(chunk):
+                yield record
+        for record in parser.close():
+            yield record
+    except ParseError as e:
+        logger.warning("Malformed feed for source %s: %s", source_id, e)
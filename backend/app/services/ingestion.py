@@ -0,0 +1,264 @@
+from collections.abc import AsyncIterable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import bindparam, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..db.models import Article
+from ..utils.minhash import MinHasher
+from ..utils.urls import canonicalize_url
+from .near_duplicates import NearDuplicateIndex
+from .response_cache import invalidate_after_commit
+
+# Columns a feed can provide and a re-ingested article may change
+_UPDATABLE_COLUMNS = ("title", "summary", "content", "author", "published_at")
+_INSERTED_COLUMNS = (
+    "url",
+    "canonical_url",
+    "source_id",
+    "duplicate_of_id",
+    "is_processed",
+    "minhash",
+    *_UPDATABLE_COLUMNS,
+)
+
+
+def _insert_from_arrays():
+    """``INSERT INTO articles ... SELECT * FROM unnest(<one array per column>)``.
+
+    A batch is sent as one array parameter per column, so the statement is
+    the same for every batch size: it compiles and is prepared once,
+    instead of once per distinct multi-row ``VALUES`` list.
+    """
+    # Core, not ORM, insert: the arrays are one parameter set, not rows
+    columns = Article.__table__.c
+    rows = func.unnest(*(
+        bindparam(name, type_=ARRAY(columns[name].type))
+        for name in _INSERTED_COLUMNS
+    )).table_valued(*_INSERTED_COLUMNS).render_derived()
+    return insert(Article.__table__).from_select(
+        list(_INSERTED_COLUMNS), select(*(rows.c[name] for name in _INSERTED_COLUMNS))
+    )
+
+
+@dataclass
+class ArticleRecord:
+    """A parsed article, ready to be written."""
+
+    url: str
+    title: str
+    source_id: int
+    summary: str | None = None
+    content: str | None = None
+    author: str | None = None
+    published_at: datetime | None = None
+
+
+@dataclass
+class IngestResult:
+    """Ids of the articles a bulk ingest created and changed."""
+
+    new_ids: list[int] = field(default_factory=list)
+    updated_ids: list[int] = field(default_factory=list)
+    # New articles stored as near-duplicates of another (also in new_ids)
+    duplicate_ids: list[int] = field(default_factory=list)
+
+
+def _batches(records: Iterable[ArticleRecord], size: int) -> Iterator[list[ArticleRecord]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _record_text(row: dict) -> str:
+    return "\n".join(filter(None, (row["title"], row["summary"], row["content"])))
+
+
+async def _insert_rows(
+    db: AsyncSession,
+    rows: list[dict],
+    update_existing: bool,
+    result: IngestResult,
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Insert or upsert ``rows``.
+
+    Returns the ids, by canonical URL, of the new rows and of the updated
+    canonical (not near-duplicate) ones.
+    """
+    arrays = {name: [row[name] for row in rows] for name in _INSERTED_COLUMNS}
+    statement = _insert_from_arrays()
+    if update_existing:
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=[Article.canonical_url],
+            set_={
+                **{name: excluded[name] for name in _UPDATABLE_COLUMNS},
+                # Queued again (unless a near-duplicate); a worker holding
+                # the old version loses its claim
+                "is_processed": Article.duplicate_of_id.is_not(None),
+                "processing_claim": None,
+                "processing_lease_until": None,
+            },
+            where=or_(*(
+                getattr(Article, name).is_distinct_from(excluded[name])
+                for name in _UPDATABLE_COLUMNS
+            )),
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=[Article.canonical_url])
+    # xmax is 0 only for tuples this statement inserted
+    returned = await db.execute(
+        statement.returning(
+            statement.table.c.id,
+            statement.table.c.canonical_url,
+            statement.table.c.duplicate_of_id,
+            literal_column("xmax = 0"),
+        ),
+        arrays,
+    )
+    inserted, updated = {}, {}
+    for article_id, canonical_url, duplicate_of_id, is_new in returned:
+        if is_new:
+            inserted[canonical_url] = article_id
+            result.new_ids.append(article_id)
+        else:
+            if duplicate_of_id is None:
+                updated[canonical_url] = article_id
+            result.updated_ids.append(article_id)
+    return inserted, updated
+
+
+async def _write_batch(
+    db: AsyncSession,
+    batch: list[ArticleRecord],
+    update_existing: bool,
+    result: IngestResult,
+    duplicates: NearDuplicateIndex | None,
+) -> None:
+    # ON CONFLICT cannot touch one row twice per statement: last one wins
+    rows = {}
+    for record in batch:
+        canonical = canonicalize_url(record.url)
+        rows[canonical] = {
+            **asdict(record),
+            "canonical_url": canonical,
+            "duplicate_of_id": None,
+            "is_processed": False,
+            "minhash": None,
+        }
+
+    fingerprints = {}
+    matches = {}
+    if duplicates is not None:
+        for canonical, row in rows.items():
+            if (fingerprint := duplicates.fingerprint(_record_text(row))) is not None:
+                fingerprints[canonical] = fingerprint
+        matches = await duplicates.match(db, fingerprints)
+
+    def link(row: dict, canonical_id: int | None) -> dict:
+        if canonical_id is None:
+            # A canonical article: indexed once stored
+            if (fingerprint := fingerprints.get(row["canonical_url"])) is not None:
+                row["minhash"] = MinHasher.to_bytes(fingerprint.signature)
+        else:
+            # Never analyzed: its canonical article is
+            row["duplicate_of_id"] = canonical_id
+            row["is_processed"] = True
+        return row
+
+    # Duplicates of another row of the batch need its id, so come second
+    first, second = [], []
+    for canonical, row in rows.items():
+        match = matches.get(canonical)
+        if match is not None and match.batch_key is not None:
+            second.append(row)
+        else:
+            first.append(link(row, match.article_id if match else None))
+    inserted, updated = await _insert_rows(db, first, update_existing, result)
+    if second:
+        second = [
+            link(row, inserted.get(matches[row["canonical_url"]].batch_key))
+            for row in second
+        ]
+        more_inserted, more_updated = await _insert_rows(db, second, update_existing, result)
+        inserted |= more_inserted
+        updated |= more_updated
+
+    result.duplicate_ids.extend(
+        inserted[canonical]
+        for canonical, row in rows.items()
+        if canonical in inserted and row["duplicate_of_id"] is not None
+    )
+    if duplicates is not None:
+        await duplicates.add(db, {
+            inserted[canonical]: fingerprints[canonical]
+            for canonical, row in rows.items()
+            if canonical in inserted and row["minhash"] is not None
+        })
+        # A rewritten canonical article keeps its place, under its new text
+        await duplicates.replace(db, {
+            article_id: fingerprints.get(canonical)
+            for canonical, article_id in updated.items()
+        })
+
+
+def _invalidate_caches(db: AsyncSession, result: IngestResult) -> None:
+    if result.new_ids or result.updated_ids:
+        invalidate_after_commit(db, result.updated_ids, listings=bool(result.new_ids))
+
+
+async def ingest_articles(
+    db: AsyncSession,
+    records: Iterable[ArticleRecord],
+    update_existing: bool = False,
+    batch_size: int | None = None,
+    duplicates: NearDuplicateIndex | None = None,
+) -> IngestResult:
+    """Write articles in batched ``INSERT ... ON CONFLICT`` statements.
+
+    Articles whose canonical URL is already stored are skipped, or with
+    ``update_existing`` overwritten when a feed column actually changed
+    (and queued for processing again). ``records`` may be a generator; it
+    is consumed ``batch_size`` rows at a time. With a ``duplicates`` index,
+    new articles whose text nearly matches a stored (or earlier) one are
+    linked to it and stored processed, and the others are indexed; an
+    overwritten canonical article is indexed again under its new text. The
+    caller commits; cached listings, counts and changed article details are
+    invalidated once it does.
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    result = IngestResult()
+    for batch in _batches(records, batch_size):
+        await _write_batch(db, batch, update_existing, result, duplicates)
+    _invalidate_caches(db, result)
+    return result
+
+
+async def ingest_article_stream(
+    db: AsyncSession,
+    records: AsyncIterable[ArticleRecord],
+    update_existing: bool = False,
+    batch_size: int | None = None,
+    duplicates: NearDuplicateIndex | None = None,
+) -> IngestResult:
+    """``ingest_articles`` for an async stream, e.g. a feed being downloaded.
+
+    Each batch is written as soon as it fills up, while the rest of the
+    stream is still arriving.
+    """
+    batch_size = batch_size or settings.INGEST_BATCH_SIZE
+    result = IngestResult()
+    batch: list[ArticleRecord] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            await _write_batch(db, batch, update_existing, result, duplicates)
+            batch = []
+    if batch:
+        await _write_batch(db, batch, update_existing, result, duplicates)
+    _invalidate_caches(db, result)
+    return result
@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketLimiter:
+    """In-process token buckets, one per key, with a bounded key count.
+
+    Each bucket holds up to ``capacity`` attempts and refills at
+    ``capacity / window`` per second. Least recently used buckets are
+    dropped beyond ``max_keys``; a dropped bucket simply starts full again.
+    """
+
+    def __init__(self, window: float, max_keys: int = 10_000) -> None:
+        self.window = window
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str, capacity: int) -> float:
+        """Take one token for ``key``; return 0 or the seconds until one is free."""
+        now = time.monotonic()
+        rate = capacity / self.window
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self) -> None:
+        """Refill every bucket."""
+        self._buckets.clear()
+
+
+class LoginThrottle:
+    """Per-username and per-IP limits on login attempts.
+
+    Attempts are counted in Redis sliding windows shared by every worker:
+    at most ``per_username`` attempts for one username and ``per_ip`` from
+    one client address within ``window`` seconds. Rejected attempts count
+    too, so clients that keep retrying stay throttled. When Redis is
+    unreachable each worker falls back to its own token buckets with the
+    same rates.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        per_username: int,
+        per_ip: int,
+        window: int,
+        enabled: bool = True,
+        prefix: str = "login",
+    ) -> None:
+        self.redis_url = redis_url
+        self.per_username = per_username
+        self.per_ip = per_ip
+        self.window = window
+        self.enabled = enabled
+        self.prefix = prefix
+        self.fallback = TokenBucketLimiter(window=window)
+        self._redis: Redis | None = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            )
+        return self._redis
+
+    def _limits(self, username: str, ip: str | None) -> list[tuple[str, int]]:
+        # Usernames are attacker-controlled: hash them into fixed-size keys
+        digest = hashlib.sha256(username.lower().encode()).hexdigest()[:32]
+        limits = [(f"{self.prefix}:user:{digest}", self.per_username)]
+        if ip:
+            limits.append((f"{self.prefix}:ip:{ip}", self.per_ip))
+        return limits
+
+    async def check(self, username: str, ip: str | None) -> int | None:
+        """Record a login attempt.
+
+        Returns None if it may proceed, otherwise the seconds to wait.
+        """
+        if not self.enabled:
+            return None
+        limits = self._limits(username, ip)
+        try:
+            retry_after = await self._check_redis(limits)
+        except RedisError:
+            logger.warning("Login throttle unavailable, using local limits", exc_info=True)
+            retry_after = max(self.fallback.acquire(key, limit) for key, limit in limits)
+        if retry_after <= 0:
+            return None
+        return max(1, math.ceil(retry_after))
+
+    async def _check_redis(self, limits: list[tuple[str, int]]) -> float:
+        now = time.time()
+        member = f"{now}:{uuid4().hex}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for key, _ in limits:
+                pipe.zremrangebyscore(key, 0, now - self.window)
+                pipe.zadd(key, {member: now})
+                pipe.zcard(key)
+                pipe.zrange(key, 0, 0, withscores=True)
+                pipe.expire(key, self.window)
+            results = await pipe.execute()
+
+        retry_after = 0.0
+        for i, (_, limit) in enumerate(limits):
+            count, oldest = results[i * 5 + 2], results[i * 5 + 3]
+            if count > limit:
+                # The window frees a slot once its oldest attempt ages out
+                retry_after = max(retry_after, oldest[0][1] + self.window - now)
+        return retry_after
+
+    async def clear(self) -> None:
+        """Forget every recorded attempt."""
+        self.fallback.clear()
+        keys = [key async for key in self.redis.scan_iter(f"{self.prefix}:*")]
+        if keys:
+            await self.redis.delete(*keys)
+
+
+login_throttle = LoginThrottle(
+    settings.REDIS_URL,
+    per_username=settings.LOGIN_ATTEMPTS_PER_USERNAME,
+    per_ip=settings.LOGIN_ATTEMPTS_PER_IP,
+    window=settings.LOGIN_THROTTLE_WINDOW,
+    enabled=settings.LOGIN_THROTTLE_ENABLED,
+)
@@ -0,0 +1,229 @@
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Integer,
+    SmallInteger,
+    bindparam,
+    delete,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..db.models import Article, ArticleLshBucket
+from ..utils.minhash import MinHasher, band_buckets, shingles
+
+
+@dataclass
+class Fingerprint:
+    """MinHash signature of an article's text and its LSH buckets."""
+
+    signature: np.ndarray
+    buckets: list[int]
+
+
+@dataclass
+class DuplicateMatch:
+    """The article a new one duplicates.
+
+    Either a stored canonical article (``article_id``) or an earlier row of
+    the same batch, by key (``batch_key``).
+    """
+
+    similarity: float
+    article_id: int | None = None
+    batch_key: str | None = None
+
+
+def _probe_buckets():
+    """Stored buckets (with their article's signature) among unnest(bands, buckets)."""
+    probe = func.unnest(
+        bindparam("bands", type_=ARRAY(SmallInteger)),
+        bindparam("buckets", type_=ARRAY(BigInteger)),
+    ).table_valued("band", "bucket").render_derived(name="probe")
+    return (
+        select(
+            ArticleLshBucket.band,
+            ArticleLshBucket.bucket,
+            ArticleLshBucket.article_id,
+            Article.minhash,
+        )
+        .join(
+            probe,
+            (ArticleLshBucket.band == probe.c.band)
+            & (ArticleLshBucket.bucket == probe.c.bucket),
+        )
+        .join(Article, Article.id == ArticleLshBucket.article_id)
+    )
+
+
+def _insert_buckets():
+    """``INSERT INTO article_lsh_buckets SELECT * FROM unnest(...)``, like ingestion."""
+    rows = func.unnest(
+        bindparam("bands", type_=ARRAY(SmallInteger)),
+        bindparam("buckets", type_=ARRAY(BigInteger)),
+        bindparam("article_ids", type_=ARRAY(Integer)),
+    ).table_valued("band", "bucket", "article_id").render_derived()
+    return insert(ArticleLshBucket.__table__).from_select(
+        ["band", "bucket", "article_id"], select(rows.c.band, rows.c.bucket, rows.c.article_id)
+    ).on_conflict_do_nothing()
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index of canonical articles, persisted in Postgres.
+
+    An article's text is shingled into ``shingle_size``-word shingles and
+    summarized by a ``num_perm`` slot MinHash signature, split into
+    ``bands`` bands. Each band of a canonical article is stored as a row of
+    ``article_lsh_buckets``, so looking up the articles that share a band
+    with a new one is an index probe whatever the number of articles. Those
+    candidates are confirmed when their estimated Jaccard similarity
+    reaches ``threshold``. Texts with fewer than ``min_shingles`` shingles
+    are too short to judge and never match.
+
+    Changing ``num_perm``, ``bands`` or ``shingle_size`` invalidates the
+    stored index.
+    """
+
+    def __init__(
+        self,
+        num_perm: int,
+        bands: int,
+        threshold: float,
+        shingle_size: int,
+        min_shingles: int,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        self.hasher = MinHasher(num_perm)
+
+    def fingerprint(self, text: str) -> Fingerprint | None:
+        """Fingerprint of ``text``, or None when it is too short."""
+        hashes = shingles(text, self.shingle_size)
+        if len(hashes) < self.min_shingles:
+            return None
+        signature = self.hasher.signature(hashes)
+        return Fingerprint(signature, band_buckets(signature, self.bands))
+
+    def _best(
+        self, fingerprint: Fingerprint, candidates: Iterable[tuple[object, np.ndarray]]
+    ) -> tuple[object, float] | None:
+        best = None
+        for key, signature in candidates:
+            similarity = self.hasher.similarity(fingerprint.signature, signature)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = key, similarity
+        return best
+
+    async def match(
+        self, db: AsyncSession, fingerprints: Mapping[str, Fingerprint]
+    ) -> dict[str, DuplicateMatch]:
+        """Near-duplicates among ``fingerprints``, keyed like them.
+
+        Each is matched against the stored canonical articles (one query
+        for the whole batch) and, failing that, against the earlier
+        unmatched fingerprints of the batch, which are canonical
+        themselves. Keys without a match are left out.
+        """
+        if not fingerprints:
+            return {}
+        probes = {
+            (band, bucket)
+            for fingerprint in fingerprints.values()
+            for band, bucket in enumerate(fingerprint.buckets)
+        }
+        result = await db.execute(_probe_buckets(), {
+            "bands": [band for band, _ in probes],
+            "buckets": [bucket for _, bucket in probes],
+        })
+        stored: dict[tuple[int, int], list[int]] = {}
+        signatures: dict[int, np.ndarray] = {}
+        for band, bucket, article_id, minhash in result:
+            stored.setdefault((band, bucket), []).append(article_id)
+            signatures[article_id] = MinHasher.from_bytes(minhash)
+
+        matches = {}
+        batch: dict[tuple[int, int], list[str]] = {}
+        for key, fingerprint in fingerprints.items():
+            probed = list(enumerate(fingerprint.buckets))
+            candidates = {i for probe in probed for i in stored.get(probe, ())}
+            best = self._best(fingerprint, ((i, signatures[i]) for i in candidates))
+            if best is not None:
+                matches[key] = DuplicateMatch(best[1], article_id=best[0])
+                continue
+            earlier = {k for probe in probed for k in batch.get(probe, ())}
+            best = self._best(
+                fingerprint, ((k, fingerprints[k].signature) for k in earlier)
+            )
+            if best is not None:
+                matches[key] = DuplicateMatch(best[1], batch_key=best[0])
+                continue
+            for probe in probed:
+                batch.setdefault(probe, []).append(key)
+        return matches
+
+    async def add(self, db: AsyncSession, fingerprints: Mapping[int, Fingerprint]) -> None:
+        """Index the buckets of stored canonical articles, by id; the caller commits.
+
+        Their signatures are stored on the articles (see ``Article.minhash``).
+        """
+        if not fingerprints:
+            return
+        rows = [
+            (band, bucket, article_id)
+            for article_id, fingerprint in fingerprints.items()
+            for band, bucket in enumerate(fingerprint.buckets)
+        ]
+        await db.execute(_insert_buckets(), {
+            "bands": [band for band, _, _ in rows],
+            "buckets": [bucket for _, bucket, _ in rows],
+            "article_ids": [article_id for _, _, article_id in rows],
+        })
+
+
+    async def replace(
+        self, db: AsyncSession, fingerprints: Mapping[int, Fingerprint | None]
+    ) -> None:
+        """Index stored canonical articles again after their text changed; the caller commits.
+
+        Their old buckets are dropped and their signatures rewritten. One
+        whose new text is too short (None) is no longer indexed.
+        """
+        if not fingerprints:
+            return
+        await db.execute(
+            delete(ArticleLshBucket).where(ArticleLshBucket.article_id.in_(fingerprints))
+        )
+        await db.execute(update(Article), [
+            {
+                "id": article_id,
+                "minhash": None if fingerprint is None
+                else MinHasher.to_bytes(fingerprint.signature),
+            }
+            for article_id, fingerprint in fingerprints.items()
+        ])
+        await self.add(db, {
+            article_id: fingerprint
+            for article_id, fingerprint in fingerprints.items()
+            if fingerprint is not None
+        })
+
+
+near_duplicates = NearDuplicateIndex(
+    num_perm=settings.NEAR_DUPLICATE_PERMUTATIONS,
+    bands=settings.NEAR_DUPLICATE_BANDS,
+    threshold=settings.NEAR_DUPLICATE_THRESHOLD,
+    shingle_size=settings.NEAR_DUPLICATE_SHINGLE_SIZE,
+    min_shingles=settings.NEAR_DUPLICATE_MIN_SHINGLES,
+)
@@ -0,0 +1,366 @@
+import asyncio
+import heapq
+import logging
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core.config import settings
+from ..db.models import Article, NewsSource
+from .content_extraction import ExtractionStage
+from .feed_fetcher import FeedFetcher, FetchResult
+
+logger = logging.getLogger(__name__)
+
+# Cadences are learned from the latest articles of the last few weeks
+CADENCE_SAMPLE = 50
+CADENCE_WINDOW = timedelta(days=30)
+
+
+@dataclass
+class SourceSchedule:
+    """When one source is polled next, and why."""
+
+    source_id: int
+    name: str
+    # Median seconds between the source's articles; None until learned
+    cadence: float | None
+    interval: float
+    next_poll_at: datetime
+    misses: int = 0
+
+
+async def learn_cadences(db: AsyncSession) -> dict[int, float]:
+    """Median gap in seconds between recent articles, per source.
+
+    Uses up to ``CADENCE_SAMPLE`` of each source's latest articles published
+    within ``CADENCE_WINDOW``; sources with fewer than two are left out.
+    """
+    recent = (
+        select(
+            Article.source_id,
+            func.extract(
+                "epoch",
+                Article.published_at
+                - func.lag(Article.published_at).over(
+                    partition_by=Article.source_id, order_by=Article.published_at
+                ),
+            ).label("gap"),
+            func.row_number().over(
+                partition_by=Article.source_id, order_by=Article.published_at.desc()
+            ).label("rank"),
+        )
+        .where(Article.published_at > func.now() - CADENCE_WINDOW)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            recent.c.source_id,
+            func.percentile_cont(0.5).within_group(recent.c.gap),
+        )
+        .where(recent.c.gap > 0, recent.c.rank <= CADENCE_SAMPLE)
+        .group_by(recent.c.source_id)
+    )
+    return {source_id: float(cadence) for source_id, cadence in result}
+
+
+class PollScheduler:
+    """Priority queue of sources ordered by when their feed is next due.
+
+    A source is polled twice per learned publish interval, clamped to
+    ``[min_interval, max_interval]``, or every ``default_interval`` until
+    its cadence is known. Each poll that finds nothing new (a 304, a feed
+    without new articles or a failure) multiplies the interval by
+    ``backoff_factor``, up to ``max_interval``; the first new article
+    resets it. The schedule is mirrored on ``NewsSource`` rows so it
+    survives restarts and can be inspected from any process.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        default_interval: float,
+        backoff_factor: float,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.backoff_factor = backoff_factor
+        self._schedules: dict[int, SourceSchedule] = {}
+        self._queue: list[tuple[datetime, int]] = []
+
+    def interval_for(self, cadence: float | None, misses: int) -> float:
+        """Seconds until the next poll of a source."""
+        if cadence is None:
+            base = self.default_interval
+        else:
+            base = min(max(cadence / 2, self.min_interval), self.max_interval)
+        return min(base * self.backoff_factor ** misses, self.max_interval)
+
+    async def load(self, db: AsyncSession, now: datetime | None = None) -> None:
+        """(Re)build the queue from active sources and their latest cadences.
+
+        Never-polled sources are due right away; the others keep their
+        stored next poll, brought forward if a faster cadence was learned.
+        """
+        now = now or datetime.now(UTC)
+        cadences = await learn_cadences(db)
+        result = await db.execute(
+            select(
+                NewsSource.id,
+                NewsSource.name,
+                NewsSource.last_fetched_at,
+                NewsSource.next_poll_at,
+                NewsSource.poll_misses,
+            ).where(NewsSource.is_active.is_(True), NewsSource.rss_url.is_not(None))
+        )
+        self._schedules = {}
+        for source_id, name, last_fetched_at, next_poll_at, misses in result:
+            cadence = cadences.get(source_id)
+            interval = self.interval_for(cadence, misses or 0)
+            if next_poll_at is None or last_fetched_at is None:
+                next_poll_at = now
+            else:
+                next_poll_at = min(next_poll_at, last_fetched_at + timedelta(seconds=interval))
+            self._schedules[source_id] = SourceSchedule(
+                source_id, name, cadence, interval, next_poll_at, misses or 0
+            )
+        self._queue = [(s.next_poll_at, s.source_id) for s in self._schedules.values()]
+        heapq.heapify(self._queue)
+
+    def next_due_at(self) -> datetime | None:
+        """When the next source is due, or None without sources."""
+        while self._queue:
+            due_at, source_id = self._queue[0]
+            schedule = self._schedules.get(source_id)
+            if schedule is not None and schedule.next_poll_at == due_at:
+                return due_at
+            # Superseded by a later reschedule or an unloaded source
+            heapq.heappop(self._queue)
+        return None
+
+    def pop_due(self, now: datetime | None = None) -> list[SourceSchedule]:
+        """Take every source due at ``now`` off the queue, earliest first.
+
+        Each one stays off the queue until ``record`` reschedules it.
+        """
+        now = now or datetime.now(UTC)
+        due = []
+        while (due_at := self.next_due_at()) is not None and due_at <= now:
+            _, source_id = heapq.heappop(self._queue)
+            due.append(self._schedules[source_id])
+        return due
+
+    def reschedule(
+        self, source_id: int, fetched: FetchResult, now: datetime | None = None
+    ) -> SourceSchedule | None:
+        """Put a polled source back on the queue; None once it is unloaded."""
+        now = now or datetime.now(UTC)
+        schedule = self._schedules.get(source_id)
+        if schedule is None:
+            return None
+        found_news = fetched.status == 200 and (
+            fetched.ingested is None or bool(fetched.ingested.new_ids)
+        )
+        schedule.misses = 0 if found_news else schedule.misses + 1
+        schedule.interval = self.interval_for(schedule.cadence, schedule.misses)
+        schedule.next_poll_at = now + timedelta(seconds=schedule.interval)
+        heapq.heappush(self._queue, (schedule.next_poll_at, source_id))
+        return schedule
+
+    def record(
+        self, source: NewsSource, fetched: FetchResult, now: datetime | None = None
+    ) -> SourceSchedule | None:
+        """Reschedule ``source`` after a poll and store the schedule on it."""
+        schedule = self.reschedule(source.id, fetched, now)
+        if schedule is not None:
+            source.poll_interval = schedule.interval
+            source.next_poll_at = schedule.next_poll_at
+            source.poll_misses = schedule.misses
+        return schedule
+
+    def snapshot(self) -> list[SourceSchedule]:
+        """Every loaded source's schedule, soonest due first."""
+        return sorted(self._schedules.values(), key=lambda s: (s.next_poll_at, s.source_id))
+
+
+async def _record_failure(
+    session_factory: async_sessionmaker[AsyncSession],
+    scheduler: PollScheduler,
+    fetched: FetchResult,
+) -> None:
+    """Reschedule a source whose poll failed, as a miss."""
+    schedule = scheduler.reschedule(fetched.source_id, fetched)
+    if schedule is None:
+        return
+    try:
+        async with session_factory() as session:
+            await session.execute(
+                update(NewsSource)
+                .where(NewsSource.id == fetched.source_id)
+                .values(
+                    poll_interval=schedule.interval,
+                    next_poll_at=schedule.next_poll_at,
+                    poll_misses=schedule.misses,
+                )
+            )
+            await session.commit()
+    except Exception:
+        logger.exception("Saving the schedule of source %s failed", fetched.source_id)
+
+
+async def _poll_source(
+    session_factory: async_sessionmaker[AsyncSession],
+    scheduler: PollScheduler,
+    fetcher: FeedFetcher,
+    source_id: int,
+    extraction: ExtractionStage | None,
+    limit: asyncio.Semaphore,
+) -> FetchResult | None:
+    """Poll one source under the ``POLL_SOURCE_TIMEOUT`` deadline.
+
+    A poll that fails or runs out of time is rolled back and recorded as a
+    miss, so the source backs off like any other that found nothing.
+    """
+    url = ""
+    pages: list[tuple[int, str]] = []
+    async with limit:
+        try:
+            async with asyncio.timeout(settings.POLL_SOURCE_TIMEOUT):
+                async with session_factory() as session:
+                    source = await session.get(NewsSource, source_id)
+                    if source is None:
+                        return None
+                    url = source.rss_url
+                    fetched = await fetcher.ingest_source(session, source)
+                    scheduler.record(source, fetched)
+                    await session.commit()
+
+                    if extraction is not None and fetched.ingested and fetched.ingested.new_ids:
+                        # Feeds rarely carry full bodies: fetch the pages of
+                        # those without (near-duplicates are never analyzed,
+                        # so need none)
+                        result = await session.execute(
+                            select(Article.id, Article.url).where(
+                                Article.id.in_(fetched.ingested.new_ids),
+                                Article.content.is_(None),
+                                Article.duplicate_of_id.is_(None),
+                            )
+                        )
+                        pages = list(result.tuples())
+        except Exception as e:
+            error = "Timed out" if isinstance(e, TimeoutError) else repr(e)
+            logger.warning("Polling source %s failed: %s", source_id, error)
+            fetched = FetchResult(source_id, url, status=None, error=error)
+            await _record_failure(session_factory, scheduler, fetched)
+            return fetched
+    # A full queue waits for consumers that store through the same pool:
+    # submit only once this session's connection is back in it
+    for article_id, page_url in pages:
+        await extraction.submit(article_id, page_url)
+    return fetched
+
+
+async def poll_due_sources(
+    session_factory: async_sessionmaker[AsyncSession],
+    scheduler: PollScheduler,
+    fetcher: FeedFetcher,
+    now: datetime | None = None,
+    extraction: ExtractionStage | None = None,
+) -> list[FetchResult]:
+    """Stream every due source's feed into ingestion and reschedule it.
+
+    Sources are polled concurrently, ``POLL_CONCURRENCY`` at a time, each
+    in its own session and transaction and under its own deadline; the
+    fetcher's per-host limits still apply. New articles without a body are
+    handed to ``extraction`` when given.
+    """
+    limit = asyncio.Semaphore(settings.POLL_CONCURRENCY)
+    results = await asyncio.gather(*(
+        _poll_source(
+            session_factory, scheduler, fetcher, schedule.source_id, extraction, limit
+        )
+        for schedule in scheduler.pop_due(now)
+    ))
+    return [fetched for fetched in results if fetched is not None]
+
+
+async def _wait_for_any(events: list[asyncio.Event], timeout: float) -> None:
+    waiters = [asyncio.create_task(event.wait()) for event in events]
+    try:
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+async def run_poller(
+    session_factory: async_sessionmaker[AsyncSession],
+    scheduler: PollScheduler,
+    fetcher: FeedFetcher,
+    stop: asyncio.Event,
+    extraction: ExtractionStage | None = None,
+) -> None:
+    """Poll sources as they fall due until ``stop`` is set.
+
+    Each due source is polled in a task of its own, as in
+    ``poll_due_sources``, without waiting for the others to finish.
+    Cadences and the source list are reloaded, and the fetcher's seen URL
+    filter maintained, every ``POLL_REFRESH_INTERVAL`` seconds. Polls still
+    running at stop are cancelled. Run a single poller per deployment.
+    """
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(settings.POLL_CONCURRENCY)
+    # Each source is polled in its own task: a slow feed holds up no other
+    polls: dict[int, asyncio.Task[FetchResult | None]] = {}
+    # Set when a poll ends, since it puts its source back on the queue
+    polled = asyncio.Event()
+
+    def start(source_id: int) -> None:
+        def done(_: asyncio.Task[FetchResult | None]) -> None:
+            polls.pop(source_id, None)
+            polled.set()
+
+        task = asyncio.create_task(
+            _poll_source(session_factory, scheduler, fetcher, source_id, extraction, limit)
+        )
+        polls[source_id] = task
+        task.add_done_callback(done)
+
+    refresh_at = 0.0
+    try:
+        while not stop.is_set():
+            try:
+                if loop.time() >= refresh_at:
+                    refresh_at = loop.time() + settings.POLL_REFRESH_INTERVAL
+                    async with session_factory() as session:
+                        await scheduler.load(session)
+                        if fetcher.seen is not None:
+                            await fetcher.seen.refresh(session)
+                for schedule in scheduler.pop_due():
+                    # A reload requeues sources still being polled
+                    if schedule.source_id not in polls:
+                        start(schedule.source_id)
+            except Exception:
+                logger.exception("Polling feeds failed")
+
+            wait = refresh_at - loop.time()
+            if (due_at := scheduler.next_due_at()) is not None:
+                wait = min(wait, (due_at - datetime.now(UTC)).total_seconds())
+            polled.clear()
+            await _wait_for_any([stop, polled], timeout=max(wait, 0))
+    finally:
+        for task in polls.values():
+            task.cancel()
+        await asyncio.gather(*polls.values(), return_exceptions=True)
+
+
+poll_scheduler = PollScheduler(
+    min_interval=settings.POLL_MIN_INTERVAL,
+    max_interval=settings.POLL_MAX_INTERVAL,
+    default_interval=settings.POLL_DEFAULT_INTERVAL,
+    backoff_factor=settings.POLL_BACKOFF_FACTOR,
+)
@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.base import read_session
+from ..utils.lru import SizedLRUCache
+from ..utils.serialization import dumps, loads
+from .article_counts import invalidate_article_counts
+
+logger = logging.getLogger(__name__)
+
+# A loader builds a payload ``dumps`` can serialize and the tags it depends on
+Loader = Callable[[AsyncSession], Awaitable[tuple[Any, Iterable[str]]]]
+
+HIT = "HIT"
+STALE = "STALE"
+MISS = "MISS"
+BYPASS = "BYPASS"
+# Served from an in-process cache in front of Redis
+LOCAL = "LOCAL"
+
+
+class ResponseCache:
+    """Redis cache of serialized responses with stale-while-revalidate.
+
+    Entries are fresh for ``ttl`` seconds and then served stale for up to
+    ``stale_ttl`` more while a single background task rebuilds them. Every
+    entry is registered under tags (e.g. ``article:42``) so writers can drop
+    exactly the responses that depend on what they changed. Redis errors
+    never fail a request: the cache is bypassed and the loader runs inline.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        prefix: str,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]] = read_session,
+        enabled: bool = True,
+    ) -> None:
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self._redis: Redis | None = None
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            )
+        return self._redis
+
+    def key(self, namespace: str, params: Mapping[str, Any]) -> str:
+        """Build a cache key from normalized request parameters."""
+        normalized = json.dumps(
+            {name: value for name, value in params.items() if value is not None},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(normalized.encode()).hexdigest()[:32]
+        return f"{self.prefix}:{namespace}:{digest}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Loader,
+        db: AsyncSession,
+        ttl: int,
+        stale_ttl: int,
+    ) -> tuple[Any, str]:
+        """Return the cached payload for ``key``, loading it on a miss.
+
+        Returns the payload and the cache status (HIT, STALE, MISS, BYPASS).
+        """
+        if not self.enabled:
+            payload, _ = await loader(db)
+            return payload, BYPASS
+
+        try:
+            cached = await self.redis.get(key)
+        except RedisError:
+            logger.warning("Response cache unavailable, bypassing", exc_info=True)
+            payload, _ = await loader(db)
+            return payload, BYPASS
+
+        if cached is not None:
+            try:
+                entry = loads(cached)
+                fresh_until, payload = entry["fresh_until"], entry["payload"]
+            except (ValueError, TypeError, KeyError):
+                # Overwritten by the load below, like any miss
+                logger.warning("Discarding corrupt response cache entry %s", key)
+            else:
+                if fresh_until > time.time():
+                    return payload, HIT
+                await self._schedule_refresh(key, loader, ttl, stale_ttl)
+                return payload, STALE
+
+        payload, tags = await loader(db)
+        await self._store(key, payload, tags, ttl, stale_ttl)
+        return payload, MISS
+
+    async def invalidate(self, *tags: str) -> None:
+        """Drop every entry registered under any of ``tags``."""
+        if not self.enabled or not tags:
+            return
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+            keys = {key for group in members for key in group}
+            await self.redis.delete(*keys, *tag_keys)
+        except RedisError:
+            logger.warning("Response cache invalidation failed", exc_info=True)
+
+    async def clear(self) -> None:
+        """Drop every entry under this cache's prefix."""
+        keys = [key async for key in self.redis.scan_iter(f"{self.prefix}:*")]
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def _store(
+        self, key: str, payload: Any, tags: Iterable[str], ttl: int, stale_ttl: int
+    ) -> None:
+        entry = dumps({"fresh_until": time.time() + ttl, "payload": payload})
+        expire = ttl + stale_ttl
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(key, entry, ex=expire)
+                for tag in tags:
+                    tag_key = self._tag_key(tag)
+                    pipe.sadd(tag_key, key)
+                    pipe.expire(tag_key, expire)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Response cache write failed", exc_info=True)
+
+    async def _schedule_refresh(
+        self, key: str, loader: Loader, ttl: int, stale_ttl: int
+    ) -> None:
+        """Start one background rebuild of ``key`` across all workers."""
+        try:
+            acquired = await self.redis.set(f"{key}:refresh", 1, nx=True, ex=max(ttl, 1))
+        except RedisError:
+            return
+        if not acquired:
+            return
+        task = asyncio.create_task(self._refresh(key, loader, ttl, stale_ttl))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: str, loader: Loader, ttl: int, stale_ttl: int) -> None:
+        try:
+            async with self.session_factory() as session:
+                payload, tags = await loader(session)
+            await self._store(key, payload, tags, ttl, stale_ttl)
+        except Exception:
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            try:
+                await self.redis.delete(f"{key}:refresh")
+            except RedisError:
+                pass
+
+
+article_cache = ResponseCache(
+    settings.REDIS_URL,
+    prefix="articles",
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
+
+# Serialized article details with their ETags, keyed by article id. Kept
+# shorter-lived than Redis entries since other workers cannot evict it.
+article_detail_lru = SizedLRUCache(
+    max_bytes=settings.ARTICLE_DETAIL_LRU_MAX_BYTES,
+    ttl=settings.ARTICLE_DETAIL_LRU_TTL,
+)
+
+
+def article_tag(article_id: int) -> str:
+    """Cache tag of every response that contains ``article_id``."""
+    return f"article:{article_id}"
+
+
+# Cache tag of every article listing page
+ARTICLE_LISTINGS_TAG = "articles"
+
+
+async def invalidate_article(article_id: int) -> None:
+    """Drop cached responses that include an article that changed."""
+    article_detail_lru.pop(article_id)
+    await article_cache.invalidate(article_tag(article_id))
+
+
+async def invalidate_articles(article_ids: Iterable[int]) -> None:
+    """``invalidate_article`` for many articles in one round trip."""
+    article_ids = list(article_ids)
+    for article_id in article_ids:
+        article_detail_lru.pop(article_id)
+    await article_cache.invalidate(*(article_tag(article_id) for article_id in article_ids))
+
+
+async def invalidate_article_listings() -> None:
+    """Drop every cached listing page, e.g. after new articles are ingested."""
+    await article_cache.invalidate(ARTICLE_LISTINGS_TAG)
+
+
+def invalidate_after_commit(
+    db: AsyncSession, article_ids: Iterable[int] = (), listings: bool = False
+) -> None:
+    """Invalidate ``article_ids`` (and with ``listings``, every listing page
+    and total) once ``db``'s transaction commits.
+
+    Invalidating before the commit would let a read in between cache the
+    old rows again.
+    """
+    pending = db.sync_session.info.setdefault(_PENDING_KEY, {"ids": set(), "listings": False})
+    pending["ids"].update(article_ids)
+    pending["listings"] = pending["listings"] or listings
+
+
+async def _invalidate(article_ids: set[int], listings: bool) -> None:
+    if listings:
+        await invalidate_article_counts()
+        await invalidate_article_listings()
+    if article_ids:
+        await invalidate_articles(article_ids)
+
+
+# Invalidations owed by a session, run once its transaction commits
+_PENDING_KEY = "invalidate_articles"
+_invalidation_tasks: set[asyncio.Task[None]] = set()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    # In-process entries go right away, Redis entries in a task
+    for article_id in pending["ids"]:
+        article_detail_lru.pop(article_id)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_invalidate(pending["ids"], pending["listings"]))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
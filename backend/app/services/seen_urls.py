@@ -0,0 +1,154 @@
+import logging
+from collections.abc import Iterable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.models import Article
+from ..utils.bloom import BloomFilter
+from ..utils.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class SeenUrlFilter:
+    """Bloom filter of the canonical URLs of every stored article.
+
+    Lets the fetcher drop feed items it has already ingested without a
+    database round trip. A URL is only added once the transaction that
+    stored it commits, so the filter never claims an article that was
+    rolled back; a false positive (about ``error_rate``) skips one new
+    item. The filter is snapshotted to Redis and rebuilt from the
+    ``articles`` table when the snapshot is missing or the filter is full.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        capacity: int,
+        error_rate: float,
+        key: str = "seen_urls:bloom",
+    ) -> None:
+        self.redis_url = redis_url
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.key = key
+        self.bloom: BloomFilter | None = None
+        self._dirty = False
+        self._redis: Redis | None = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            )
+        return self._redis
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return self.bloom is None or self.bloom.is_full
+
+    def __contains__(self, canonical_url: str) -> bool:
+        # Nothing is known before loading: every item goes to the database
+        return self.bloom is not None and canonical_url in self.bloom
+
+    def add(self, canonical_urls: Iterable[str]) -> None:
+        """Record canonical URLs that are stored."""
+        if self.bloom is None:
+            return
+        for url in canonical_urls:
+            self.bloom.add(url)
+            self._dirty = True
+
+    def add_after_commit(self, db: AsyncSession, canonical_urls: Iterable[str]) -> None:
+        """Record canonical URLs once ``db``'s transaction commits."""
+        pending = db.sync_session.info.setdefault(_PENDING_KEY, [])
+        pending.append((self, list(canonical_urls)))
+
+    async def load(self, db: AsyncSession) -> None:
+        """Load the Redis snapshot, or rebuild when there is none."""
+        try:
+            snapshot = await self.redis.get(self.key)
+        except RedisError:
+            logger.warning("Seen URL snapshot unavailable", exc_info=True)
+            snapshot = None
+        if snapshot is not None:
+            try:
+                self.bloom = BloomFilter.from_bytes(snapshot)
+                self._dirty = False
+            except ValueError:
+                logger.warning("Discarding corrupt seen URL snapshot")
+        if self.needs_rebuild:
+            await self.rebuild(db)
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Periodic upkeep: load on first use, rebuild once full, else snapshot."""
+        if self.bloom is None:
+            await self.load(db)
+        elif self.needs_rebuild:
+            await self.rebuild(db)
+        else:
+            await self.save()
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Build a fresh filter from the stored articles and snapshot it.
+
+        Sized for twice the stored articles (at least ``capacity``) so it
+        has room to grow before the next rebuild.
+        """
+        stored = await db.scalar(select(func.count()).select_from(Article))
+        bloom = BloomFilter(max(self.capacity, 2 * stored), self.error_rate)
+        urls = await db.stream_scalars(
+            select(func.coalesce(Article.canonical_url, Article.url)).execution_options(
+                yield_per=10_000
+            )
+        )
+        async for url in urls:
+            bloom.add(canonicalize_url(url))
+        self.bloom = bloom
+        self._dirty = True
+        await self.save()
+
+    async def save(self) -> None:
+        """Snapshot the filter to Redis if it changed."""
+        if self.bloom is None or not self._dirty:
+            return
+        try:
+            await self.redis.set(self.key, self.bloom.to_bytes())
+            self._dirty = False
+        except RedisError:
+            logger.warning("Saving the seen URL snapshot failed", exc_info=True)
+
+    async def clear(self) -> None:
+        """Forget the filter and its snapshot."""
+        self.bloom = None
+        self._dirty = False
+        await self.redis.delete(self.key)
+
+
+seen_urls = SeenUrlFilter(
+    settings.REDIS_URL,
+    capacity=settings.SEEN_URLS_CAPACITY,
+    error_rate=settings.SEEN_URLS_ERROR_RATE,
+)
+
+# URLs stored in a session, added to their filter once it commits
+_PENDING_KEY = "seen_urls"
+
+
+@event.listens_for(Session, "after_commit")
+def _add_committed_urls(session: Session) -> None:
+    for seen, canonical_urls in session.info.pop(_PENDING_KEY, ()):
+        seen.add(canonical_urls)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_urls(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
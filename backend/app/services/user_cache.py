@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import DateTime, event, inspect
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.models import User
+from ..utils.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Columns kept for authenticated users; the password hash never leaves the DB
+_CACHED_COLUMNS = [
+    column for column in User.__table__.columns if column.key != "hashed_password"
+]
+_DATETIME_COLUMNS = {
+    column.key for column in _CACHED_COLUMNS if isinstance(column.type, DateTime)
+}
+
+
+class UserCache:
+    """TTL cache of authenticated users keyed by token subject (username).
+
+    A bounded in-process LRU answers most lookups; when ``redis_url`` is
+    set, Redis is a shared second level so other workers see the same
+    entries and invalidations. Cached users are detached ``User`` objects
+    without ``hashed_password``: load the row again before changing it.
+    """
+
+    def __init__(
+        self, ttl: float, max_entries: int, redis_url: str | None = None
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.redis_url = redis_url
+        self._redis: Redis | None = None
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    @property
+    def redis(self) -> Redis | None:
+        if self.redis_url is None:
+            return None
+        if self._redis is None:
+            self._redis = Redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            )
+        return self._redis
+
+    def _redis_key(self, username: str) -> str:
+        return f"users:{username}"
+
+    async def get(self, username: str) -> User | None:
+        """Return the cached user for ``username`` or None if missing/expired."""
+        entry = self._entries.get(username)
+        if entry is not None:
+            expires_at, fields = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(username)
+                return User(**fields)
+            del self._entries[username]
+
+        if self.redis is None:
+            return None
+        try:
+            cached = await self.redis.get(self._redis_key(username))
+        except RedisError:
+            logger.warning("User cache unavailable", exc_info=True)
+            return None
+        if cached is None:
+            return None
+        try:
+            fields = loads(cached)
+            for key in _DATETIME_COLUMNS:
+                if fields[key] is not None:
+                    fields[key] = datetime.fromisoformat(fields[key])
+            user = User(**fields)
+        except (ValueError, TypeError, KeyError):
+            logger.warning("Discarding corrupt cached user %s", username)
+            return None
+        self._store_local(username, fields)
+        return user
+
+    async def set(self, user: User) -> None:
+        """Cache a user that was just loaded from the database."""
+        fields = {column.key: getattr(user, column.key) for column in _CACHED_COLUMNS}
+        self._store_local(user.username, fields)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(
+                self._redis_key(user.username), dumps(fields), ex=max(int(self.ttl), 1)
+            )
+        except RedisError:
+            logger.warning("User cache write failed", exc_info=True)
+
+    async def invalidate(self, *usernames: str) -> None:
+        """Drop ``usernames`` from both cache levels."""
+        self.discard_local(*usernames)
+        if self.redis is None or not usernames:
+            return
+        try:
+            await self.redis.delete(*(self._redis_key(name) for name in usernames))
+        except RedisError:
+            logger.warning("User cache invalidation failed", exc_info=True)
+
+    def discard_local(self, *usernames: str) -> None:
+        """Drop ``usernames`` from the in-process level only."""
+        for username in usernames:
+            self._entries.pop(username, None)
+
+    def clear(self) -> None:
+        """Drop every in-process entry."""
+        self._entries.clear()
+
+    def _store_local(self, username: str, fields: dict[str, Any]) -> None:
+        self._entries[username] = (time.monotonic() + self.ttl, fields)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+user_cache = UserCache(
+    ttl=settings.USER_CACHE_TTL,
+    max_entries=settings.USER_CACHE_SIZE,
+    redis_url=settings.REDIS_URL if settings.USER_CACHE_REDIS_ENABLED else None,
+)
+
+# Usernames changed in a session, invalidated once its transaction commits
+_PENDING_KEY = "invalidate_users"
+_invalidation_tasks: set[asyncio.Task[None]] = set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context: Any) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            # A rename must drop the entry under the old name too
+            history = inspect(obj).attrs.username.history
+            pending.update(name for name in (*history.deleted, obj.username) if name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    usernames = session.info.pop(_PENDING_KEY, None)
+    if not usernames:
+        return
+    # Commits run in the event loop thread (async sessions) or outside any
+    # loop (sync sessions, e.g. workers); drop local entries right away
+    user_cache.discard_local(*usernames)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(user_cache.invalidate(*usernames))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
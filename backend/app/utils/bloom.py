@@ -0,0 +1,69 @@
+import hashlib
+import math
+import struct
+
+# Serialized header: capacity, items added, bit count, hash count
+_HEADER = struct.Struct(">QQQI")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings.
+
+    Sized for ``capacity`` items at a false positive rate of
+    ``error_rate``; beyond ``capacity`` the rate climbs, so rebuild a
+    larger filter once ``is_full``. Membership tests never miss an added
+    item and wrongly report an absent one with probability about
+    ``error_rate``.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing: k positions from two independent 64-bit hashes
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = struct.unpack(">QQ", digest)
+        second |= 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        """Add ``item``."""
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item)
+        )
+
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(self.capacity, self.count, self.num_bits, self.num_hashes)
+        return header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        """Load a filter written by ``to_bytes``; raises ValueError if corrupt."""
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated Bloom filter")
+        capacity, count, num_bits, num_hashes = _HEADER.unpack_from(data)
+        bits = data[_HEADER.size:]
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError("Bloom filter size does not match its header")
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.count = count
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom._bits = bytearray(bits)
+        return bloom
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import struct
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+DIGEST_SIZE = 16
+# ids.bin entries: id, row
+_ID_ENTRY = struct.Struct("<qq")
+
+
+def text_digest(text: str) -> bytes:
+    """Key of an embedded text: equal texts share one stored vector."""
+    return hashlib.blake2b(text.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+def _append(path: Path, data: bytes) -> None:
+    with open(path, "ab") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+class EmbeddingStore:
+    """On-disk float32 vectors, keyed by the digest of their text and by id.
+
+    ``vectors.f32`` holds one row of ``dim`` float32 values per distinct
+    text and is read through a memory map, so only the pages used are
+    loaded. ``digests.bin`` holds each row's text digest and ``ids.bin``
+    maps ids to rows, later entries replacing earlier ones. All three are
+    append-only and written in that order, each synced before the next, so
+    a crash can only lose the rows being added; they are dropped when the
+    store is reopened. Vectors of texts that changed since are kept, to be
+    reused should a text come back. A store belongs to one model: opening
+    it for another raises ValueError. One writer at a time.
+    """
+
+    def __init__(self, directory: str | Path, model: str, dim: int) -> None:
+        self.directory = Path(directory)
+        self.model = model
+        self.dim = dim
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path = self.directory / "meta.json"
+        meta = {"model": model, "dim": dim}
+        if meta_path.exists():
+            stored = json.loads(meta_path.read_text())
+            if stored != meta:
+                raise ValueError(f"{self.directory} holds {stored}, not {meta}")
+        else:
+            meta_path.write_text(json.dumps(meta))
+
+        self._vectors_path = self.directory / "vectors.f32"
+        self._digests_path = self.directory / "digests.bin"
+        self._ids_path = self.directory / "ids.bin"
+        for path in (self._vectors_path, self._digests_path, self._ids_path):
+            path.touch()
+        self._load()
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dim * np.dtype(np.float32).itemsize
+
+    def _load(self) -> None:
+        digests = self._digests_path.read_bytes()
+        ids = self._ids_path.read_bytes()
+        ids = ids[: len(ids) - len(ids) % _ID_ENTRY.size]
+        rows = min(
+            len(digests) // DIGEST_SIZE,
+            self._vectors_path.stat().st_size // self._row_bytes,
+        )
+        # Drop whatever an interrupted write left behind
+        os.truncate(self._vectors_path, rows * self._row_bytes)
+        os.truncate(self._digests_path, rows * DIGEST_SIZE)
+        os.truncate(self._ids_path, len(ids))
+
+        self._digests = [
+            digests[row * DIGEST_SIZE:(row + 1) * DIGEST_SIZE] for row in range(rows)
+        ]
+        self._rows: dict[bytes, int] = {}
+        for row, digest in enumerate(self._digests):
+            self._rows.setdefault(digest, row)
+        self._ids: dict[int, int] = {
+            item_id: row for item_id, row in _ID_ENTRY.iter_unpack(ids) if row < rows
+        }
+        self._matrix: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        """Number of stored vectors."""
+        return len(self._digests)
+
+    def row_of(self, digest: bytes) -> int | None:
+        """Row of the vector of the text with ``digest``, if stored."""
+        return self._rows.get(digest)
+
+    def row_for(self, item_id: int) -> int | None:
+        """Row of the vector of ``item_id``, if it has one."""
+        return self._ids.get(item_id)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Read-only ``(len(self), dim)`` memory map of every vector."""
+        if self._matrix is None or len(self._matrix) != len(self):
+            if not len(self):
+                return np.empty((0, self.dim), dtype=np.float32)
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(len(self), self.dim)
+            )
+        return self._matrix
+
+    def get(self, item_id: int) -> np.ndarray | None:
+        """Vector of ``item_id``, or None without one."""
+        row = self._ids.get(item_id)
+        return None if row is None else self.vectors[row]
+
+    def item_ids(self) -> list[int]:
+        return list(self._ids)
+
+    def add(self, digests: list[bytes], vectors: np.ndarray) -> list[int]:
+        """Append the vectors of texts with ``digests``; returns their rows."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(digests), self.dim):
+            raise ValueError(f"Expected {len(digests)} vectors of {self.dim} values")
+        first = len(self)
+        _append(self._vectors_path, vectors.tobytes())
+        _append(self._digests_path, b"".join(digests))
+        rows = list(range(first, first + len(digests)))
+        for row, digest in zip(rows, digests, strict=True):
+            self._digests.append(digest)
+            self._rows.setdefault(digest, row)
+        return rows
+
+    def assign(self, rows: Iterable[tuple[int, int]]) -> None:
+        """Point each ``(item_id, row)`` id at a stored row."""
+        rows = list(rows)
+        if not rows:
+            return
+        _append(self._ids_path, b"".join(_ID_ENTRY.pack(i, row) for i, row in rows))
+        self._ids.update(rows)
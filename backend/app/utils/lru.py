@@ -0,0 +1,59 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class SizedLRUCache:
+    """In-process LRU of serialized payloads bounded by their total size.
+
+    Each entry is a ``(etag, body)`` pair that expires after ``ttl`` seconds.
+    Least recently used entries are evicted once the bodies exceed
+    ``max_bytes``; a body larger than the whole budget is never stored.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self._entries: OrderedDict[Hashable, tuple[float, str, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[str, bytes] | None:
+        """Return ``(etag, body)`` for ``key`` or None if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, etag, body = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return etag, body
+
+    def set(self, key: Hashable, etag: str, body: bytes, ttl: float | None = None) -> None:
+        """Store ``body`` under ``key``, evicting old entries to fit.
+
+        A ``ttl`` can only shorten the cache's own.
+        """
+        self.pop(key)
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or len(body) > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + ttl, etag, body)
+        self.current_bytes += len(body)
+        while self.current_bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop ``key`` if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= len(entry[2])
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self.current_bytes = 0
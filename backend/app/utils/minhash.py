@@ -0,0 +1,78 @@
+import hashlib
+import re
+
+import numpy as np
+
+_MARKUP = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"\w+")
+_UINT64 = np.dtype("<u8")
+_SIGNATURE = np.dtype("<u4")
+
+
+def shingles(text: str, size: int) -> np.ndarray:
+    """Distinct 64-bit hashes of the ``size``-word shingles of ``text``.
+
+    Markup, case and punctuation are ignored. The hashes are stable across
+    processes (unlike ``hash``), so signatures can be stored.
+    """
+    words = _WORD.findall(_MARKUP.sub(" ", text).lower())
+    hashes = {
+        hashlib.blake2b(" ".join(words[i:i + size]).encode(), digest_size=8).digest()
+        for i in range(len(words) - size + 1)
+    }
+    return np.frombuffer(b"".join(hashes), dtype=_UINT64)
+
+
+class MinHasher:
+    """MinHash signatures estimating the Jaccard similarity of shingle sets.
+
+    Each of the ``num_perm`` slots keeps the minimum of one multiply-shift
+    hash over the shingles; two signatures agree on a slot with probability
+    equal to the Jaccard similarity of their sets. Signatures are only
+    comparable between hashers with the same ``num_perm`` and ``seed``.
+    """
+
+    def __init__(self, num_perm: int, seed: int = 1) -> None:
+        self.num_perm = num_perm
+        rng = np.random.default_rng(seed)
+        # Odd multipliers make x -> a * x mod 2**64 a permutation
+        self._a = rng.integers(0, 2**64, num_perm, dtype=np.uint64, endpoint=False) | 1
+        self._b = rng.integers(0, 2**64, num_perm, dtype=np.uint64, endpoint=False)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """Signature of a non-empty set of shingle hashes."""
+        # uint64 arithmetic wraps around: exactly mod 2**64
+        permuted = (hashes[:, None] * self._a + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(_SIGNATURE)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(first == second)) / len(first)
+
+    @staticmethod
+    def to_bytes(signature: np.ndarray) -> bytes:
+        return signature.astype(_SIGNATURE).tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype=_SIGNATURE)
+
+
+def band_buckets(signature: np.ndarray, bands: int) -> list[int]:
+    """LSH bucket of each of the ``bands`` bands of ``signature``.
+
+    Signatures sharing a bucket in any band are candidate near-duplicates.
+    Buckets are signed 64-bit integers so they fit a ``BIGINT`` column.
+    """
+    rows = len(signature) // bands
+    data = signature.astype(_SIGNATURE).tobytes()
+    width = rows * _SIGNATURE.itemsize
+    return [
+        int.from_bytes(
+            hashlib.blake2b(data[band * width:(band + 1) * width], digest_size=8).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(bands)
+    ]
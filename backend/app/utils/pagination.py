@@ -0,0 +1,34 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+def encode_cursor(published_at: datetime | None, article_id: int) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor."""
+    payload = {
+        "p": published_at.isoformat() if published_at else None,
+        "i": article_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises ``ValueError`` if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        published_at = payload["p"]
+        article_id = payload["i"]
+        if not isinstance(article_id, int) or isinstance(article_id, bool):
+            raise TypeError(article_id)
+        if published_at is not None:
+            published_at = datetime.fromisoformat(published_at)
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    return published_at, article_id
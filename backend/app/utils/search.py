@@ -0,0 +1,29 @@
+import re
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def build_tsquery(search: str) -> str | None:
+    """Translate a user search string into ``to_tsquery`` syntax.
+
+    Bare words are ANDed together, ``"quoted text"`` matches as a phrase and
+    a trailing ``*`` turns a word into a prefix match (``optim*``). Any other
+    punctuation is dropped, so user input can never inject tsquery operators.
+    Returns None when the string contains no searchable words.
+    """
+    clauses = []
+    for phrase, term in _TOKEN_RE.findall(search):
+        words = _WORD_RE.findall(phrase or term)
+        if not words:
+            continue
+        if term.endswith("*"):
+            words[-1] += ":*"
+        if len(words) == 1:
+            clauses.append(words[0])
+        else:
+            clauses.append(f"({' <-> '.join(words)})")
+
+    if not clauses:
+        return None
+    return " & ".join(clauses)
@@ -0,0 +1,32 @@
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+# Emit UTC datetimes with a "Z" suffix, like pydantic does
+_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize plain data (dicts, lists, datetimes...) to compact JSON bytes."""
+    return orjson.dumps(payload, option=_OPTIONS)
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON produced by ``dumps``."""
+    return orjson.loads(data)
+
+
+class JSONBytesResponse(Response):
+    """JSON response for payloads that are already plain data or bytes.
+
+    Skips FastAPI's ``jsonable_encoder`` pass and the stdlib encoder; bytes
+    are sent as they are.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
@@ -0,0 +1,105 @@
+"""Celery worker draining the article processing backlog.
+
+Start workers with ``celery -A app.worker worker`` and the periodic
+trigger with ``celery -A app.worker beat``. Any number of workers may run:
+each claims its own batches (see ``claim_articles``).
+"""
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any
+
+from celery import Celery
+from celery.signals import worker_shutdown
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from .core.config import settings
+from .db.base import DATABASE_URL
+from .services.article_processing import process_article_batch
+
+celery_app = Celery("aiagg", broker=settings.CELERY_BROKER_URL or settings.REDIS_URL)
+celery_app.conf.update(
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    beat_schedule={
+        "process-articles": {
+            "task": "app.worker.process_articles",
+            "schedule": settings.PROCESSING_INTERVAL,
+        },
+    },
+)
+
+
+class _WorkerRuntime:
+    """Event loop and database engine of one worker thread.
+
+    Celery runs tasks synchronously; each pool process (or thread) keeps one
+    loop for its whole life so the engine's pooled connections stay bound
+    to it, and creates both lazily so nothing crosses a fork.
+    """
+
+    def __init__(self, database_url: str) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.engine = create_async_engine(database_url, pool_size=2, max_overflow=0)
+        self.session_factory = async_sessionmaker(
+            bind=self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+    def run(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        return self.loop.run_until_complete(coroutine)
+
+    def close(self) -> None:
+        self.loop.run_until_complete(self.engine.dispose())
+        self.loop.close()
+
+
+_local = threading.local()
+
+
+def get_runtime() -> _WorkerRuntime:
+    runtime = getattr(_local, "runtime", None)
+    if runtime is None:
+        runtime = _local.runtime = _WorkerRuntime(DATABASE_URL)
+    return runtime
+
+
+@worker_shutdown.connect
+def close_runtime(**kwargs: Any) -> None:
+    """Dispose of the calling thread's loop and engine, if any."""
+    runtime = getattr(_local, "runtime", None)
+    if runtime is not None:
+        runtime.close()
+        del _local.runtime
+
+
+async def _drain(
+    session_factory: async_sessionmaker[AsyncSession],
+    batch_size: int,
+    lease_seconds: float,
+    max_batches: int,
+) -> int:
+    processed = 0
+    for _ in range(max_batches):
+        claimed = await process_article_batch(session_factory, batch_size, lease_seconds)
+        if not claimed:
+            break
+        processed += claimed
+    return processed
+
+
+@celery_app.task(name="app.worker.process_articles")
+def process_articles(
+    batch_size: int | None = None, max_batches: int | None = None
+) -> int:
+    """Process unprocessed articles batch by batch until none are left.
+
+    Stops after ``max_batches`` so one task never hogs a worker; the beat
+    schedule starts another. Returns the number of articles claimed.
+    """
+    runtime = get_runtime()
+    return runtime.run(_drain(
+        runtime.session_factory,
+        batch_size or settings.PROCESSING_BATCH_SIZE,
+        settings.PROCESSING_LEASE_SECONDS,
+        max_batches or settings.PROCESSING_MAX_BATCHES,
+    ))
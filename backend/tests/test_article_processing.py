@@ -0,0 +1,233 @@
+"""Tests for the article processing backlog and its Celery worker."""
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+import pytest_asyncio
+from celery.contrib.testing.worker import start_worker
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import worker
+from app.db.models import Article, ArticleTag, NewsSource, Tag
+from app.services.article_processing import (
+    ClaimedArticle,
+    analyze_article,
+    claim_articles,
+    complete_articles,
+    process_article_batch,
+)
+from app.services.ingestion import ArticleRecord, ingest_articles
+from app.services.response_cache import article_cache
+from tests.helpers import TEST_DATABASE_URL
+
+BACKLOG_SIZE = 60
+
+
+def claimed(title: str, summary: str | None = None, content: str | None = None) -> ClaimedArticle:
+    return ClaimedArticle(id=1, title=title, summary=summary, content=content)
+
+
+async def add_articles(db: AsyncSession, count: int) -> list[int]:
+    source = NewsSource(name="Backlog Daily", url="https://backlog.example.com")
+    db.add(source)
+    await db.flush()
+    articles = [
+        Article(
+            title=f"New chip {i} boosts inference",
+            url=f"https://backlog.example.com/{i}",
+            content="The accelerator doubles throughput. It ships next year. More soon.",
+            source_id=source.id,
+        )
+        for i in range(count)
+    ]
+    db.add_all(articles)
+    await db.flush()
+    return [article.id for article in articles]
+
+
+@pytest_asyncio.fixture
+async def backlog(engine) -> async_sessionmaker[AsyncSession]:
+    """Committed unprocessed articles, for workers on their own connections."""
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        await add_articles(session, BACKLOG_SIZE)
+        await session.commit()
+    yield session_factory
+    async with session_factory() as session:
+        await session.execute(delete(ArticleTag))
+        await session.execute(delete(Tag))
+        await session.execute(delete(Article))
+        await session.execute(delete(NewsSource))
+        await session.commit()
+
+
+@pytest.fixture
+def no_response_cache(monkeypatch):
+    monkeypatch.setattr(article_cache, "enabled", False)
+
+
+class TestAnalyzeArticle:
+    """Test the heuristic summary, sentiment and tags."""
+
+    def test_summary_falls_back_to_body(self):
+        """Without a feed summary the first sentences of the body are used."""
+        analysis = analyze_article(claimed(
+            "Launch", content="<p>First sentence. Second one!</p><p>Third.</p>"
+        ))
+
+        assert analysis.summary == "First sentence. Second one!"
+
+    def test_feed_summary_is_kept(self):
+        """A summary from the feed is only stripped of markup."""
+        analysis = analyze_article(claimed("Launch", summary="<b>Short</b> take.", content="Body."))
+
+        assert analysis.summary == "Short take."
+
+    def test_sentiment(self):
+        """Scores follow the balance of positive and negative words."""
+        assert analyze_article(claimed("Record growth as sales surge")).sentiment_score == 1.0
+        assert analyze_article(claimed("Outage and layoffs")).sentiment_score == -1.0
+        assert analyze_article(claimed("Weekly roundup")).sentiment_score == 0.0
+
+    def test_tags(self):
+        """Topic keywords become tags with a confidence."""
+        analysis = analyze_article(claimed("GPU chip for AI inference"))
+
+        assert analysis.tags == {"hardware": pytest.approx(2 / 3), "ai": pytest.approx(2 / 3)}
+
+
+class TestClaims:
+    """Test leasing and completing batches on one connection."""
+
+    async def test_claim_and_complete(self, db_session: AsyncSession):
+        """Completed articles get their analysis, tags and lose the lease."""
+        ids = await add_articles(db_session, 3)
+
+        token, batch = await claim_articles(db_session, batch_size=2, lease_seconds=60)
+        completed = await complete_articles(
+            db_session, token, {article.id: analyze_article(article) for article in batch}
+        )
+
+        assert [article.id for article in batch] == ids[:2] == completed
+        rows = (await db_session.execute(
+            select(Article.is_processed, Article.summary, Article.processing_claim)
+            .order_by(Article.id)
+        )).all()
+        assert rows == [
+            (True, "The accelerator doubles throughput. It ships next year.", None),
+            (True, "The accelerator doubles throughput. It ships next year.", None),
+            (False, None, None),
+        ]
+        tags = await db_session.execute(
+            select(ArticleTag.article_id, Tag.name).join(Tag).order_by(ArticleTag.article_id, Tag.name)
+        )
+        assert tags.all() == [(ids[0], "ai"), (ids[0], "hardware"), (ids[1], "ai"), (ids[1], "hardware")]
+
+    async def test_live_leases_are_skipped(self, db_session: AsyncSession):
+        """A second claim only gets what the first did not lease."""
+        ids = await add_articles(db_session, 3)
+
+        _, first = await claim_articles(db_session, batch_size=2, lease_seconds=60)
+        _, second = await claim_articles(db_session, batch_size=2, lease_seconds=60)
+        _, third = await claim_articles(db_session, batch_size=2, lease_seconds=60)
+
+        assert [a.id for a in first] == ids[:2]
+        assert [a.id for a in second] == ids[2:]
+        assert third == []
+
+    async def test_expired_lease_is_reclaimed(self, db_session: AsyncSession):
+        """A dead worker's batch goes to the next claim; its late result is dropped."""
+        await add_articles(db_session, 1)
+        stale_token, (article,) = await claim_articles(db_session, 1, lease_seconds=60)
+        await db_session.execute(
+            update(Article).values(processing_lease_until=datetime(2000, 1, 1, tzinfo=UTC))
+        )
+
+        token, (reclaimed,) = await claim_articles(db_session, 1, lease_seconds=60)
+        late = await complete_articles(db_session, stale_token, {article.id: analyze_article(article)})
+        completed = await complete_articles(db_session, token, {reclaimed.id: analyze_article(reclaimed)})
+
+        assert reclaimed.id == article.id
+        assert late == []
+        assert completed == [article.id]
+
+    async def test_reingested_article_drops_the_claim(self, db_session: AsyncSession):
+        """A changed article is queued again and the old analysis is discarded."""
+        (article_id,) = await add_articles(db_session, 1)
+        token, (article,) = await claim_articles(db_session, 1, lease_seconds=60)
+        source_id = await db_session.scalar(select(Article.source_id))
+
+        await ingest_articles(
+            db_session,
+            [ArticleRecord(url="https://backlog.example.com/0", title="Rewritten", source_id=source_id)],
+            update_existing=True,
+        )
+
+        assert await complete_articles(db_session, token, {article_id: analyze_article(article)}) == []
+        _, (again,) = await claim_articles(db_session, 1, lease_seconds=60)
+        assert again.title == "Rewritten"
+
+
+class TestParallelWorkers:
+    """Test workers draining the backlog on separate connections."""
+
+    async def test_claims_skip_locked_rows(self, backlog):
+        """An uncommitted claim neither blocks nor overlaps another one."""
+        async with backlog() as first, backlog() as second:
+            _, mine = await claim_articles(first, 10, lease_seconds=60)
+            _, theirs = await asyncio.wait_for(claim_articles(second, 10, lease_seconds=60), 5)
+            await first.rollback()
+            await second.rollback()
+
+        assert len(mine) == len(theirs) == 10
+        assert not {a.id for a in mine} & {a.id for a in theirs}
+
+    async def test_workers_drain_backlog_once(self, backlog, no_response_cache):
+        """Concurrent workers process every article exactly once."""
+        claims: list[list[int]] = []
+
+        def recording(article: ClaimedArticle):
+            claims[-1].append(article.id)
+            return analyze_article(article)
+
+        async def drain():
+            while True:
+                claims.append([])
+                if not await process_article_batch(backlog, 7, 60, analyze=recording):
+                    return
+
+        await asyncio.gather(*(drain() for _ in range(4)))
+
+        processed = [article_id for batch in claims for article_id in batch]
+        assert len(processed) == len(set(processed)) == BACKLOG_SIZE
+        async with backlog() as session:
+            remaining = await session.scalar(
+                select(func.count()).where(Article.is_processed.is_not(True))
+            )
+        assert remaining == 0
+
+
+class TestCeleryWorker:
+    """Test the Celery task on an in-memory broker."""
+
+    @pytest.fixture
+    def memory_celery(self, monkeypatch, no_response_cache):
+        monkeypatch.setattr(worker, "DATABASE_URL", TEST_DATABASE_URL)
+        saved = dict(worker.celery_app.conf)
+        worker.celery_app.conf.update(broker_url="memory://", result_backend="cache+memory://")
+        yield worker.celery_app
+        worker.celery_app.conf.update(saved)
+
+    async def test_task_drains_backlog(self, backlog, memory_celery):
+        """A worker consuming the task processes the committed backlog."""
+        with start_worker(memory_celery, perform_ping_check=False):
+            result = worker.process_articles.delay(batch_size=25)
+            claimed = await asyncio.to_thread(result.get, timeout=30)
+
+        assert claimed == BACKLOG_SIZE
+        async with backlog() as session:
+            processed = await session.scalar(
+                select(func.count()).where(Article.is_processed.is_(True))
+            )
+        assert processed == BACKLOG_SIZE
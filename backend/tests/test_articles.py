@@ -0,0 +1,380 @@
+"""Tests for the article listing and detail endpoints."""
+from datetime import UTC, datetime, timedelta
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Article, NewsSource
+from app.services.article_counts import ArticleCountCache, invalidate_article_counts
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.search import build_tsquery
+from tests.helpers import count_queries, seed_articles
+
+
+@pytest_asyncio.fixture
+async def seeded_articles(db_session: AsyncSession) -> list[Article]:
+    """Twenty-five technology articles with two tags each."""
+    return await seed_articles(db_session, 25)
+
+
+class TestArticleListing:
+    """Test GET /articles."""
+
+    async def test_list_articles_includes_source_and_tags(self, client: AsyncClient, seeded_articles):
+        """Listed articles carry their source name and tag list."""
+        response = await client.get("/articles/", params={"per_page": 5})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 25
+        assert data["total_pages"] == 5
+        assert len(data["articles"]) == 5
+        first = data["articles"][0]
+        assert first["title"] == "technology story 0"
+        assert first["source_name"] == "Technology Daily"
+        assert sorted(first["tags"]) == ["technology-tag-0", "technology-tag-1"]
+
+    async def test_list_articles_category_filter(self, client: AsyncClient, db_session: AsyncSession, seeded_articles):
+        """Category filter restricts both the page and the total."""
+        await seed_articles(db_session, 3, category="science")
+
+        response = await client.get("/articles/", params={"category": "science"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert {a["source_name"] for a in data["articles"]} == {"Science Daily"}
+
+    async def test_list_articles_query_count_is_constant(self, client: AsyncClient, db_connection, seeded_articles):
+        """The number of queries per page does not grow with per_page."""
+        query_counts = []
+        for per_page in (1, 5, 25):
+            with count_queries(db_connection) as statements:
+                response = await client.get(
+                    "/articles/", params={"per_page": per_page, "total": "exact"}
+                )
+            assert response.status_code == 200
+            assert len(response.json()["articles"]) == per_page
+            query_counts.append(len(statements))
+
+        assert len(set(query_counts)) == 1
+        assert query_counts[0] <= 3
+
+
+class TestCursorPagination:
+    """Test keyset pagination of GET /articles."""
+
+    async def walk(self, client: AsyncClient, **params) -> list[int]:
+        """Follow next_cursor until exhausted and return the article ids."""
+        ids = []
+        response = await client.get("/articles/", params=params)
+        while True:
+            assert response.status_code == 200
+            data = response.json()
+            ids.extend(a["id"] for a in data["articles"])
+            if data["next_cursor"] is None:
+                return ids
+            response = await client.get(
+                "/articles/", params={**params, "cursor": data["next_cursor"]}
+            )
+
+    async def test_cursor_walk_matches_offset_order(self, client: AsyncClient, seeded_articles):
+        """Walking by cursor visits every article once, in listing order."""
+        cursor_ids = await self.walk(client, per_page=7)
+
+        response = await client.get("/articles/", params={"per_page": 100})
+        offset_ids = [a["id"] for a in response.json()["articles"]]
+        assert cursor_ids == offset_ids
+        assert len(cursor_ids) == 25
+
+    async def test_last_page_has_no_cursor(self, client: AsyncClient, seeded_articles):
+        """A page that reaches the end of the result set has no next_cursor."""
+        response = await client.get("/articles/", params={"per_page": 25})
+
+        assert response.json()["next_cursor"] is None
+
+    async def test_cursor_with_filters(self, client: AsyncClient, db_session: AsyncSession, seeded_articles):
+        """Cursor pages respect the category and search filters."""
+        science = await seed_articles(db_session, 6, category="science")
+
+        ids = await self.walk(client, per_page=4, category="science")
+        assert ids == [a.id for a in science]
+
+        ids = await self.walk(client, per_page=2, search="story 1")
+        titles = {a.id: a.title for a in seeded_articles + science}
+        assert ids and all("story 1" in titles[i] for i in ids)
+
+    async def test_cursor_with_null_published_at(self, client: AsyncClient, db_session: AsyncSession, seeded_articles):
+        """Undated articles are listed last and still reachable by cursor."""
+        for article in seeded_articles[-4:]:
+            article.published_at = None
+        await db_session.flush()
+
+        ids = await self.walk(client, per_page=3)
+
+        assert sorted(ids) == sorted(a.id for a in seeded_articles)
+        assert len(ids) == len(set(ids))
+        assert set(ids[-4:]) == {a.id for a in seeded_articles[-4:]}
+
+    async def test_invalid_cursor(self, client: AsyncClient):
+        """Malformed cursors are rejected with 400."""
+        response = await client.get("/articles/", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+    def test_cursor_round_trip(self):
+        """Cursors decode back to the position they encode."""
+        published_at = datetime(2025, 9, 9, 12, 30, tzinfo=UTC)
+
+        assert decode_cursor(encode_cursor(published_at, 42)) == (published_at, 42)
+        assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+
+class TestListingTotals:
+    """Test the total modes of GET /articles."""
+
+    async def test_total_none_skips_count(self, client: AsyncClient, db_connection, seeded_articles):
+        """total=none returns no total and runs one query fewer."""
+        with count_queries(db_connection) as exact_statements:
+            await client.get("/articles/", params={"total": "exact"})
+        with count_queries(db_connection) as statements:
+            response = await client.get("/articles/", params={"total": "none"})
+
+        data = response.json()
+        assert data["total"] is None
+        assert data["total_pages"] is None
+        assert len(data["articles"]) == 20
+        assert len(statements) == len(exact_statements) - 1
+
+    async def test_cached_total_reused_until_invalidated(self, client: AsyncClient, db_session: AsyncSession, db_connection, count_cache, seeded_articles):
+        """Cached totals skip the count query until articles are ingested."""
+        response = await client.get("/articles/", params={"total": "cached"})
+        assert response.json()["total"] == 25
+
+        await seed_articles(db_session, 3, category="science")
+        with count_queries(db_connection) as statements:
+            response = await client.get("/articles/", params={"total": "cached"})
+        assert response.json()["total"] == 25
+        assert not any("count(" in statement for statement in statements)
+
+        await invalidate_article_counts()
+        response = await client.get("/articles/", params={"total": "cached"})
+        data = response.json()
+        assert data["total"] == 28
+        assert data["total_is_estimate"] is False
+
+    async def test_cached_total_per_filter(self, client: AsyncClient, db_session: AsyncSession, count_cache, seeded_articles):
+        """Each filter combination has its own cached total."""
+        await seed_articles(db_session, 3, category="science")
+
+        all_articles = await client.get("/articles/")
+        science = await client.get("/articles/", params={"category": "science"})
+
+        assert all_articles.json()["total"] == 28
+        assert science.json()["total"] == 3
+
+    async def test_estimated_total(self, client: AsyncClient, db_session: AsyncSession, seeded_articles):
+        """Unfiltered estimates come from planner statistics."""
+        await db_session.execute(text("ANALYZE articles"))
+
+        response = await client.get("/articles/", params={"total": "estimate"})
+
+        data = response.json()
+        assert data["total_is_estimate"] is True
+        assert data["total"] >= 0
+        assert data["total_pages"] == (data["total"] + 19) // 20
+
+    async def test_estimate_with_filters_is_exact(self, client: AsyncClient, seeded_articles):
+        """Filtered listings fall back to an exact count."""
+        response = await client.get(
+            "/articles/", params={"total": "estimate", "category": "technology"}
+        )
+
+        data = response.json()
+        assert data["total"] == 25
+        assert data["total_is_estimate"] is False
+
+    async def test_count_cache_generations(self, count_cache: ArticleCountCache):
+        """Counts are shared across caches and dropped by any invalidation."""
+        other_worker = ArticleCountCache(settings.REDIS_URL, ttl=60, prefix=count_cache.prefix)
+        _, generation = await count_cache.get("all")
+        await count_cache.set("all", 25, generation)
+
+        assert (await other_worker.get("all"))[0] == 25
+
+        # A count read before an invalidation is never served after it
+        _, stale_generation = await other_worker.get("all")
+        await count_cache.invalidate()
+        await other_worker.set("all", 25, stale_generation)
+        cached, generation = await count_cache.get("all")
+        assert cached is None
+        await count_cache.set("all", 28, generation)
+        assert (await other_worker.get("all"))[0] == 28
+
+    async def test_unavailable_count_cache_is_a_miss(self):
+        unreachable = ArticleCountCache("redis://localhost:1", ttl=60)
+
+        cached, generation = await unreachable.get("all")
+        await unreachable.set("all", 25, generation)
+        await unreachable.invalidate()
+
+        assert cached is None
+
+
+    async def test_corrupt_count_entry_is_a_miss(self, count_cache):
+        """An entry or generation that does not parse is not a count."""
+        _, generation = await count_cache.get("all")
+        for corrupt in (b"not a count", b"1:2:3", b"5"):
+            await count_cache.redis.set(count_cache._key("all"), corrupt)
+            assert await count_cache.get("all") == (None, generation)
+
+        await count_cache.set("all", 25, generation)
+        assert await count_cache.get("all") == (25, generation)
+
+        await count_cache.redis.set(count_cache._generation_key, b"garbage")
+        assert await count_cache.get("all") == (None, -1)
+
+
+class TestFullTextSearch:
+    """Test full-text search on GET /articles."""
+
+    @pytest_asyncio.fixture
+    async def search_articles(self, db_session: AsyncSession) -> dict[str, Article]:
+        """Articles where the search terms appear in different fields."""
+        source = NewsSource(name="Search Times", url="https://search.example.com")
+        db_session.add(source)
+        await db_session.flush()
+
+        now = datetime.now(UTC)
+        articles = {
+            "title": Article(
+                title="Quantum computing breakthrough",
+                url="https://search.example.com/title",
+                summary="Researchers report progress.",
+                content="A long article body.",
+                published_at=now - timedelta(hours=2),
+            ),
+            "summary": Article(
+                title="Lab news",
+                url="https://search.example.com/summary",
+                summary="A quantum computing milestone was reached.",
+                content="Details follow.",
+                published_at=now - timedelta(hours=1),
+            ),
+            "content": Article(
+                title="Weekly roundup",
+                url="https://search.example.com/content",
+                summary="Everything that happened.",
+                content="Somewhere in here we mention computing and quantum effects.",
+                published_at=now,
+            ),
+        }
+        for article in articles.values():
+            article.source_id = source.id
+        db_session.add_all(articles.values())
+        await db_session.flush()
+        return articles
+
+    async def search(self, client: AsyncClient, search: str, **params) -> list[int]:
+        response = await client.get("/articles/", params={"search": search, **params})
+        assert response.status_code == 200
+        return [a["id"] for a in response.json()["articles"]]
+
+    async def test_search_covers_title_summary_and_content(self, client: AsyncClient, search_articles):
+        """Search matches terms in any of the indexed fields."""
+        ids = await self.search(client, "quantum")
+
+        assert set(ids) == {a.id for a in search_articles.values()}
+
+    async def test_search_stems_terms(self, client: AsyncClient, search_articles):
+        """Search matches inflected forms of a word."""
+        ids = await self.search(client, "researcher")
+
+        assert ids == [search_articles["title"].id]
+
+    async def test_phrase_search(self, client: AsyncClient, search_articles):
+        """Quoted phrases only match adjacent words."""
+        ids = await self.search(client, '"quantum computing"')
+
+        assert set(ids) == {search_articles["title"].id, search_articles["summary"].id}
+
+    async def test_prefix_search(self, client: AsyncClient, search_articles):
+        """A trailing * matches word prefixes."""
+        ids = await self.search(client, "milest*")
+
+        assert ids == [search_articles["summary"].id]
+
+    async def test_relevance_sort(self, client: AsyncClient, search_articles):
+        """sort=relevance ranks title matches above body matches."""
+        ids = await self.search(client, "quantum computing", sort="relevance", total="exact")
+
+        assert ids == [
+            search_articles["title"].id,
+            search_articles["summary"].id,
+            search_articles["content"].id,
+        ]
+
+    async def test_search_total(self, client: AsyncClient, search_articles):
+        """The total counts search matches only."""
+        response = await client.get("/articles/", params={"search": "milest*", "total": "exact"})
+
+        assert response.json()["total"] == 1
+
+    async def test_search_without_words_matches_nothing(self, client: AsyncClient, search_articles):
+        """Operator-only input is sanitized instead of raising a syntax error."""
+        ids = await self.search(client, "&|!:()")
+
+        assert ids == []
+
+    async def test_relevance_requires_search(self, client: AsyncClient):
+        """sort=relevance without search is rejected."""
+        response = await client.get("/articles/", params={"sort": "relevance"})
+
+        assert response.status_code == 400
+
+    async def test_relevance_rejects_cursor(self, client: AsyncClient):
+        """sort=relevance is paginated by page only."""
+        response = await client.get(
+            "/articles/",
+            params={"sort": "relevance", "search": "quantum", "cursor": encode_cursor(None, 1)},
+        )
+
+        assert response.status_code == 400
+
+    def test_build_tsquery(self):
+        """User input is translated to safe tsquery syntax."""
+        assert build_tsquery("machine learning") == "machine & learning"
+        assert build_tsquery('"machine learning" rust') == "(machine <-> learning) & rust"
+        assert build_tsquery("optim*") == "optim:*"
+        assert build_tsquery("covid-19") == "(covid <-> 19)"
+        assert build_tsquery("'; DROP TABLE articles; --") == "DROP & TABLE & articles"
+        assert build_tsquery("&|!:()") is None
+
+
+class TestArticleDetail:
+    """Test GET /articles/{article_id}."""
+
+    async def test_get_article(self, client: AsyncClient, db_connection, seeded_articles):
+        """Detail view is built in a fixed number of queries."""
+        article = seeded_articles[0]
+
+        with count_queries(db_connection) as statements:
+            response = await client.get(f"/articles/{article.id}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == article.id
+        assert data["source_name"] == "Technology Daily"
+        assert sorted(data["tags"]) == ["technology-tag-0", "technology-tag-1"]
+        assert len(statements) <= 2
+
+    async def test_get_article_not_found(self, client: AsyncClient):
+        """Unknown article ids return 404."""
+        response = await client.get("/articles/999999")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Article not found"
@@ -2,11 +2,17 @@
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.security import (
+    configure_bcrypt_rounds,
+    get_password_hash,
+    pwd_context,
+    verify_password,
+)
 from app.db.models import User
-from app.core.security import verify_password, get_password_hash
+from tests.helpers import count_queries
 
 
 @pytest.fixture
@@ -186,6 +192,30 @@ class TestUserRegistration:
         response = await client.post("/auth/register", content=data, headers={"Content-Type": "application/x-www-form-urlencoded"})
         assert response.status_code == 422
 
+    async def test_registration_single_statement(self, client: AsyncClient, db_connection, valid_user_data):
+        """Registration is one INSERT ... ON CONFLICT round trip."""
+        with count_queries(db_connection) as statements:
+            response = await client.post("/auth/register", json=valid_user_data)
+
+        assert response.status_code == 200
+        assert len(statements) == 1
+        assert statements[0].startswith("INSERT INTO users")
+        assert "ON CONFLICT DO NOTHING" in statements[0]
+
+    async def test_registration_conflict_leaves_transaction_usable(self, client: AsyncClient, valid_user_data):
+        """A conflicting sign-up is a 400, not an aborted transaction."""
+        await client.post("/auth/register", json=valid_user_data)
+
+        duplicate = await client.post("/auth/register", json=valid_user_data)
+        other = await client.post("/auth/register", json={
+            "email": "other@example.com",
+            "username": "otheruser",
+            "password": "otherpassword123",
+        })
+
+        assert duplicate.status_code == 400
+        assert other.status_code == 200
+
 
 class TestUserLogin:
     """Test user login functionality."""
@@ -386,6 +416,37 @@ class TestUserLogin:
         
         # Multiple logins should work (tokens might be identical if generated within same minute)
 
+    async def test_login_rehashes_outdated_cost(self, client: AsyncClient, db_session: AsyncSession, registered_user_data):
+        """A login upgrades a hash below the current bcrypt cost, never a costlier one."""
+        credentials = {
+            "username": registered_user_data["username"],
+            "password": registered_user_data["password"],
+        }
+
+        async def stored_hash() -> str:
+            result = await db_session.execute(
+                select(User.hashed_password).where(User.username == credentials["username"])
+            )
+            return result.scalar_one()
+
+        saved = pwd_context.to_dict()
+        try:
+            configure_bcrypt_rounds(4)
+            await client.post("/auth/register", json=registered_user_data)
+            configure_bcrypt_rounds(5)
+            upgraded = await client.post("/auth/login", data=credentials)
+            upgraded_hash = await stored_hash()
+            # e.g. a worker whose calibration came out one round lower
+            configure_bcrypt_rounds(4)
+            kept = await client.post("/auth/login", data=credentials)
+        finally:
+            pwd_context.load(saved)
+
+        assert upgraded.status_code == kept.status_code == 200
+        assert upgraded_hash.startswith("$2b$05$")
+        assert await stored_hash() == upgraded_hash
+        assert verify_password(credentials["password"], upgraded_hash)
+
 
 class TestDatabaseIntegration:
     """Test database integration for authentication."""
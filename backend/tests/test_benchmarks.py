@@ -0,0 +1,490 @@
+"""Benchmarks of the read paths, ingestion, polling and enrichment stages.
+
+Covers listing queries and serialization, bulk ingestion, the seen URL
+filter, near-duplicate lookup, streaming feed parsing, body extraction
+and embedding. Each benchmark prints its measurements (run with ``-s`` to
+see them) and asserts a conservative bound. Timings depend on the machine,
+so the module is marked ``slow`` and left out of the default run; run it
+with ``pytest -m slow``.
+"""
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import textwrap
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import contains_eager, selectinload, undefer
+
+from app.api.routes.articles import (
+    ArticleListResponse,
+    ArticleResponse,
+    _article_load_options,
+    _article_row,
+)
+from app.db.models import Article, ArticleTag, NewsSource, Tag
+from app.services.content_extraction import ContentExtractor, extract_content
+from app.services.embeddings import ArticleEmbedder
+from app.services.ingestion import ArticleRecord, ingest_articles
+from app.services.near_duplicates import NearDuplicateIndex
+from app.utils.bloom import BloomFilter
+from app.utils.embedding_store import EmbeddingStore
+from app.utils.serialization import dumps
+from app.utils.urls import canonicalize_url
+from tests.helpers import HTML_DIR, MODEL_VOCABULARY, count_queries, seed_articles
+
+pytestmark = pytest.mark.slow
+
+PAGE_SIZE = 100
+CONTENT_BYTES = 30_000
+
+
+@pytest_asyncio.fixture
+async def full_page(db_session: AsyncSession) -> list[Article]:
+    """A page of articles with realistically large bodies."""
+    articles = await seed_articles(db_session, PAGE_SIZE)
+    for i, article in enumerate(articles):
+        # Vary the text so TOAST compression does not hide the size
+        words = (f"w{i}x{j}" for j in range(CONTENT_BYTES))
+        article.content = " ".join(words)[:CONTENT_BYTES]
+    await db_session.flush()
+    return articles
+
+
+def full_row_query():
+    """The listing query as it was before column projection."""
+    return (
+        select(Article)
+        .join(NewsSource)
+        .options(
+            contains_eager(Article.source),
+            selectinload(Article.tags).joinedload(ArticleTag.tag),
+            undefer(Article.content),
+        )
+        .order_by(Article.id)
+        .limit(PAGE_SIZE)
+    )
+
+
+def projected_query():
+    """The listing query as served by GET /articles."""
+    return (
+        select(Article)
+        .join(NewsSource)
+        .options(*_article_load_options())
+        .order_by(Article.id)
+        .limit(PAGE_SIZE)
+    )
+
+
+async def transferred_bytes(db_connection, captured) -> int:
+    """Size of the text representation of every row the statements return."""
+    total = 0
+    for statement, parameters in captured:
+        result = await db_connection.exec_driver_sql(
+            f"SELECT coalesce(sum(octet_length(page::text)), 0) FROM ({statement}) AS page",
+            parameters,
+        )
+        total += result.scalar()
+    return total
+
+
+async def measure_page(db_connection, query) -> tuple[int, int]:
+    """Bytes read from the database and Python memory held by one page."""
+    captured = []
+    SessionLocal = async_sessionmaker(bind=db_connection, class_=AsyncSession)
+    async with SessionLocal() as session:
+        with count_queries(db_connection, parameters=captured):
+            tracemalloc.start()
+            try:
+                result = await session.execute(query)
+                articles = result.scalars().all()
+                held, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        assert len(articles) == PAGE_SIZE
+    return await transferred_bytes(db_connection, captured), held
+
+
+async def test_listing_column_projection(db_connection, full_page):
+    """Listing pages no longer pull article bodies off the database."""
+    before_bytes, before_memory = await measure_page(db_connection, full_row_query())
+    after_bytes, after_memory = await measure_page(db_connection, projected_query())
+
+    print(
+        f"\n{PAGE_SIZE}-article page: "
+        f"transferred {before_bytes:,} -> {after_bytes:,} bytes, "
+        f"Python memory {before_memory:,} -> {after_memory:,} bytes"
+    )
+    assert after_bytes * 10 < before_bytes
+    assert after_memory * 2 < before_memory
+
+
+async def test_projected_page_still_serializes(db_connection, full_page):
+    """The projected columns are all the response needs."""
+    SessionLocal = async_sessionmaker(bind=db_connection, class_=AsyncSession)
+    async with SessionLocal() as session:
+        result = await session.execute(projected_query())
+        rows = [_article_row(article) for article in result.scalars().all()]
+
+    responses = [ArticleResponse.model_validate(row) for row in rows]
+    assert len(responses) == PAGE_SIZE
+    assert all(response.source_name and response.tags for response in responses)
+
+
+def build_page() -> list[Article]:
+    """A 100-article page of loaded-looking articles, without a database."""
+    source = NewsSource(id=1, name="Benchmark Daily")
+    tags = [Tag(id=i, name=f"tag-{i}") for i in range(5)]
+    published = datetime(2025, 1, 1, 12, 30, 15, 123456, tzinfo=UTC)
+    return [
+        Article(
+            id=i,
+            title=f"Benchmark headline number {i}",
+            url=f"https://example.com/articles/{i}",
+            summary="A short summary of the article. " * 8,
+            author="Jane Doe",
+            published_at=published - timedelta(minutes=i),
+            sentiment_score=0.25,
+            source=source,
+            tags=[ArticleTag(tag=tags[(i + t) % len(tags)]) for t in range(3)],
+        )
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def model_path(articles: list[Article]) -> bytes:
+    """Serialization as it was: per-field validation plus FastAPI's encoder."""
+    listing = ArticleListResponse(
+        articles=[
+            ArticleResponse(
+                id=article.id,
+                title=article.title,
+                url=article.url,
+                summary=article.summary,
+                author=article.author,
+                published_at=article.published_at,
+                sentiment_score=article.sentiment_score,
+                source_name=article.source.name,
+                tags=[article_tag.tag.name for article_tag in article.tags],
+            )
+            for article in articles
+        ],
+        total=1000,
+        page=1,
+        per_page=PAGE_SIZE,
+        total_pages=10,
+    )
+    payload = listing.model_dump(mode="json")
+    # FastAPI validated the returned payload against response_model again
+    validated = ArticleListResponse.model_validate(payload)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(articles: list[Article]) -> bytes:
+    """Serialization as served by GET /articles."""
+    return dumps({
+        "articles": [_article_row(article) for article in articles],
+        "total": 1000,
+        "page": 1,
+        "per_page": PAGE_SIZE,
+        "total_pages": 10,
+        "total_is_estimate": False,
+        "next_cursor": None,
+    })
+
+
+def best_time(serialize, articles: list[Article], rounds: int = 20) -> float:
+    """Fastest of ``rounds`` serializations of ``articles``, in seconds."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        serialize(articles)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_listing_serialization():
+    """The fast path produces the same JSON in a fraction of the time."""
+    articles = build_page()
+    assert json.loads(fast_path(articles)) == json.loads(model_path(articles))
+
+    model_time = best_time(model_path, articles)
+    fast_time = best_time(fast_path, articles)
+
+    print(
+        f"\n{PAGE_SIZE}-article page serialization: "
+        f"{model_time * 1000:.2f} ms -> {fast_time * 1000:.2f} ms"
+    )
+    assert fast_time * 2 < model_time
+
+
+async def test_bulk_ingest_throughput(db_session: AsyncSession):
+    """Batched upserts beat one ORM object per article by a wide margin."""
+    source = NewsSource(name="Bulk Daily", url="https://bulk.example.com")
+    db_session.add(source)
+    await db_session.flush()
+    count = 2_000
+
+    def batch(prefix: str) -> list[ArticleRecord]:
+        return [
+            ArticleRecord(
+                url=f"https://bulk.example.com/{prefix}/{i}",
+                title=f"Bulk story {i}",
+                source_id=source.id,
+                summary="A short summary. " * 5,
+            )
+            for i in range(count)
+        ]
+
+    start = time.perf_counter()
+    for record in batch("orm"):
+        db_session.add(Article(**asdict(record)))
+        await db_session.flush()
+    orm_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = await ingest_articles(db_session, batch("bulk"))
+    bulk_time = time.perf_counter() - start
+
+    print(
+        f"\n{count} articles: one ORM insert each {orm_time:.2f} s, "
+        f"batched upserts {bulk_time:.2f} s"
+    )
+    assert len(result.new_ids) == count
+    assert bulk_time * 5 < orm_time
+
+
+async def test_seen_url_filter_skips_known_items(db_session: AsyncSession):
+    """Known feed items are dropped before they reach the database."""
+    source = NewsSource(name="Seen Daily", url="https://seen.example.com")
+    db_session.add(source)
+    await db_session.flush()
+    stored, polls, items = 10_000, 10, 1_000
+    known = items * 95 // 100
+
+    def record(i: int) -> ArticleRecord:
+        return ArticleRecord(
+            url=f"https://seen.example.com/{i}?utm_source=rss",
+            title=f"Seen story {i}",
+            source_id=source.id,
+            summary="A short summary. " * 5,
+        )
+
+    await ingest_articles(db_session, [record(i) for i in range(stored)])
+    bloom = BloomFilter(2 * stored, 1e-5)
+    for i in range(stored):
+        bloom.add(canonicalize_url(record(i).url))
+    # Alternate polls go without and with the filter
+    feeds = [
+        [record(i) for i in range(p * known, (p + 1) * known)]
+        + [record(stored + p * items + i) for i in range(items - known)]
+        for p in range(polls)
+    ]
+
+    unfiltered_time = filtered_time = 0.0
+    written = new = 0
+    for p, feed in enumerate(feeds):
+        start = time.perf_counter()
+        if p % 2:
+            feed = [r for r in feed if canonicalize_url(r.url) not in bloom]
+        result = await ingest_articles(db_session, feed)
+        elapsed = time.perf_counter() - start
+        if p % 2:
+            filtered_time += elapsed
+            written += len(feed)
+            new += len(result.new_ids)
+        else:
+            unfiltered_time += elapsed
+
+    print(
+        f"\n{polls // 2} polls of {items} items, 95% known: "
+        f"without filter {unfiltered_time * 1000:.0f} ms, "
+        f"with filter {filtered_time * 1000:.0f} ms"
+    )
+    # A twentieth of the rows are sent; fixed per-poll costs remain
+    assert written == new == (items - known) * (polls // 2)
+    assert filtered_time < unfiltered_time
+
+
+async def test_near_duplicate_lookup_scales(db_session: AsyncSession):
+    """Probing the LSH index costs about the same at 1k and 10k articles."""
+    source = NewsSource(name="Lsh Daily", url="https://lsh.example.com")
+    db_session.add(source)
+    await db_session.flush()
+    index = NearDuplicateIndex(
+        num_perm=128, bands=32, threshold=0.8, shingle_size=3, min_shingles=20
+    )
+    rng = random.Random(7)
+    vocabulary = [f"word{i}" for i in range(5_000)]
+
+    def story(i: int) -> ArticleRecord:
+        return ArticleRecord(
+            url=f"https://lsh.example.com/{i}",
+            title=f"Story {i}",
+            source_id=source.id,
+            summary=" ".join(rng.choices(vocabulary, k=40)),
+        )
+
+    probes = {str(i): index.fingerprint(story(i).summary) for i in range(100)}
+
+    async def probe_time() -> float:
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            matches = await index.match(db_session, probes)
+            best = min(best, time.perf_counter() - start)
+        assert matches == {}
+        return best
+
+    timings, stored = {}, 100
+    for size in (1_000, 10_000):
+        await ingest_articles(
+            db_session, (story(i) for i in range(stored, size)), duplicates=index
+        )
+        timings[size], stored = await probe_time(), size
+
+    print(
+        "\n100 lookups: "
+        + ", ".join(f"{n} indexed {t * 1000:.1f} ms" for n, t in timings.items())
+    )
+    assert timings[10_000] < timings[1_000] * 3
+
+
+# Runs in a fresh interpreter so ru_maxrss reflects only the parse
+STREAMING_PARSE_SCRIPT = textwrap.dedent("""
+    import resource, sys
+    from app.services.feed_parser import parse_feed
+
+    feed_bytes = int(sys.argv[1])
+    item = (
+        "<item><title>Story {0}</title><link>https://big.example.com/{0}</link>"
+        "<description>" + "Lorem ipsum dolor sit amet. " * 30 + "</description>"
+        "<pubDate>Fri, 16 Oct 2026 08:00:00 GMT</pubDate></item>"
+    )
+
+    def chunks():
+        yield b"<rss><channel><title>Big feed</title>"
+        sent, i = 0, 0
+        while sent < feed_bytes:
+            chunk = "".join(item.format(n) for n in range(i, i + 64)).encode()
+            sent, i = sent + len(chunk), i + 64
+            yield chunk
+        yield b"</channel></rss>"
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    count = sum(1 for _ in parse_feed(chunks(), source_id=1))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(count, peak - baseline)
+""")
+
+
+def test_streaming_parse_memory():
+    """Parsing a 50 MB feed grows peak RSS by a small constant amount."""
+    feed_bytes = 50 * 1024 * 1024
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", STREAMING_PARSE_SCRIPT, str(feed_bytes)],
+        capture_output=True, check=True, text=True,
+    ).stdout
+    elapsed = time.perf_counter() - start
+    count, growth_kb = map(int, output.split())
+
+    print(
+        f"\n{feed_bytes // 2**20} MB feed: {count} articles in {elapsed:.2f} s, "
+        f"peak RSS +{growth_kb / 1024:.1f} MB"
+    )
+    assert count * 1_000 > feed_bytes
+    assert growth_kb < 20 * 1024
+
+
+async def test_extraction_throughput():
+    """The pool scales extraction with cores and keeps the event loop free."""
+    pages = [path.read_text() for path in sorted(HTML_DIR.glob("*.html"))]
+    corpus = pages * 40
+    workers = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    expected = [extract_content(html) for html in corpus]
+    serial_time = time.perf_counter() - start
+
+    extractor = ContentExtractor(workers=workers, timeout=10)
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal max_lag
+        while not done.is_set():
+            tick = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_lag = max(max_lag, time.perf_counter() - tick - 0.005)
+
+    try:
+        # Start every worker process before timing
+        await asyncio.gather(*(extractor.extract(html) for html in pages * workers))
+        ticker = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(extractor.extract(html) for html in corpus))
+        pool_time = time.perf_counter() - start
+        done.set()
+        await ticker
+    finally:
+        extractor.close()
+
+    print(
+        f"\n{len(corpus)} pages: in-process {len(corpus) / serial_time:.0f} pages/s, "
+        f"{workers}-worker pool {len(corpus) / pool_time:.0f} pages/s, "
+        f"max event loop lag {max_lag * 1000:.1f} ms"
+    )
+    assert [result.content for result in results] == expected
+    if workers >= 2:
+        assert pool_time * 1.5 < serial_time
+    else:
+        assert pool_time < serial_time * 2
+    # In-process extraction would block the loop for the whole corpus
+    assert max_lag < serial_time / 4
+
+
+def test_embedding_batches_and_cache(tiny_model, tmp_path):
+    """Batched encoding beats one text per call; a re-run encodes nothing."""
+    from app.services.embeddings import SentenceEncoder
+
+    rng = random.Random(3)
+    texts = [
+        (i, " ".join(rng.choices(MODEL_VOCABULARY, k=rng.randint(5, 60))))
+        for i in range(2_000)
+    ]
+    encoder = SentenceEncoder(tiny_model, batch_size=64)
+
+    def embed_time(batch_size: int, directory: str) -> float:
+        encoder.batch_size = batch_size
+        embedder = ArticleEmbedder(
+            EmbeddingStore(tmp_path / directory, model=tiny_model, dim=encoder.dim),
+            encoder,
+            chunk_size=1_024,
+        )
+        start = time.perf_counter()
+        embedder.embed(texts)
+        return time.perf_counter() - start
+
+    unbatched_time = embed_time(1, "unbatched")
+    batched_time = embed_time(64, "batched")
+    cached_time = embed_time(64, "batched")
+
+    print(
+        f"\n{len(texts)} texts: batch 1 {len(texts) / unbatched_time:.0f} texts/s, "
+        f"batch 64 {len(texts) / batched_time:.0f} texts/s, "
+        f"unchanged re-run {cached_time * 1000:.1f} ms"
+    )
+    assert batched_time * 2 < unbatched_time
+    assert cached_time * 20 < batched_time
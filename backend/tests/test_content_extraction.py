@@ -0,0 +1,222 @@
+"""Tests for article body extraction in a process pool."""
+import os
+import signal
+import time
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.models import Article, NewsSource
+from app.services.content_extraction import (
+    CRASHED,
+    MEMORY,
+    TIMEOUT,
+    ContentExtractor,
+    ExtractionStage,
+    extract_content,
+    store_contents,
+)
+from app.services.feed_fetcher import create_http_client
+from tests.helpers import HTML_DIR, FeedServer
+
+# Paragraphs of article text in each saved page
+FIXTURE_PARAGRAPHS = {"chip.html": 14, "database.html": 10, "galaxy.html": 20}
+
+
+# Extraction functions run in pool workers, so they live at module level
+def sleepy(html: str) -> str:
+    time.sleep(30)
+    return html
+
+
+def hungry(html: str) -> str:
+    return str(len(bytearray(1024 * 1024 * 1024)))
+
+
+def crashing(html: str) -> str:
+    os._exit(1)
+
+
+def stuck(pid_file: str) -> str:
+    # Like a hang in native code: the worker's own SIGALRM never fires
+    Path(pid_file).write_text(str(os.getpid()))
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(60)
+    return pid_file
+
+
+def echo(html: str) -> str:
+    return html.upper()
+
+
+@pytest.fixture
+def extractor():
+    extractor = ContentExtractor(workers=2, timeout=1.0, memory_limit=256 * 1024 * 1024)
+    yield extractor
+    extractor.close()
+
+
+class TestExtractContent:
+    """Test boilerplate removal on saved pages."""
+
+    @pytest.mark.parametrize("name", sorted(FIXTURE_PARAGRAPHS))
+    def test_fixture_pages(self, name: str):
+        """Only the article paragraphs survive."""
+        content = extract_content((HTML_DIR / name).read_text())
+
+        paragraphs = content.split("\n\n")
+        assert len(paragraphs) == FIXTURE_PARAGRAPHS[name]
+        for furniture in ("Share this story", "cookies", "newsletter", "Copyright", "Home /"):
+            assert furniture not in content
+
+    def test_page_without_text(self):
+        """Pages without real paragraphs have no content."""
+        assert extract_content("<html><body><nav><p>Home</p></nav></body></html>") is None
+
+
+class TestContentExtractor:
+    """Test the pool's budgets and recovery."""
+
+    async def test_extracts_in_pool(self, extractor: ContentExtractor):
+        """Documents are parsed by pool workers."""
+        html = (HTML_DIR / "chip.html").read_text()
+
+        result = await extractor.extract(html)
+
+        assert result.error is None
+        assert result.content == extract_content(html)
+
+    async def test_timeout(self):
+        """A document over its time budget yields nothing and frees the worker."""
+        extractor = ContentExtractor(workers=1, timeout=0.5, extract=sleepy)
+        try:
+            start = time.perf_counter()
+            result = await extractor.extract("<p>slow</p>")
+            assert result.content is None and result.error == TIMEOUT
+            assert time.perf_counter() - start < 5
+            extractor.extract_func = echo
+            assert (await extractor.extract("ok")).content == "OK"
+        finally:
+            extractor.close()
+
+    async def test_memory_limit(self):
+        """A document over its memory budget fails without harming the worker."""
+        extractor = ContentExtractor(
+            workers=1, timeout=5, memory_limit=256 * 1024 * 1024, extract=hungry
+        )
+        try:
+            assert (await extractor.extract("big")).error == MEMORY
+        finally:
+            extractor.close()
+
+    async def test_dead_worker_restarts_pool(self):
+        """A crashed worker is reported and the next document still runs."""
+        extractor = ContentExtractor(workers=1, timeout=5, extract=crashing)
+        try:
+            assert (await extractor.extract("boom")).error == CRASHED
+            extractor.extract_func = echo
+            assert (await extractor.extract("ok")).content == "OK"
+        finally:
+            extractor.close()
+
+
+    @pytest.mark.slow
+    async def test_stuck_worker_is_killed(self, tmp_path: Path):
+        """A worker that ignores its timeout is killed and the pool replaced."""
+        extractor = ContentExtractor(workers=1, timeout=0.5, extract=stuck)
+        pid_file = tmp_path / "pid"
+        try:
+            assert (await extractor.extract(str(pid_file))).error == TIMEOUT
+            pid = int(pid_file.read_text())
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    break
+                time.sleep(0.05)
+            else:
+                pytest.fail(f"worker {pid} still running")
+            extractor.extract_func = echo
+            assert (await extractor.extract("ok")).content == "OK"
+        finally:
+            extractor.close()
+
+
+class TestStoreContents:
+    """Test writing extracted bodies."""
+
+    async def test_only_empty_articles_are_filled(self, db_session: AsyncSession):
+        """Existing bodies are kept; filled articles are processed again."""
+        source = NewsSource(name="Pages", url="https://pages.example.com")
+        db_session.add(source)
+        await db_session.flush()
+        empty = Article(title="Empty", url="https://pages.example.com/1", source_id=source.id, is_processed=True)
+        full = Article(title="Full", url="https://pages.example.com/2", source_id=source.id, content="Kept")
+        db_session.add_all([empty, full])
+        await db_session.flush()
+
+        stored = await store_contents(db_session, {empty.id: "Extracted", full.id: "Replaced"})
+
+        assert stored == [empty.id]
+        rows = await db_session.execute(
+            select(Article.content, Article.is_processed).order_by(Article.id)
+        )
+        assert rows.all() == [("Extracted", False), ("Kept", False)]
+
+
+class TestExtractionStage:
+    """Test the queue from article pages to stored bodies."""
+
+    @pytest_asyncio.fixture
+    async def client(self):
+        async with create_http_client() as client:
+            yield client
+
+    @pytest_asyncio.fixture
+    async def session_factory(self, engine):
+        """Committed rows: consumers store concurrently on their own connections."""
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+        yield session_factory
+        async with session_factory() as session:
+            await session.execute(delete(Article))
+            await session.execute(delete(NewsSource))
+            await session.commit()
+
+    async def test_pages_are_extracted_and_stored(
+        self, session_factory, extractor: ContentExtractor, client, feed_server: FeedServer,
+    ):
+        """Queued pages end up as article content; missing pages count as failed."""
+        async with session_factory() as session:
+            source = NewsSource(name="Pages", url="https://pages.example.com")
+            session.add(source)
+            await session.flush()
+            articles = [
+                Article(title=name, url=feed_server.url(f"/pages/{name}"), source_id=source.id)
+                for name in ["chip.html", "galaxy.html", "missing.html"]
+            ]
+            session.add_all(articles)
+            await session.commit()
+        stage = ExtractionStage(
+            extractor, session_factory, client, queue_size=1, max_document_bytes=1024 * 1024
+        )
+
+        stage.start()
+        try:
+            for article in articles:
+                await stage.submit(article.id, article.url)
+            await stage.join()
+        finally:
+            await stage.close()
+
+        assert (stage.stored, stage.failed) == (2, 1)
+        async with session_factory() as session:
+            contents = await session.execute(
+                select(Article.title, Article.content).order_by(Article.id)
+            )
+            assert [(title, content is not None) for title, content in contents] == [
+                ("chip.html", True), ("galaxy.html", True), ("missing.html", False),
+            ]
@@ -0,0 +1,230 @@
+"""Tests for the article embedding stage and its on-disk store."""
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.models import Article, NewsSource
+from app.services.embeddings import (
+    ArticleEmbedder,
+    EmbedResult,
+    _mark_embedded,
+    article_text,
+    embed_articles,
+    run_embedder,
+)
+from app.utils.embedding_store import EmbeddingStore, text_digest
+from tests.helpers import MODEL_VOCABULARY
+
+
+class CountingEncoder:
+    """Deterministic stand-in model that records every call."""
+
+    dim = 4
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.array(
+            [[len(text), text.count(" "), len(set(text)), 1.0] for text in texts],
+            dtype=np.float32,
+        )
+
+
+def store_at(directory: Path, dim: int = CountingEncoder.dim) -> EmbeddingStore:
+    return EmbeddingStore(directory, model="counting", dim=dim)
+
+
+class TestEmbeddingStore:
+    """Test appending, reopening and recovering the store."""
+
+    def test_vectors_persist(self, tmp_path: Path):
+        store = store_at(tmp_path)
+        rows = store.add([text_digest("a"), text_digest("b")], np.eye(2, 4))
+        store.assign([(10, rows[0]), (11, rows[1]), (12, rows[1])])
+
+        reopened = store_at(tmp_path)
+
+        assert len(reopened) == 2
+        assert reopened.row_of(text_digest("b")) == 1
+        assert reopened.get(12).tolist() == [0.0, 1.0, 0.0, 0.0]
+        assert reopened.get(13) is None
+        assert isinstance(reopened.vectors, np.memmap)
+        assert reopened.vectors.dtype == np.float32 and reopened.vectors.shape == (2, 4)
+        assert sorted(reopened.item_ids()) == [10, 11, 12]
+
+    def test_later_assignments_win(self, tmp_path: Path):
+        store = store_at(tmp_path)
+        store.add([text_digest("a"), text_digest("b")], np.eye(2, 4))
+        store.assign([(1, 0)])
+        store.assign([(1, 1)])
+
+        assert store_at(tmp_path).row_for(1) == 1
+
+    def test_interrupted_writes_are_dropped(self, tmp_path: Path):
+        store = store_at(tmp_path)
+        store.add([text_digest("a")], np.ones((1, 4)))
+        store.assign([(1, 0)])
+        # A crash mid-add: half a vector, no digest; and half an id entry
+        with open(tmp_path / "vectors.f32", "ab") as file:
+            file.write(b"\x00" * 8)
+        with open(tmp_path / "ids.bin", "ab") as file:
+            file.write(b"\x01" * 5)
+
+        reopened = store_at(tmp_path)
+        reopened.add([text_digest("b")], np.full((1, 4), 2.0))
+        reopened.assign([(2, 1)])
+
+        again = store_at(tmp_path)
+        assert len(again) == 2
+        assert again.get(1).tolist() == [1.0] * 4
+        assert again.get(2).tolist() == [2.0] * 4
+
+    def test_store_belongs_to_one_model(self, tmp_path: Path):
+        store_at(tmp_path)
+        with pytest.raises(ValueError):
+            store_at(tmp_path, dim=8)
+        with pytest.raises(ValueError):
+            store_at(tmp_path).add([text_digest("a")], np.ones((1, 8)))
+
+
+class TestArticleEmbedder:
+    """Test that each distinct text is encoded once."""
+
+    def test_unchanged_texts_are_not_encoded_again(self, tmp_path: Path):
+        encode = CountingEncoder()
+        embedder = ArticleEmbedder(store_at(tmp_path), encode, chunk_size=100)
+
+        first = embedder.embed([(1, "rates rise"), (2, "galaxy seen"), (3, "rates rise")])
+        second = embedder.embed([(1, "rates rise"), (2, "galaxy seen again"), (4, "galaxy seen")])
+
+        assert first == EmbedResult(encoded=2, reused=0, unchanged=0)
+        assert second == EmbedResult(encoded=1, reused=1, unchanged=1)
+        assert encode.calls == [["rates rise", "galaxy seen"], ["galaxy seen again"]]
+        store = embedder.store
+        assert store.row_for(3) == store.row_for(1) == 0
+        assert (store.row_for(2), store.row_for(4)) == (2, 1)
+
+    def test_texts_are_encoded_in_chunks(self, tmp_path: Path):
+        encode = CountingEncoder()
+        embedder = ArticleEmbedder(store_at(tmp_path), encode, chunk_size=2)
+
+        result = embedder.embed((i, f"story {i}") for i in range(5))
+
+        assert result.encoded == 5
+        assert [len(call) for call in encode.calls] == [2, 2, 1]
+        assert len(embedder.store) == 5
+
+
+@pytest_asyncio.fixture
+async def session_factory(db_connection) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=db_connection, class_=AsyncSession, expire_on_commit=False)
+
+
+async def add_articles(db: AsyncSession) -> dict[str, Article]:
+    source = NewsSource(name="Embed Daily", url="https://embed.example.com")
+    db.add(source)
+    await db.flush()
+    articles = {
+        "rates": Article(title="Rates", summary="Bank raises rates", content="The bank raised rates.", is_processed=True),
+        "galaxy": Article(title="Galaxy", summary="A galaxy is seen", is_processed=True),
+        "pending": Article(title="Pending", summary="Not analyzed yet"),
+    }
+    articles["copy"] = Article(title="Rates", summary="Bank raises rates", is_processed=True)
+    for slug, article in articles.items():
+        article.url = f"https://embed.example.com/{slug}"
+        article.source_id = source.id
+    db.add_all(articles.values())
+    await db.flush()
+    articles["copy"].duplicate_of_id = articles["rates"].id
+    await db.flush()
+    return articles
+
+
+class TestEmbedArticles:
+    """Test embedding passes over the stored articles."""
+
+    async def test_passes_only_encode_new_and_changed_articles(
+        self, db_session: AsyncSession, session_factory, tmp_path: Path
+    ):
+        articles = await add_articles(db_session)
+        encode = CountingEncoder()
+        embedder = ArticleEmbedder(store_at(tmp_path), encode, chunk_size=1)
+
+        first = await embed_articles(session_factory, embedder)
+        second = await embed_articles(session_factory, embedder)
+        await db_session.execute(
+            update(Article).where(Article.id == articles["galaxy"].id).values(content="It is far away.")
+        )
+        third = await embed_articles(session_factory, embedder)
+
+        assert first == EmbedResult(encoded=2)
+        # Unchanged articles are not even read
+        assert second == EmbedResult()
+        assert third == EmbedResult(encoded=1)
+        assert encode.calls[0] == [article_text("Rates", "Bank raises rates", "The bank raised rates.")]
+        assert encode.calls[-1] == ["Galaxy\n\nIt is far away."]
+        assert embedder.store.get(articles["pending"].id) is None
+        assert embedder.store.get(articles["copy"].id) is None
+
+    async def test_text_changed_while_embedding_is_read_again(
+        self, db_session: AsyncSession, session_factory, tmp_path: Path
+    ):
+        articles = await add_articles(db_session)
+        galaxy = articles["galaxy"].id
+        read_digest = await db_session.scalar(select(Article.text_digest).where(Article.id == galaxy))
+        await db_session.execute(update(Article).where(Article.id == galaxy).values(content="It is far away."))
+
+        await db_session.execute(_mark_embedded(), {"ids": [galaxy], "digests": [read_digest]})
+        embedder = ArticleEmbedder(store_at(tmp_path), CountingEncoder(), chunk_size=10)
+
+        assert await embed_articles(session_factory, embedder) == EmbedResult(encoded=2)
+        assert embedder.store.get(galaxy) is not None
+
+    async def test_fresh_store_embeds_marked_articles_again(
+        self, db_session: AsyncSession, session_factory, tmp_path: Path
+    ):
+        articles = await add_articles(db_session)
+        first = ArticleEmbedder(store_at(tmp_path / "first"), CountingEncoder(), chunk_size=10)
+        await embed_articles(session_factory, first)
+
+        fresh = ArticleEmbedder(store_at(tmp_path / "fresh"), CountingEncoder(), chunk_size=10)
+
+        assert await embed_articles(session_factory, fresh) == EmbedResult(encoded=2)
+        assert fresh.store.get(articles["rates"].id) is not None
+        assert await embed_articles(session_factory, fresh) == EmbedResult()
+
+    async def test_run_until_stopped(self, db_session: AsyncSession, session_factory, tmp_path: Path):
+        articles = await add_articles(db_session)
+        embedder = ArticleEmbedder(store_at(tmp_path), CountingEncoder(), chunk_size=10)
+        stop = asyncio.Event()
+
+        task = asyncio.create_task(run_embedder(session_factory, embedder, stop, interval=60))
+        while embedder.store.get(articles["galaxy"].id) is None:
+            await asyncio.sleep(0.01)
+        stop.set()
+        await asyncio.wait_for(task, timeout=5)
+
+        assert len(embedder.store) == 2
+
+
+def test_sentence_encoder(tiny_model: str, tmp_path: Path):
+    """The real model, batched, matches encoding texts one by one."""
+    from app.services.embeddings import SentenceEncoder
+
+    encoder = SentenceEncoder(tiny_model, batch_size=4)
+    texts = [" ".join(MODEL_VOCABULARY[i:i + 3 + i % 4]) for i in range(10)]
+    store = EmbeddingStore(tmp_path, model=tiny_model, dim=encoder.dim)
+
+    ArticleEmbedder(store, encoder, chunk_size=8).embed(enumerate(texts))
+
+    assert encoder.dim == 32
+    assert np.allclose(np.linalg.norm(store.vectors, axis=1), 1.0, atol=1e-5)
+    for i, text in enumerate(texts):
+        assert np.allclose(store.get(i), encoder([text])[0], atol=1e-5)
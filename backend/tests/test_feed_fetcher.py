@@ -0,0 +1,96 @@
+"""Tests for the concurrent feed fetcher, against a local feed server."""
+import asyncio
+import time
+
+import httpx
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import NewsSource
+from app.services.feed_fetcher import FeedFetcher, create_http_client
+from tests.helpers import FEED_LAST_MODIFIED, FeedServer
+
+
+@pytest_asyncio.fixture
+async def http_client():
+    async with create_http_client() as client:
+        yield client
+
+
+def make_fetcher(client: httpx.AsyncClient, per_host_limit: int = 2) -> FeedFetcher:
+    return FeedFetcher(client, per_host_limit=per_host_limit)
+
+
+async def add_source(db_session: AsyncSession, name: str, rss_url: str) -> NewsSource:
+    source = NewsSource(name=name, url=f"https://{name}.example.com", rss_url=rss_url)
+    db_session.add(source)
+    await db_session.flush()
+    return source
+
+
+class TestFeedFetcher:
+    """Test fetching individual feeds."""
+
+    async def test_conditional_refetch(self, http_client, db_session: AsyncSession, feed_server: FeedServer):
+        """A second fetch with the stored validators is a 304 without a body."""
+        fetcher = make_fetcher(http_client)
+        source = await add_source(db_session, "technology", feed_server.url("/feeds/technology.xml"))
+
+        first = await fetcher.ingest_source(db_session, source)
+        second = await fetcher.ingest_source(db_session, source)
+
+        assert first.status == 200
+        assert first.etag.startswith('"')
+        assert first.last_modified == FEED_LAST_MODIFIED
+        assert (source.etag, source.last_modified) == (first.etag, first.last_modified)
+        assert source.last_fetched_at is not None
+
+        assert second.not_modified
+        assert second.ingested is None
+        _, _, headers = feed_server.requests[-1]
+        assert headers["If-None-Match"] == first.etag
+        assert headers["If-Modified-Since"] == FEED_LAST_MODIFIED
+
+    async def test_errors_are_reported(self, db_session: AsyncSession, feed_server: FeedServer):
+        """HTTP errors, timeouts and unreachable hosts become failed results."""
+        feed_server.slow_delay = 1.0
+        missing = await add_source(db_session, "missing", feed_server.url("/feeds/missing.xml"))
+        slow = await add_source(db_session, "slow", feed_server.url("/slow/technology.xml"))
+        unreachable = await add_source(db_session, "unreachable", "http://127.0.0.1:1/feed.xml")
+
+        async with httpx.AsyncClient(timeout=0.3) as client:
+            fetcher = make_fetcher(client)
+            missing, slow, unreachable = [
+                await fetcher.ingest_source(db_session, source)
+                for source in (missing, slow, unreachable)
+            ]
+
+        assert (missing.status, missing.error) == (404, "HTTP 404")
+        assert slow.status is None and "Timeout" in slow.error
+        assert unreachable.status is None and unreachable.error
+
+    async def test_per_host_concurrency_limit(self, http_client, db_session: AsyncSession, feed_server: FeedServer):
+        """Feeds are fetched concurrently, but at most N at once per host."""
+        feed_server.delay = 0.2
+        fetcher = make_fetcher(http_client, per_host_limit=2)
+        # Unchanged feeds: 304s never touch the session shared below
+        sources = [
+            NewsSource(
+                id=i,
+                rss_url=feed_server.url("/feeds/technology.xml", host=host),
+                last_modified=FEED_LAST_MODIFIED,
+            )
+            for i, host in enumerate(["127.0.0.1", "localhost"] * 4)
+        ]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            fetcher.ingest_source(db_session, source) for source in sources
+        ))
+        elapsed = time.perf_counter() - start
+
+        assert [r.source_id for r in results] == list(range(8))
+        assert all(r.not_modified for r in results)
+        assert set(feed_server.max_active.values()) == {2}
+        # Two hosts, two at a time each: two rounds instead of eight
+        assert elapsed < 8 * feed_server.delay * 0.75
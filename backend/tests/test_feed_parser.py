@@ -0,0 +1,121 @@
+"""Tests for the streaming RSS/Atom parser and streamed ingestion."""
+from datetime import UTC, datetime
+
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Article, NewsSource
+from app.services.feed_fetcher import FeedFetcher, create_http_client
+from app.services.feed_parser import FeedParser, parse_feed
+from tests.helpers import FEEDS_DIR, FeedServer
+
+
+def chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestParseFeed:
+    """Test turning feeds into article records."""
+
+    def test_rss(self):
+        """RSS items become normalized records."""
+        data = (FEEDS_DIR / "technology.xml").read_bytes()
+
+        records = list(parse_feed([data], source_id=7))
+
+        assert [r.url for r in records] == [
+            "https://tech.example.com/articles/chip",
+            "https://tech.example.com/articles/database",
+        ]
+        chip = records[0]
+        assert chip.title == "New chip doubles inference throughput"
+        assert chip.summary == "A new accelerator promises twice the throughput."
+        assert chip.source_id == 7
+        assert chip.published_at == datetime(2026, 10, 16, 8, tzinfo=UTC)
+        assert records[1].author is None
+
+    def test_atom(self):
+        """Atom entries use their alternate link and published date."""
+        data = (FEEDS_DIR / "science.xml").read_bytes()
+
+        (record,) = parse_feed([data], source_id=1)
+
+        assert record.url == "https://science.example.com/articles/galaxy"
+        assert record.author == "Grace Hopper"
+        assert record.published_at == datetime(2026, 10, 16, 11, tzinfo=UTC)
+
+    def test_chunk_boundaries_do_not_matter(self):
+        """Byte-sized chunks parse exactly like the whole document."""
+        data = (FEEDS_DIR / "technology.xml").read_bytes()
+
+        assert list(parse_feed(chunked(data, 1), 1)) == list(parse_feed([data], 1))
+
+    def test_records_flow_before_the_end(self):
+        """Items are available as soon as they close, with the tree pruned."""
+        parser = FeedParser(source_id=1)
+        head = b"<rss><channel><title>Feed</title>"
+        item = b"<item><title>T%d</title><link>https://x.example.com/%d</link></item>"
+
+        assert list(parser.feed(head)) == []
+        for i in range(100):
+            (record,) = parser.feed(item % (i, i))
+            assert record.url == f"https://x.example.com/{i}"
+        channel = parser._stack[-1]
+        assert [child.tag for child in channel] == ["title"]
+
+    def test_items_without_link_or_title_are_skipped(self):
+        """Incomplete items are dropped; permalink guids stand in for links."""
+        data = b"""<rss><channel>
+            <item><title>No link</title></item>
+            <item><link>https://x.example.com/untitled</link></item>
+            <item><title>Guid</title><guid>https://x.example.com/guid</guid></item>
+            <item><title>Opaque</title><guid isPermaLink="false">42</guid></item>
+        </channel></rss>"""
+
+        records = list(parse_feed([data], 1))
+
+        assert [r.url for r in records] == ["https://x.example.com/guid"]
+
+    def test_malformed_feed_keeps_parsed_items(self):
+        """A broken document ends the feed without losing earlier items."""
+        data = (
+            b"<rss><channel><item><title>Ok</title><link>https://x.example.com/ok</link>"
+            b"</item><item><title>Broken</wrong>"
+        )
+
+        records = list(parse_feed([data], 1))
+
+        assert [r.title for r in records] == ["Ok"]
+
+
+class TestIngestSource:
+    """Test streaming a feed from the network into the database."""
+
+    @pytest_asyncio.fixture
+    async def fetcher(self):
+        async with create_http_client() as client:
+            yield FeedFetcher(client, per_host_limit=2)
+
+    async def test_stream_into_ingestion(self, fetcher, db_session: AsyncSession, feed_server: FeedServer):
+        """A changed feed is parsed and written; an unchanged one is a 304."""
+        source = NewsSource(
+            name="Technology Daily",
+            url="https://tech.example.com",
+            rss_url=feed_server.url("/feeds/technology.xml"),
+        )
+        db_session.add(source)
+        await db_session.flush()
+
+        first = await fetcher.ingest_source(db_session, source)
+        second = await fetcher.ingest_source(db_session, source)
+
+        assert first.status == 200
+        assert len(first.ingested.new_ids) == 2
+        assert source.etag == first.etag
+        assert second.not_modified and second.ingested is None
+        result = await db_session.execute(select(Article.title).order_by(Article.title))
+        assert result.scalars().all() == [
+            "New chip doubles inference throughput",
+            "Open source database hits 1.0",
+        ]
@@ -55,3 +55,11 @@ def test_health_endpoint_structure():
     assert isinstance(data["service"], str)
     assert data["status"] == "healthy"
     assert data["service"] == "AI News Aggregator API"
+
+
+def test_health_caches_endpoint():
+    """Cache counters are exposed for monitoring."""
+    response = client.get("/health/caches")
+
+    assert response.status_code == 200
+    assert set(response.json()["tokens"]) == {"hits", "misses", "size"}
@@ -0,0 +1,133 @@
+"""Tests for bulk article ingestion."""
+from datetime import UTC, datetime
+
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Article, NewsSource
+from app.services import response_cache
+from app.services.ingestion import ArticleRecord, ingest_articles
+from app.services.response_cache import article_detail_lru
+from tests.helpers import count_queries
+
+
+@pytest_asyncio.fixture
+async def source(db_session: AsyncSession) -> NewsSource:
+    source = NewsSource(name="Feed Daily", url="https://feed.example.com")
+    db_session.add(source)
+    await db_session.flush()
+    return source
+
+
+def records(source: NewsSource, count: int, start: int = 0, title: str = "Story") -> list[ArticleRecord]:
+    published = datetime(2026, 10, 16, tzinfo=UTC)
+    return [
+        ArticleRecord(
+            url=f"https://feed.example.com/{i}",
+            title=f"{title} {i}",
+            source_id=source.id,
+            summary=f"Summary {i}",
+            published_at=published,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+async def finish_invalidations() -> None:
+    for task in list(response_cache._invalidation_tasks):
+        await task
+
+
+async def stored_articles(db_session: AsyncSession) -> list[Article]:
+    result = await db_session.execute(select(Article).order_by(Article.url))
+    return result.scalars().all()
+
+
+class TestIngestArticles:
+    """Test multi-row upserts keyed on Article.url."""
+
+    async def test_new_rows_are_returned(self, db_session: AsyncSession, source):
+        """Only articles that were not stored yet are reported as new."""
+        first = await ingest_articles(db_session, records(source, 3))
+        second = await ingest_articles(db_session, records(source, 4))
+
+        assert len(first.new_ids) == 3
+        assert len(second.new_ids) == 1
+        assert second.updated_ids == []
+        articles = await stored_articles(db_session)
+        assert len(articles) == 4
+        assert all(article.is_processed is False for article in articles)
+
+    async def test_one_statement_per_batch(self, db_session: AsyncSession, db_connection, source):
+        """Records are written in multi-row batches, even from a generator."""
+        with count_queries(db_connection) as statements:
+            result = await ingest_articles(
+                db_session, iter(records(source, 5)), batch_size=2
+            )
+
+        assert len(result.new_ids) == 5
+        assert len(statements) == 3
+        assert all("ON CONFLICT (canonical_url) DO NOTHING" in s for s in statements)
+
+    async def test_duplicates_within_a_batch(self, db_session: AsyncSession, source):
+        """Repeated URLs in one batch are written once, the last one winning."""
+        batch = records(source, 2) + records(source, 1, title="Retitled")
+
+        result = await ingest_articles(db_session, batch, update_existing=True)
+
+        assert len(result.new_ids) == 2
+        titles = [article.title for article in await stored_articles(db_session)]
+        assert titles == ["Retitled 0", "Story 1"]
+
+    async def test_update_existing_only_changed_rows(self, db_session: AsyncSession, source):
+        """Re-ingesting updates changed articles and requeues them."""
+        await ingest_articles(db_session, records(source, 2))
+        await db_session.execute(Article.__table__.update().values(is_processed=True))
+        changed = records(source, 1, title="Corrected")
+        unchanged = records(source, 1, start=1)
+
+        result = await ingest_articles(
+            db_session, changed + unchanged, update_existing=True
+        )
+
+        assert result.new_ids == []
+        assert len(result.updated_ids) == 1
+        db_session.expire_all()
+        first, second = await stored_articles(db_session)
+        assert (first.title, first.is_processed) == ("Corrected 0", False)
+        assert (second.title, second.is_processed) == ("Story 1", True)
+
+    async def test_new_articles_invalidate_counts(self, db_session: AsyncSession, count_cache, source):
+        """Cached listing totals are dropped once the added articles commit."""
+        _, generation = await count_cache.get((None, None))
+        await count_cache.set((None, None), 0, generation)
+
+        await ingest_articles(db_session, records(source, 1))
+        # A read before the commit would cache the old total again
+        assert (await count_cache.get((None, None)))[0] == 0
+        await db_session.commit()
+        await finish_invalidations()
+
+        assert (await count_cache.get((None, None)))[0] is None
+        count = await db_session.scalar(select(func.count(Article.id)))
+        assert count == 1
+
+    async def test_changed_details_invalidated_after_commit(self, db_session: AsyncSession, source):
+        """A committed update drops the cached detail; a rolled back one leaves it."""
+        await ingest_articles(db_session, records(source, 1))
+        await db_session.commit()
+        [article] = await stored_articles(db_session)
+        article_id = article.id
+
+        article_detail_lru.set(article_id, '"v1"', b"cached")
+        await ingest_articles(db_session, records(source, 1, title="Corrected"), update_existing=True)
+        await db_session.commit()
+        await finish_invalidations()
+        assert article_detail_lru.get(article_id) is None
+
+        article_detail_lru.set(article_id, '"v2"', b"cached")
+        await ingest_articles(db_session, records(source, 1, title="Retracted"), update_existing=True)
+        await db_session.rollback()
+        await finish_invalidations()
+        assert article_detail_lru.get(article_id) == ('"v2"', b"cached")
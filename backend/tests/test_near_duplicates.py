@@ -0,0 +1,222 @@
+"""Tests for MinHash LSH near-duplicate detection at ingest time."""
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Article, ArticleLshBucket, NewsSource
+from app.services.article_processing import claim_articles
+from app.services.ingestion import ArticleRecord, ingest_articles
+from app.services.near_duplicates import NearDuplicateIndex
+from app.utils.minhash import MinHasher, band_buckets, shingles
+from tests.helpers import count_queries
+
+WIRE_STORY = (
+    "The central bank raised its benchmark interest rate by a quarter of a "
+    "percentage point on Tuesday, citing persistent inflation in services and "
+    "a labour market that remains tight despite a year of increases. "
+    "Policymakers said further moves were possible if price growth does not "
+    "slow in the coming months, and markets now expect at least one more hike "
+    "before the end of the year. Mortgage lenders are likely to pass on the "
+    "increase to borrowers within days, analysts said."
+)
+# The same story as another outlet runs it
+SYNDICATED = WIRE_STORY.replace("on Tuesday", "on Tuesday afternoon") + " (Wire report)"
+OTHER_STORY = (
+    "A new space telescope captured detailed images of a distant galaxy "
+    "cluster, revealing gravitational lensing that astronomers say could help "
+    "map the dark matter of the early universe. The team plans to publish its "
+    "first measurements next spring, after calibrating the instrument against "
+    "observations from ground based observatories in Chile and Hawaii."
+)
+
+
+@pytest.fixture
+def index() -> NearDuplicateIndex:
+    return NearDuplicateIndex(
+        num_perm=128, bands=32, threshold=0.8, shingle_size=3, min_shingles=20
+    )
+
+
+@pytest_asyncio.fixture
+async def sources(db_session: AsyncSession) -> list[NewsSource]:
+    sources = [
+        NewsSource(name=name, url=f"https://{name}.example.com")
+        for name in ("wire", "daily", "science")
+    ]
+    db_session.add_all(sources)
+    await db_session.flush()
+    return sources
+
+
+def record(source: NewsSource, slug: str, summary: str) -> ArticleRecord:
+    return ArticleRecord(
+        url=f"https://{source.name}.example.com/{slug}",
+        title="Central bank raises rates",
+        source_id=source.id,
+        summary=summary,
+    )
+
+
+class TestMinHash:
+    """Test the signatures and their LSH bands."""
+
+    def test_similarity_estimates_jaccard(self):
+        hasher = MinHasher(256)
+        first, second = shingles(WIRE_STORY, 3), shingles(SYNDICATED, 3)
+        jaccard = len(set(first.tolist()) & set(second.tolist())) / len(
+            set(first.tolist()) | set(second.tolist())
+        )
+
+        estimate = hasher.similarity(hasher.signature(first), hasher.signature(second))
+        unrelated = hasher.similarity(
+            hasher.signature(first), hasher.signature(shingles(OTHER_STORY, 3))
+        )
+
+        assert abs(estimate - jaccard) < 0.1
+        assert unrelated < 0.1
+
+    def test_signatures_are_stable(self):
+        """Stored signatures stay comparable with new hashers and after a roundtrip."""
+        hashes = shingles("<p>The Central Bank</p> raised, rates!", 3)
+        signature = MinHasher(64).signature(hashes)
+
+        assert len(hashes) == 3
+        assert (MinHasher(64).signature(shingles("the central bank raised rates", 3)) == signature).all()
+        assert (MinHasher.from_bytes(MinHasher.to_bytes(signature)) == signature).all()
+        assert band_buckets(signature, 8) == band_buckets(signature.copy(), 8)
+        assert len(set(band_buckets(signature, 8))) == 8
+
+    def test_short_texts_are_not_fingerprinted(self, index: NearDuplicateIndex):
+        assert index.fingerprint("Central bank raises rates") is None
+        assert len(index.fingerprint(WIRE_STORY).buckets) == 32
+
+    def test_bands_must_divide_permutations(self):
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(num_perm=128, bands=30, threshold=0.8, shingle_size=3, min_shingles=1)
+
+
+class TestIngestion:
+    """Test linking near-duplicates to their canonical article."""
+
+    async def test_syndicated_copy_links_to_canonical(
+        self, db_session: AsyncSession, db_connection, index, sources
+    ):
+        """A copy from another source is stored processed, pointing at the original."""
+        wire, daily, science = sources
+        first = await ingest_articles(
+            db_session, [record(wire, "rates", WIRE_STORY)], duplicates=index
+        )
+        with count_queries(db_connection) as statements:
+            second = await ingest_articles(
+                db_session,
+                [record(daily, "rates", SYNDICATED), record(science, "lensing", OTHER_STORY)],
+                duplicates=index,
+            )
+
+        [original] = first.new_ids
+        copy, other = second.new_ids
+        assert second.duplicate_ids == [copy]
+        # Probe the index, insert, index the new canonical article
+        assert len(statements) == 3
+        rows = dict((await db_session.execute(
+            select(Article.id, Article.duplicate_of_id).where(Article.id.in_([original, copy, other])))
+        ).all())
+        assert rows == {original: None, copy: original, other: None}
+        indexed = await db_session.scalars(
+            select(ArticleLshBucket.article_id).distinct()
+        )
+        assert sorted(indexed) == [original, other]
+
+        _, claimed = await claim_articles(db_session, batch_size=10, lease_seconds=60)
+        assert sorted(article.id for article in claimed) == [original, other]
+
+    async def test_duplicates_within_a_batch(self, db_session: AsyncSession, index, sources):
+        """The first of two copies in one batch is canonical."""
+        wire, daily, _ = sources
+
+        result = await ingest_articles(
+            db_session,
+            [record(wire, "rates", WIRE_STORY), record(daily, "rates", SYNDICATED)],
+            duplicates=index,
+        )
+
+        original, copy = result.new_ids
+        assert result.duplicate_ids == [copy]
+        stored = await db_session.get(Article, copy)
+        assert (stored.duplicate_of_id, stored.is_processed) == (original, True)
+        buckets = await db_session.scalar(select(func.count()).select_from(ArticleLshBucket))
+        assert buckets == 32
+
+    async def test_rewritten_article_is_indexed_again(
+        self, db_session: AsyncSession, index, sources
+    ):
+        """A re-ingested canonical article is matched by its new text only."""
+        wire, daily, science = sources
+        [original] = (await ingest_articles(
+            db_session, [record(wire, "rates", WIRE_STORY)], duplicates=index
+        )).new_ids
+
+        rewritten = await ingest_articles(
+            db_session,
+            [record(wire, "rates", OTHER_STORY)],
+            update_existing=True,
+            duplicates=index,
+        )
+        later = await ingest_articles(
+            db_session,
+            [record(daily, "rates", WIRE_STORY), record(science, "lensing", OTHER_STORY)],
+            duplicates=index,
+        )
+
+        assert rewritten.updated_ids == [original]
+        minhash = await db_session.scalar(
+            select(Article.minhash).where(Article.id == original)
+        )
+        fingerprint = index.fingerprint(
+            "\n".join(("Central bank raises rates", OTHER_STORY))
+        )
+        assert minhash == MinHasher.to_bytes(fingerprint.signature)
+        buckets = await db_session.scalars(
+            select(ArticleLshBucket.bucket)
+            .where(ArticleLshBucket.article_id == original)
+            .order_by(ArticleLshBucket.band)
+        )
+        assert list(buckets) == fingerprint.buckets
+        wire_copy, lensing_copy = later.new_ids
+        assert later.duplicate_ids == [lensing_copy]
+        stored = await db_session.get(Article, lensing_copy)
+        assert stored.duplicate_of_id == original
+
+    async def test_without_index_nothing_is_linked(self, db_session: AsyncSession, index, sources):
+        wire, daily, _ = sources
+
+        result = await ingest_articles(
+            db_session, [record(wire, "rates", WIRE_STORY), record(daily, "rates", SYNDICATED)]
+        )
+
+        assert len(result.new_ids) == 2 and result.duplicate_ids == []
+        assert await index.match(db_session, {"copy": index.fingerprint(SYNDICATED)}) == {}
+
+    async def test_listings_leave_out_duplicates(
+        self, client: AsyncClient, db_session: AsyncSession, index, sources
+    ):
+        """Listings, totals and search show only the canonical article."""
+        wire, daily, _ = sources
+        result = await ingest_articles(
+            db_session,
+            [record(wire, "rates", WIRE_STORY), record(daily, "rates", SYNDICATED)],
+            duplicates=index,
+        )
+        original, copy = result.new_ids
+
+        listing = (await client.get("/articles/", params={"total": "exact"})).json()
+        search = (await client.get("/articles/", params={"search": "benchmark"})).json()
+
+        assert [article["id"] for article in listing["articles"]] == [original]
+        assert listing["total"] == 1
+        assert [article["id"] for article in search["articles"]] == [original]
+        assert search["total"] == 1
+        # The copy itself is still there to follow links to
+        assert (await client.get(f"/articles/{copy}")).status_code == 200
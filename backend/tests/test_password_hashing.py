@@ -0,0 +1,140 @@
+"""Tests for the bounded bcrypt worker pool behind the auth routes."""
+import asyncio
+import threading
+import time
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import security
+from app.core.security import PasswordHashingBusy, PasswordHashPool, get_password_hash
+from app.db.base import get_db
+from app.db.models import User
+from app.main import app
+
+LOGIN_FORM = {"username": "burstuser", "password": "burstpassword123"}
+
+
+@pytest_asyncio.fixture
+async def burst_client(engine) -> AsyncGenerator[AsyncClient, None]:
+    """Client whose requests get their own pooled connections.
+
+    The shared test connection cannot serve concurrent requests, so the
+    login user is committed for real and removed afterwards.
+    """
+    SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with SessionLocal() as session:
+        session.add(User(
+            email="burst@example.com",
+            username=LOGIN_FORM["username"],
+            hashed_password=get_password_hash(LOGIN_FORM["password"]),
+        ))
+        await session.commit()
+
+    async def pooled_get_db():
+        async with SessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = pooled_get_db
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        async with SessionLocal() as session:
+            await session.execute(delete(User).where(User.username == LOGIN_FORM["username"]))
+            await session.commit()
+
+
+def use_pool(monkeypatch, max_workers: int, max_pending: int) -> PasswordHashPool:
+    pool = PasswordHashPool(max_workers=max_workers, max_pending=max_pending)
+    monkeypatch.setattr(security, "password_hash_pool", pool)
+    return pool
+
+
+class TestPasswordHashPool:
+    """Test that bcrypt never runs on the event loop."""
+
+    async def test_health_stays_responsive_during_login_burst(
+        self, burst_client: AsyncClient, monkeypatch
+    ):
+        """/health answers promptly while a burst of logins is hashing."""
+        use_pool(monkeypatch, max_workers=2, max_pending=16)
+        start = time.perf_counter()
+        get_password_hash(LOGIN_FORM["password"])
+        bcrypt_time = time.perf_counter() - start
+
+        logins = asyncio.gather(*(
+            burst_client.post("/auth/login", data=LOGIN_FORM) for _ in range(8)
+        ))
+        latencies = []
+        while not logins.done():
+            start = time.perf_counter()
+            response = await burst_client.get("/health/")
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+            await asyncio.sleep(0.01)
+        responses = await logins
+
+        assert [r.status_code for r in responses] == [200] * 8
+        # The burst keeps the pool busy for several bcrypt rounds...
+        assert len(latencies) > 5
+        # ...but never blocks the loop for one
+        assert max(latencies) < bcrypt_time / 2
+
+    async def test_saturated_pool_fails_fast(
+        self, burst_client: AsyncClient, monkeypatch
+    ):
+        """Logins beyond the workers and queue get an immediate 503."""
+        use_pool(monkeypatch, max_workers=1, max_pending=1)
+
+        responses = await asyncio.gather(*(
+            burst_client.post("/auth/login", data=LOGIN_FORM) for _ in range(4)
+        ))
+
+        statuses = sorted(r.status_code for r in responses)
+        assert statuses == [200, 200, 503, 503]
+        rejected = next(r for r in responses if r.status_code == 503)
+        assert rejected.headers["Retry-After"] == "1"
+
+    async def test_pool_releases_slots(self):
+        """Slots are freed after success and failure alike."""
+        pool = PasswordHashPool(max_workers=1, max_pending=0)
+
+        def fail():
+            raise ValueError("boom")
+
+        assert await pool.run(sum, [1, 2]) == 3
+        with pytest.raises(ValueError):
+            await pool.run(fail)
+        assert pool.in_flight == 0
+
+        blocker = asyncio.ensure_future(pool.run(time.sleep, 0.05))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHashingBusy):
+            await pool.run(sum, [])
+        await blocker
+        assert pool.in_flight == 0
+
+    async def test_cancelled_caller_keeps_slot_until_hash_ends(self):
+        """A request that goes away does not free a worker still hashing for it."""
+        pool = PasswordHashPool(max_workers=1, max_pending=0)
+        release = threading.Event()
+
+        waiter = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert pool.in_flight == 1
+        with pytest.raises(PasswordHashingBusy):
+            await pool.run(sum, [])
+        release.set()
+        while pool.in_flight:
+            await asyncio.sleep(0.01)
+        assert await pool.run(sum, [1, 2]) == 3
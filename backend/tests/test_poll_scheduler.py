@@ -0,0 +1,366 @@
+"""Tests for adaptive feed polling."""
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.models import Article, NewsSource
+from app.services.feed_fetcher import FeedFetcher, FetchResult, create_http_client
+from app.services.ingestion import IngestResult
+from app.services.poll_scheduler import (
+    PollScheduler,
+    learn_cadences,
+    poll_due_sources,
+    run_poller,
+)
+from tests.helpers import FeedServer
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+@pytest.fixture
+def scheduler() -> PollScheduler:
+    return PollScheduler(
+        min_interval=5 * MINUTE,
+        max_interval=DAY,
+        default_interval=HOUR,
+        backoff_factor=2.0,
+    )
+
+
+def fetched(status: int | None, new_ids: list[int] | None = None) -> FetchResult:
+    ingested = IngestResult(new_ids=new_ids) if new_ids is not None else None
+    return FetchResult(source_id=0, url="", status=status, ingested=ingested)
+
+
+async def add_source(db: AsyncSession, name: str, gaps: list[float], **fields) -> NewsSource:
+    """A source with articles published ``gaps`` seconds apart, latest an hour ago."""
+    source = NewsSource(name=name, url=f"https://{name}.example.com", rss_url="http://feed", **fields)
+    db.add(source)
+    await db.flush()
+    published_at = datetime.now(UTC) - timedelta(hours=1)
+    for i, gap in enumerate([0.0, *gaps]):
+        published_at -= timedelta(seconds=gap)
+        db.add(Article(
+            title=f"{name} {i}",
+            url=f"https://{name}.example.com/{i}",
+            source_id=source.id,
+            published_at=published_at,
+        ))
+    await db.flush()
+    return source
+
+
+class TestIntervals:
+    """Test how intervals follow cadence and misses."""
+
+    def test_twice_per_publish_interval(self, scheduler: PollScheduler):
+        """Sources are polled at half their cadence, within the bounds."""
+        assert scheduler.interval_for(2 * HOUR, 0) == HOUR
+        assert scheduler.interval_for(MINUTE, 0) == 5 * MINUTE
+        assert scheduler.interval_for(7 * DAY, 0) == DAY
+        assert scheduler.interval_for(None, 0) == HOUR
+
+    def test_backoff_is_capped(self, scheduler: PollScheduler):
+        """Every miss doubles the interval, never beyond the maximum."""
+        assert [scheduler.interval_for(2 * HOUR, misses) for misses in range(3)] == [
+            HOUR, 2 * HOUR, 4 * HOUR,
+        ]
+        assert scheduler.interval_for(2 * HOUR, 20) == DAY
+
+
+class TestLearnCadences:
+    """Test learning publish cadences from ingested articles."""
+
+    async def test_median_gap(self, db_session: AsyncSession):
+        """The cadence is the median gap; sources without a gap are left out."""
+        wire = await add_source(db_session, "wire", [600, 600, 60, 6000])
+        lone = await add_source(db_session, "lone", [])
+        stale = await add_source(db_session, "stale", [40 * DAY])
+
+        cadences = await learn_cadences(db_session)
+
+        assert cadences == {wire.id: 600.0}
+        assert lone.id not in cadences and stale.id not in cadences
+
+
+class TestQueue:
+    """Test the priority queue of due sources."""
+
+    async def test_due_order_and_backoff(self, db_session: AsyncSession, scheduler: PollScheduler):
+        """New sources are due now; misses push a source back, news resets it."""
+        now = datetime.now(UTC)
+        wire = await add_source(db_session, "wire", [600, 600, 600])
+        blog = await add_source(
+            db_session, "blog", [],
+            last_fetched_at=now - timedelta(minutes=10),
+            next_poll_at=now + timedelta(minutes=50),
+        )
+        await scheduler.load(db_session, now)
+
+        assert [s.source_id for s in scheduler.pop_due(now)] == [wire.id]
+        assert scheduler.next_due_at() == now + timedelta(minutes=50)
+
+        scheduler.record(wire, fetched(304), now)
+        assert (wire.poll_misses, wire.poll_interval) == (1, 10 * MINUTE)
+        scheduler.record(wire, fetched(None), now)
+        assert (wire.poll_misses, wire.poll_interval) == (2, 20 * MINUTE)
+        scheduler.record(wire, fetched(200, new_ids=[]), now)
+        assert wire.poll_misses == 3
+        scheduler.record(wire, fetched(200, new_ids=[1]), now)
+        assert (wire.poll_misses, wire.next_poll_at) == (0, now + timedelta(minutes=5))
+
+        assert [s.source_id for s in scheduler.snapshot()] == [wire.id, blog.id]
+        assert scheduler.pop_due(now + timedelta(minutes=5)) == [scheduler.snapshot()[0]]
+        assert [s.source_id for s in scheduler.pop_due(now + timedelta(hours=1))] == [blog.id]
+        assert scheduler.next_due_at() is None
+
+    async def test_faster_cadence_brings_poll_forward(
+        self, db_session: AsyncSession, scheduler: PollScheduler
+    ):
+        """A stored next poll is moved up when the source sped up."""
+        now = datetime.now(UTC)
+        await add_source(
+            db_session, "wire", [600, 600],
+            last_fetched_at=now, next_poll_at=now + timedelta(hours=6),
+        )
+
+        await scheduler.load(db_session, now)
+
+        assert scheduler.next_due_at() == now + timedelta(minutes=5)
+
+
+def test_adaptive_beats_fixed_interval(scheduler: PollScheduler):
+    """Over a simulated day: fresher wire headlines with fewer requests.
+
+    A wire service publishes every 5 minutes and a blog every 2 days; the
+    fixed schedule polls both every 5 minutes to be as fresh on the wire.
+    """
+    publish_every = {"wire": 5 * MINUTE, "blog": 2 * DAY}
+    cadence = {"wire": 5 * MINUTE, "blog": 2 * DAY}
+
+    def simulate(interval_of) -> tuple[int, float]:
+        requests, wire_lags = 0, []
+        for name, every in publish_every.items():
+            t, misses, last_seen = 0.0, 0, -every
+            while t < DAY:
+                requests += 1
+                # Articles come out 137 s into each publishing period
+                latest = t - (t - 137) % every
+                new = latest > last_seen
+                if name == "wire" and new:
+                    wire_lags.append(t - latest)
+                last_seen = max(last_seen, latest)
+                misses = 0 if new else misses + 1
+                t += interval_of(name, misses)
+        return requests, sum(wire_lags) / len(wire_lags)
+
+    fixed_requests, fixed_lag = simulate(lambda name, misses: 5 * MINUTE)
+    adaptive_requests, adaptive_lag = simulate(
+        lambda name, misses: scheduler.interval_for(cadence[name], misses)
+    )
+
+    summary = (
+        f"requests/day fixed {fixed_requests} -> adaptive {adaptive_requests}, "
+        f"wire lag {fixed_lag:.0f} s -> {adaptive_lag:.0f} s"
+    )
+    assert adaptive_requests < fixed_requests * 0.6, summary
+    assert adaptive_lag <= fixed_lag, summary
+
+
+class TestPolling:
+    """Test polling due sources end to end."""
+
+    @pytest_asyncio.fixture
+    async def fetcher(self):
+        async with create_http_client() as client:
+            yield FeedFetcher(client, per_host_limit=2)
+
+    async def test_poll_due_sources(
+        self, db_connection, db_session: AsyncSession, scheduler: PollScheduler,
+        fetcher: FeedFetcher, feed_server: FeedServer,
+    ):
+        """Due feeds are ingested and rescheduled; unchanged ones back off."""
+        source = NewsSource(
+            name="Technology Daily",
+            url="https://tech.example.com",
+            rss_url=feed_server.url("/feeds/technology.xml"),
+        )
+        db_session.add(source)
+        await db_session.flush()
+        session_factory = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+        now = datetime.now(UTC)
+
+        await scheduler.load(db_session, now)
+        (first,) = await poll_due_sources(session_factory, scheduler, fetcher, now)
+        (schedule,) = scheduler.snapshot()
+        interval = schedule.interval
+        (second,) = await poll_due_sources(session_factory, scheduler, fetcher, schedule.next_poll_at)
+
+        assert len(first.ingested.new_ids) == 2
+        assert second.not_modified
+        await db_session.refresh(source)
+        assert source.poll_misses == 1
+        assert source.poll_interval == 2 * interval
+
+    async def test_slow_and_failing_sources_are_misses(
+        self, db_connection, db_session: AsyncSession, scheduler: PollScheduler,
+        fetcher: FeedFetcher, feed_server: FeedServer, monkeypatch,
+    ):
+        """A poll past its deadline or raising only backs its own source off."""
+        sources = [
+            NewsSource(name=name, url=f"https://{name}.example.com", rss_url=feed_server.url(path))
+            for name, path in [
+                ("fast", "/feeds/technology.xml"),
+                ("slow", "/slow/science.xml"),
+                ("broken", "/feeds/science.xml"),
+            ]
+        ]
+        db_session.add_all(sources)
+        await db_session.flush()
+        fast, slow, broken = (source.id for source in sources)
+        session_factory = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+        monkeypatch.setattr(settings, "POLL_SOURCE_TIMEOUT", 0.5)
+        ingest_source = fetcher.ingest_source
+
+        async def failing_ingest(db, source, **kwargs):
+            if source.id == broken:
+                raise RuntimeError("feed parser crashed")
+            return await ingest_source(db, source, **kwargs)
+
+        monkeypatch.setattr(fetcher, "ingest_source", failing_ingest)
+        now = datetime.now(UTC)
+
+        await scheduler.load(db_session, now)
+        results = {fetched.source_id: fetched for fetched in await poll_due_sources(
+            session_factory, scheduler, fetcher, now
+        )}
+
+        assert len(results[fast].ingested.new_ids) == 2
+        assert results[slow].error == "Timed out"
+        assert "feed parser crashed" in results[broken].error
+        misses = {schedule.source_id: schedule.misses for schedule in scheduler.snapshot()}
+        assert misses == {fast: 0, slow: 1, broken: 1}
+        # Back on the queue, and saved for the next load
+        assert scheduler.next_due_at() > now
+        await db_session.refresh(sources[1])
+        assert sources[1].poll_misses == 1
+
+    async def test_extraction_submitted_after_session_closes(
+        self, db_connection, db_session: AsyncSession, scheduler: PollScheduler,
+        fetcher: FeedFetcher, feed_server: FeedServer,
+    ):
+        """Waiting on a full extraction queue holds no pooled connection."""
+        db_session.add(NewsSource(
+            name="Technology Daily",
+            url="https://tech.example.com",
+            rss_url=feed_server.url("/feeds/technology.xml"),
+        ))
+        await db_session.flush()
+        sessions = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+        open_sessions = 0
+
+        @asynccontextmanager
+        async def session_factory():
+            nonlocal open_sessions
+            open_sessions += 1
+            try:
+                async with sessions() as session:
+                    yield session
+            finally:
+                open_sessions -= 1
+
+        class Extraction:
+            submitted: list[tuple[int, int]] = []
+
+            async def submit(self, article_id: int, url: str) -> None:
+                self.submitted.append((article_id, open_sessions))
+
+        await scheduler.load(db_session)
+        extraction = Extraction()
+        (fetched,) = await poll_due_sources(
+            session_factory, scheduler, fetcher, extraction=extraction
+        )
+
+        assert [article_id for article_id, _ in extraction.submitted] == fetched.ingested.new_ids
+        assert {sessions_open for _, sessions_open in extraction.submitted} == {0}
+
+    async def test_run_poller_until_stopped(
+        self, db_connection, db_session: AsyncSession, scheduler: PollScheduler,
+        fetcher: FeedFetcher, feed_server: FeedServer,
+    ):
+        """The poller loads the schedule, polls what is due and then waits."""
+        db_session.add(NewsSource(
+            name="Science Weekly",
+            url="https://science.example.com",
+            rss_url=feed_server.url("/feeds/science.xml"),
+        ))
+        await db_session.flush()
+        session_factory = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+        stop = asyncio.Event()
+
+        poller = asyncio.create_task(run_poller(session_factory, scheduler, fetcher, stop))
+        while not feed_server.requests:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        stop.set()
+        await asyncio.wait_for(poller, 5)
+
+        assert len(feed_server.requests) == 1
+        (schedule,) = scheduler.snapshot()
+        assert schedule.misses == 0
+        assert schedule.next_poll_at > datetime.now(UTC)
+
+    async def test_run_poller_does_not_wait_for_slow_sources(
+        self, db_connection, db_session: AsyncSession, scheduler: PollScheduler,
+        fetcher: FeedFetcher, feed_server: FeedServer,
+    ):
+        """A source falling due is polled while a slow one is still downloading."""
+        now = datetime.now(UTC)
+        db_session.add_all([
+            NewsSource(name="Slow", url="https://slow.example.com", rss_url=feed_server.url("/slow/science.xml")),
+            NewsSource(
+                name="Fast",
+                url="https://fast.example.com",
+                rss_url=feed_server.url("/feeds/technology.xml"),
+                last_fetched_at=now,
+                next_poll_at=now + timedelta(seconds=0.3),
+            ),
+        ])
+        await db_session.flush()
+        session_factory = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+        feed_server.slow_delay = 5
+        stop = asyncio.Event()
+
+        poller = asyncio.create_task(run_poller(session_factory, scheduler, fetcher, stop))
+        try:
+            async with asyncio.timeout(3):
+                while len(feed_server.requests) < 2:
+                    await asyncio.sleep(0.01)
+        finally:
+            stop.set()
+            await asyncio.wait_for(poller, 5)
+
+        assert [path for _, path, _ in feed_server.requests] == ["/slow/science.xml", "/feeds/technology.xml"]
+
+    async def test_schedule_endpoint(self, client: AsyncClient, db_session: AsyncSession):
+        """The stored schedule is exposed for inspection."""
+        due = datetime(2026, 10, 17, 12, tzinfo=UTC)
+        await add_source(db_session, "wire", [], poll_interval=600.0, poll_misses=0, next_poll_at=due)
+        await add_source(db_session, "new", [])
+
+        response = await client.get("/health/polling")
+
+        assert response.status_code == 200
+        sources = response.json()["sources"]
+        assert [s["name"] for s in sources] == ["new", "wire"]
+        assert sources[1]["poll_interval"] == 600.0
+        assert sources[1]["next_poll_at"] == due.isoformat()
+
@@ -0,0 +1,294 @@
+"""Tests for the Redis response cache of the article endpoints."""
+import asyncio
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.services.response_cache import (
+    BYPASS,
+    HIT,
+    MISS,
+    ResponseCache,
+    article_cache,
+    article_detail_lru,
+    invalidate_article,
+    invalidate_article_listings,
+)
+from app.utils.lru import SizedLRUCache
+from tests.helpers import count_queries, seed_articles
+
+
+@pytest_asyncio.fixture
+async def response_cache(client: AsyncClient, db_connection):
+    """Enable the article cache under a throwaway prefix for one test."""
+    redis = Redis.from_url(settings.REDIS_URL)
+    try:
+        await redis.ping()
+    except RedisError:
+        pytest.skip("Redis is not available")
+    finally:
+        await redis.aclose()
+
+    saved = article_cache.prefix, article_cache.session_factory, article_cache.enabled
+    article_cache.prefix = f"test-{uuid4().hex}"
+    article_cache.session_factory = async_sessionmaker(
+        bind=db_connection, class_=AsyncSession, expire_on_commit=False
+    )
+    article_cache.enabled = True
+    try:
+        yield article_cache
+    finally:
+        await article_cache.clear()
+        article_cache.prefix, article_cache.session_factory, article_cache.enabled = saved
+
+
+async def finish_refreshes(cache: ResponseCache) -> None:
+    """Wait for background stale-while-revalidate refreshes."""
+    await asyncio.gather(*cache._refresh_tasks)
+
+
+class TestArticleResponseCache:
+    """Test caching of GET /articles and GET /articles/{article_id}."""
+
+    async def test_listing_miss_then_hit(self, client: AsyncClient, db_session: AsyncSession, db_connection, response_cache):
+        """A repeated listing is served from Redis without touching the DB."""
+        await seed_articles(db_session, 5)
+
+        first = await client.get("/articles/", params={"per_page": 3})
+        with count_queries(db_connection) as statements:
+            second = await client.get("/articles/", params={"per_page": 3})
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        assert statements == []
+
+    async def test_detail_miss_then_hit(self, client: AsyncClient, db_session: AsyncSession, response_cache):
+        """Article detail responses are cached too."""
+        articles = await seed_articles(db_session, 1)
+
+        first = await client.get(f"/articles/{articles[0].id}")
+        article_detail_lru.clear()
+        second = await client.get(f"/articles/{articles[0].id}")
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+
+    async def test_not_found_is_not_cached(self, client: AsyncClient, response_cache):
+        """Errors are never stored."""
+        first = await client.get("/articles/424242")
+        second = await client.get("/articles/424242")
+
+        assert first.status_code == second.status_code == 404
+        assert "X-Cache" not in second.headers
+
+    async def test_keys_use_normalized_parameters(self, client: AsyncClient, db_session: AsyncSession, response_cache):
+        """Equivalent queries share an entry, different ones do not."""
+        await seed_articles(db_session, 5)
+
+        await client.get("/articles/", params={"per_page": 3})
+        same = await client.get("/articles/", params={"per_page": 3, "category": ""})
+        other = await client.get("/articles/", params={"per_page": 4})
+
+        assert same.headers["X-Cache"] == "HIT"
+        assert other.headers["X-Cache"] == "MISS"
+
+    async def test_stale_while_revalidate(self, client: AsyncClient, db_session: AsyncSession, response_cache, monkeypatch):
+        """Expired entries are served stale while one refresh runs."""
+        monkeypatch.setattr(settings, "ARTICLE_DETAIL_CACHE_TTL", 0)
+        (article,) = await seed_articles(db_session, 1)
+
+        await client.get(f"/articles/{article.id}")
+        article.title = "Updated headline"
+        await db_session.flush()
+
+        stale = await client.get(f"/articles/{article.id}")
+        assert stale.headers["X-Cache"] == "STALE"
+        assert stale.json()["title"] == "technology story 0"
+
+        await finish_refreshes(response_cache)
+        refreshed = await client.get(f"/articles/{article.id}")
+        assert refreshed.json()["title"] == "Updated headline"
+
+    async def test_invalidate_article(self, client: AsyncClient, db_session: AsyncSession, response_cache):
+        """Invalidating an article drops its detail and listings containing it."""
+        technology = await seed_articles(db_session, 2)
+        science = await seed_articles(db_session, 2, category="science")
+        article = technology[0]
+
+        await client.get(f"/articles/{article.id}")
+        await client.get("/articles/", params={"category": "technology"})
+        await client.get("/articles/", params={"category": "science"})
+
+        await invalidate_article(article.id)
+
+        detail = await client.get(f"/articles/{article.id}")
+        listing = await client.get("/articles/", params={"category": "technology"})
+        unrelated = await client.get("/articles/", params={"category": "science"})
+        other_detail = await client.get(f"/articles/{science[0].id}")
+
+        assert detail.headers["X-Cache"] == "MISS"
+        assert listing.headers["X-Cache"] == "MISS"
+        assert unrelated.headers["X-Cache"] == "HIT"
+        assert other_detail.headers["X-Cache"] == "MISS"
+
+    async def test_invalidate_listings(self, client: AsyncClient, db_session: AsyncSession, response_cache):
+        """Ingestion drops every cached listing but keeps article details."""
+        (article,) = await seed_articles(db_session, 1)
+        await client.get("/articles/")
+        await client.get(f"/articles/{article.id}")
+
+        await invalidate_article_listings()
+
+        listing = await client.get("/articles/")
+        detail = await client.get(f"/articles/{article.id}")
+        assert listing.headers["X-Cache"] == "MISS"
+        assert detail.headers["X-Cache"] == "LOCAL"
+
+    async def test_unavailable_redis_is_bypassed(self, db_session: AsyncSession):
+        """A Redis outage falls back to loading every response."""
+        cache = ResponseCache("redis://localhost:1", prefix="unreachable")
+        calls = []
+
+        async def loader(session):
+            calls.append(session)
+            return {"ok": True}, ["tag"]
+
+        payload, status = await cache.get_or_load("key", loader, db_session, ttl=10, stale_ttl=10)
+        await cache.invalidate("tag")
+
+        assert payload == {"ok": True}
+        assert status == BYPASS
+        assert calls == [db_session]
+
+    async def test_unresponsive_redis_is_bypassed(self, db_session: AsyncSession, monkeypatch):
+        """A server that accepts but never answers is given up on quickly."""
+        monkeypatch.setattr(settings, "REDIS_SOCKET_TIMEOUT", 0.1)
+
+        async def hang(reader, writer):
+            await reader.read()
+
+        server = await asyncio.start_server(hang, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        cache = ResponseCache(f"redis://127.0.0.1:{port}", prefix="hung")
+
+        async def loader(session):
+            return {"ok": True}, ["tag"]
+
+        try:
+            payload, status = await asyncio.wait_for(
+                cache.get_or_load("key", loader, db_session, ttl=10, stale_ttl=10), timeout=2
+            )
+        finally:
+            server.close()
+            await cache.redis.aclose()
+
+        assert (payload, status) == ({"ok": True}, BYPASS)
+
+    async def test_corrupt_entry_is_a_miss(self, db_session: AsyncSession, response_cache):
+        """An entry that does not decode is loaded again and replaced."""
+        key = response_cache.key("test", {})
+        calls = []
+
+        async def loader(session):
+            calls.append(session)
+            return {"ok": True}, ["tag"]
+
+        for corrupt in (b"{not json", b'{"payload": 1}'):
+            await response_cache.redis.set(key, corrupt)
+            assert await response_cache.get_or_load(key, loader, db_session, ttl=10, stale_ttl=10) == ({"ok": True}, MISS)
+        assert await response_cache.get_or_load(key, loader, db_session, ttl=10, stale_ttl=10) == ({"ok": True}, HIT)
+        assert len(calls) == 2
+
+
+class TestArticleDetailETag:
+    """Test ETags and the in-process LRU of GET /articles/{article_id}."""
+
+    async def test_etag_and_not_modified(self, client: AsyncClient, db_session: AsyncSession):
+        """A matching If-None-Match gets an empty 304 with the same ETag."""
+        (article,) = await seed_articles(db_session, 1)
+
+        first = await client.get(f"/articles/{article.id}")
+        etag = first.headers["ETag"]
+        not_modified = await client.get(
+            f"/articles/{article.id}", headers={"If-None-Match": etag}
+        )
+
+        assert etag.startswith('"') and not etag.startswith('W/')
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+
+    async def test_if_none_match_lists_and_weak_tags(self, client: AsyncClient, db_session: AsyncSession):
+        """Lists of tags and weak validators are compared weakly."""
+        (article,) = await seed_articles(db_session, 1)
+        etag = (await client.get(f"/articles/{article.id}")).headers["ETag"]
+
+        listed = await client.get(
+            f"/articles/{article.id}", headers={"If-None-Match": f'"other", W/{etag}'}
+        )
+        mismatch = await client.get(
+            f"/articles/{article.id}", headers={"If-None-Match": '"other"'}
+        )
+
+        assert listed.status_code == 304
+        assert mismatch.status_code == 200
+        assert mismatch.json()["id"] == article.id
+
+    async def test_etag_changes_with_article(self, client: AsyncClient, db_session: AsyncSession):
+        """Changing the article changes its ETag once the entry is dropped."""
+        (article,) = await seed_articles(db_session, 1)
+        etag = (await client.get(f"/articles/{article.id}")).headers["ETag"]
+
+        article.summary = "Rewritten summary"
+        await db_session.flush()
+        await invalidate_article(article.id)
+        response = await client.get(
+            f"/articles/{article.id}", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["summary"] == "Rewritten summary"
+
+    async def test_local_hit_skips_database(self, client: AsyncClient, db_session: AsyncSession, db_connection):
+        """Details served from the LRU run no queries."""
+        (article,) = await seed_articles(db_session, 1)
+        await client.get(f"/articles/{article.id}")
+
+        with count_queries(db_connection) as statements:
+            response = await client.get(f"/articles/{article.id}")
+
+        assert response.headers["X-Cache"] == "LOCAL"
+        assert statements == []
+
+    def test_lru_evicts_by_size(self):
+        """The LRU keeps its bodies within the byte budget."""
+        lru = SizedLRUCache(max_bytes=10, ttl=60)
+        lru.set("a", '"a"', b"aaaa")
+        lru.set("b", '"b"', b"bbbb")
+        lru.get("a")
+        lru.set("c", '"c"', b"cccc")
+
+        assert lru.get("b") is None
+        assert lru.get("a") == ('"a"', b"aaaa")
+        assert lru.get("c") == ('"c"', b"cccc")
+        assert lru.current_bytes == 8
+
+        lru.set("huge", '"h"', b"x" * 11)
+        assert lru.get("huge") is None
+        assert lru.current_bytes == 8
+
+    def test_lru_expiry(self):
+        """Entries expire after the TTL and never outlive a shorter one."""
+        lru = SizedLRUCache(max_bytes=100, ttl=60)
+        lru.set("a", '"a"', b"a", ttl=0)
+        assert lru.get("a") is None
+        assert lru.current_bytes == 0
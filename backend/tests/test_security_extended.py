@@ -1,13 +1,20 @@
 """Extended security tests for 100% coverage."""
 
+import time
 from datetime import timedelta
 
 from jose import jwt
 
 from app.core.config import settings
 from app.core.security import (
+    VerifiedTokenCache,
+    calibrate_bcrypt_rounds,
     create_access_token,
     get_password_hash,
+    pwd_context,
+    setup_password_hashing,
+    token_cache,
+    verify_and_update_password,
     verify_password,
     verify_token,
 )
@@ -71,3 +78,78 @@ def test_password_hashing_different_passwords():
     assert verify_password(password1, hash1) is True
     assert verify_password(password2, hash2) is True
     assert verify_password(password1, hash2) is False
+
+
+def test_verify_token_cache_hits():
+    """Repeated verification of a token is served from the cache."""
+    token = create_access_token(subject="cacheduser")
+
+    assert verify_token(token) == "cacheduser"
+    assert verify_token(token) == "cacheduser"
+    assert token_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_verify_token_cache_skips_invalid_tokens():
+    """Tokens that fail verification are never cached."""
+    payload = {"sub": "testuser", "exp": 9999999999}
+    wrong_token = jwt.encode(payload, "wrong-secret", algorithm=settings.ALGORITHM)
+
+    assert verify_token(wrong_token) is None
+    assert verify_token(wrong_token) is None
+    assert token_cache.stats() == {"hits": 0, "misses": 2, "size": 0}
+
+
+def test_token_cache_evicts_at_expiry():
+    """Entries disappear once the token expires."""
+    cache = VerifiedTokenCache(max_entries=10)
+    cache.set("soon", "user", time.time() + 0.05)
+    cache.set("expired", "user", time.time() - 1)
+
+    assert cache.get("soon") == "user"
+    assert cache.get("expired") is None
+    time.sleep(0.06)
+    assert cache.get("soon") is None
+    assert len(cache) == 0
+
+
+def test_token_cache_is_bounded():
+    """The least recently used token is evicted first."""
+    cache = VerifiedTokenCache(max_entries=2)
+    expires_at = time.time() + 60
+    cache.set("a", "alice", expires_at)
+    cache.set("b", "bob", expires_at)
+    cache.get("a")
+    cache.set("c", "carol", expires_at)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "alice"
+    assert cache.get("c") == "carol"
+
+
+def test_calibrate_bcrypt_rounds_tracks_target():
+    """A larger latency budget never yields a lower cost."""
+    low = calibrate_bcrypt_rounds(target_ms=5, min_rounds=4)
+    high = calibrate_bcrypt_rounds(target_ms=5000, min_rounds=4)
+
+    assert 4 <= low < high <= 16
+    assert calibrate_bcrypt_rounds(target_ms=0.001, min_rounds=10) == 10
+
+
+def test_verify_and_update_password_rehashes_on_cost_change(monkeypatch):
+    """Hashes of another cost verify and come back rehashed at the current one."""
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    saved = pwd_context.to_dict()
+    try:
+        assert setup_password_hashing() == 5
+        old_hash = pwd_context.handler("bcrypt").using(rounds=4).hash("secret")
+
+        valid, new_hash = verify_and_update_password("secret", old_hash)
+        assert valid is True
+        assert new_hash.startswith("$2b$05$")
+        assert verify_and_update_password("secret", new_hash) == (True, None)
+        assert verify_and_update_password("wrong", old_hash) == (False, None)
+        # Never downgraded
+        costlier = pwd_context.handler("bcrypt").using(rounds=6).hash("secret")
+        assert verify_and_update_password("secret", costlier) == (True, None)
+    finally:
+        pwd_context.load(saved)
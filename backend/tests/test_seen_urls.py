@@ -0,0 +1,201 @@
+"""Tests for URL canonicalization and the seen URL Bloom filter."""
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Article, NewsSource
+from app.services.feed_fetcher import FeedFetcher, create_http_client
+from app.services.ingestion import ArticleRecord, ingest_articles
+from app.services.seen_urls import SeenUrlFilter
+from app.utils.bloom import BloomFilter
+from app.utils.urls import canonicalize_url
+from tests.helpers import FeedServer
+
+
+class TestCanonicalizeUrl:
+    """Test which URL variants collapse to one canonical form."""
+
+    @pytest.mark.parametrize("variant", [
+        "http://news.example.com/story",
+        "https://News.Example.com/story/",
+        "https://news.example.com:443/story",
+        "http://news.example.com:80/story#comments",
+        "https://news.example.com/story?utm_source=rss&utm_medium=feed",
+        "  https://news.example.com/story?fbclid=abc&ref=home  ",
+    ])
+    def test_variants_of_one_story(self, variant: str):
+        assert canonicalize_url(variant) == "https://news.example.com/story"
+
+    def test_meaningful_parts_are_kept(self):
+        """Other ports, query parameters (sorted) and paths still differ."""
+        assert canonicalize_url("https://example.com:8443/a/") == "https://example.com:8443/a"
+        assert canonicalize_url("https://example.com/a?page=2&id=7&utm_campaign=x") == (
+            "https://example.com/a?id=7&page=2"
+        )
+        assert canonicalize_url("https://example.com") == "https://example.com/"
+        assert canonicalize_url("https://example.com/A") != canonicalize_url("https://example.com/a")
+
+    def test_other_schemes_are_left_alone(self):
+        assert canonicalize_url(" urn:uuid:1234 ") == "urn:uuid:1234"
+        assert canonicalize_url("ftp://Example.com/a/") == "ftp://Example.com/a/"
+
+
+class TestBloomFilter:
+    """Test the filter's guarantees and serialization."""
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(10_000, 0.01)
+        for i in range(10_000):
+            bloom.add(f"https://example.com/{i}")
+
+        assert all(f"https://example.com/{i}" in bloom for i in range(10_000))
+        false_positives = sum(f"https://other.example.com/{i}" in bloom for i in range(10_000))
+        assert false_positives < 200
+        assert bloom.is_full
+
+    def test_roundtrip(self):
+        bloom = BloomFilter(100, 0.001)
+        bloom.add("https://example.com/a")
+
+        loaded = BloomFilter.from_bytes(bloom.to_bytes())
+
+        assert "https://example.com/a" in loaded
+        assert "https://example.com/b" not in loaded
+        assert (loaded.capacity, loaded.count, loaded.num_hashes) == (100, 1, bloom.num_hashes)
+
+    @pytest.mark.parametrize("data", [b"", b"\x00" * 10])
+    def test_corrupt_data_is_rejected(self, data: bytes):
+        with pytest.raises(ValueError):
+            BloomFilter.from_bytes(data)
+
+    def test_truncated_bits_are_rejected(self):
+        with pytest.raises(ValueError):
+            BloomFilter.from_bytes(BloomFilter(100, 0.01).to_bytes()[:-1])
+
+
+@pytest_asyncio.fixture
+async def seen() -> SeenUrlFilter:
+    """A filter snapshotted under a throwaway key."""
+    redis = Redis.from_url(settings.REDIS_URL)
+    try:
+        await redis.ping()
+    except RedisError:
+        pytest.skip("Redis is not available")
+    finally:
+        await redis.aclose()
+
+    seen = SeenUrlFilter(
+        settings.REDIS_URL, capacity=1000, error_rate=1e-5, key=f"test-{uuid4().hex}"
+    )
+    try:
+        yield seen
+    finally:
+        await seen.clear()
+        await seen.redis.aclose()
+
+
+@pytest_asyncio.fixture
+async def source(db_session: AsyncSession) -> NewsSource:
+    source = NewsSource(name="Feed Daily", url="https://feed.example.com")
+    db_session.add(source)
+    await db_session.flush()
+    return source
+
+
+class TestSeenUrlFilter:
+    """Test loading, snapshotting and transactional updates of the filter."""
+
+    async def test_rebuild_then_load_snapshot(self, db_session: AsyncSession, seen, source):
+        """The filter is built from the database once, then read from Redis."""
+        db_session.add(Article(title="Story", url="https://feed.example.com/a", source_id=source.id))
+        await db_session.flush()
+        assert "https://feed.example.com/a" not in seen
+
+        await seen.load(db_session)
+        assert "https://feed.example.com/a" in seen
+        assert "https://feed.example.com/b" not in seen
+
+        restarted = SeenUrlFilter(settings.REDIS_URL, capacity=1000, error_rate=1e-5, key=seen.key)
+        await db_session.execute(Article.__table__.delete())
+        await restarted.load(db_session)
+        await restarted.redis.aclose()
+        assert "https://feed.example.com/a" in restarted
+
+    async def test_full_filter_is_rebuilt_larger(self, db_session: AsyncSession, seen, source):
+        """A full filter is rebuilt with room for twice the stored articles."""
+        await seen.load(db_session)
+        urls = [f"https://feed.example.com/{i}" for i in range(1000)]
+        await ingest_articles(
+            db_session, [ArticleRecord(url=url, title="Story", source_id=source.id) for url in urls]
+        )
+        seen.add(urls)
+        assert seen.needs_rebuild
+
+        await seen.refresh(db_session)
+
+        assert not seen.needs_rebuild
+        assert (seen.bloom.capacity, seen.bloom.count) == (2000, 1000)
+        assert all(url in seen for url in urls)
+
+    async def test_added_only_after_commit(self, db_session: AsyncSession, seen):
+        await seen.load(db_session)
+
+        seen.add_after_commit(db_session, ["https://feed.example.com/rolled-back"])
+        await db_session.rollback()
+        seen.add_after_commit(db_session, ["https://feed.example.com/committed"])
+        assert "https://feed.example.com/committed" not in seen
+        await db_session.commit()
+
+        assert "https://feed.example.com/committed" in seen
+        assert "https://feed.example.com/rolled-back" not in seen
+
+
+async def test_ingestion_stores_url_variants_once(db_session: AsyncSession, source):
+    """Tracking parameters and scheme changes do not duplicate an article."""
+    variants = [
+        "https://feed.example.com/story",
+        "http://feed.example.com/story/?utm_source=rss",
+        "https://FEED.example.com/story#top",
+    ]
+    first = await ingest_articles(db_session, [
+        ArticleRecord(url=variants[0], title="Story", source_id=source.id)
+    ])
+    second = await ingest_articles(db_session, [
+        ArticleRecord(url=url, title="Story", source_id=source.id) for url in variants[1:]
+    ])
+
+    assert len(first.new_ids) == 1 and second.new_ids == []
+    article = await db_session.scalar(select(Article))
+    assert (article.url, article.canonical_url) == (variants[0], variants[0])
+
+
+async def test_fetcher_skips_known_items(
+    db_session: AsyncSession, seen, feed_server: FeedServer
+):
+    """Once stored, a feed's items are dropped before reaching the database."""
+    source = NewsSource(
+        name="Technology Daily",
+        url="https://tech.example.com",
+        rss_url=feed_server.url("/feeds/technology.xml"),
+    )
+    db_session.add(source)
+    await db_session.flush()
+    await seen.load(db_session)
+
+    async with create_http_client() as client:
+        fetcher = FeedFetcher(client, per_host_limit=2, seen=seen)
+        first = await fetcher.ingest_source(db_session, source)
+        await db_session.commit()
+        # Changed validators force the feed to be downloaded again
+        source.etag = source.last_modified = None
+        second = await fetcher.ingest_source(db_session, source)
+
+    assert (len(first.ingested.new_ids), first.skipped) == (2, 0)
+    assert (second.ingested.new_ids, second.skipped) == ([], 2)
+    assert await db_session.scalar(select(func.count()).select_from(Article)) == 2
@@ -0,0 +1,147 @@
+"""Tests for the authenticated-user cache behind get_current_user."""
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.models import User
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import UserCache, user_cache
+from tests.helpers import count_queries
+
+
+def bearer(username: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=create_access_token(subject=username)
+    )
+
+
+@pytest_asyncio.fixture
+async def user(db_session: AsyncSession) -> User:
+    user = User(email="cached@example.com", username="cacheduser", hashed_password="hashed")
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+async def finish_invalidations() -> None:
+    for task in list(user_cache_module._invalidation_tasks):
+        await task
+
+
+class TestGetCurrentUserCache:
+    """Test that authentication skips the DB for recently seen users."""
+
+    async def test_repeated_lookup_skips_database(self, db_session: AsyncSession, db_connection, user):
+        """Only the first request for a subject queries the users table."""
+        first = await get_current_user(bearer("cacheduser"), db_session)
+        with count_queries(db_connection) as statements:
+            second = await get_current_user(bearer("cacheduser"), db_session)
+
+        assert statements == []
+        assert second.id == first.id
+        assert second.username == "cacheduser"
+        assert second.is_active is True
+        # The hash is never kept outside the database
+        assert second.hashed_password is None
+
+    async def test_deactivation_invalidates(self, db_session: AsyncSession, user):
+        """Committing a change to a user drops its cached entry."""
+        await get_current_user(bearer("cacheduser"), db_session)
+
+        user.is_active = False
+        await db_session.commit()
+        await finish_invalidations()
+
+        refreshed = await get_current_user(bearer("cacheduser"), db_session)
+        assert refreshed.is_active is False
+
+    async def test_rename_invalidates_old_name(self, db_session: AsyncSession, user):
+        """A renamed user no longer authenticates under the old name."""
+        await get_current_user(bearer("cacheduser"), db_session)
+
+        user.username = "renameduser"
+        await db_session.commit()
+        await finish_invalidations()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(bearer("cacheduser"), db_session)
+        assert exc_info.value.status_code == 401
+
+    async def test_rollback_keeps_entry(self, db_session: AsyncSession, db_connection, user):
+        """Changes that are rolled back do not invalidate anything."""
+        await get_current_user(bearer("cacheduser"), db_session)
+
+        user.is_active = False
+        await db_session.flush()
+        await db_session.rollback()
+
+        with count_queries(db_connection) as statements:
+            await get_current_user(bearer("cacheduser"), db_session)
+        assert statements == []
+
+    async def test_entries_expire(self, db_session: AsyncSession, db_connection, user, monkeypatch):
+        """Entries are reloaded after the TTL."""
+        monkeypatch.setattr(user_cache, "ttl", 0)
+        await get_current_user(bearer("cacheduser"), db_session)
+
+        with count_queries(db_connection) as statements:
+            await get_current_user(bearer("cacheduser"), db_session)
+        assert len(statements) == 1
+
+
+class TestRedisUserCache:
+    """Test the optional Redis level shared between workers."""
+
+    @pytest_asyncio.fixture
+    async def redis_url(self):
+        redis = Redis.from_url(settings.REDIS_URL)
+        try:
+            await redis.ping()
+        except RedisError:
+            pytest.skip("Redis is not available")
+        finally:
+            await redis.aclose()
+        return settings.REDIS_URL
+
+    async def test_workers_share_entries_and_invalidations(self, redis_url, user):
+        """A user cached by one worker is served to, and dropped for, another."""
+        username = f"user-{uuid4().hex}"
+        user.username = username
+        first = UserCache(ttl=60, max_entries=10, redis_url=redis_url)
+        second = UserCache(ttl=60, max_entries=10, redis_url=redis_url)
+
+        await first.set(user)
+        shared = await second.get(username)
+        assert shared.id == user.id
+        assert shared.created_at == user.created_at
+
+        await first.invalidate(username)
+        second.clear()
+        assert await second.get(username) is None
+
+    async def test_corrupt_entry_is_a_miss(self, redis_url, user):
+        """A shared entry that does not decode is ignored."""
+        username = f"user-{uuid4().hex}"
+        cache = UserCache(ttl=60, max_entries=10, redis_url=redis_url)
+        await cache.redis.set(cache._redis_key(username), b'{"id": 1}', ex=60)
+
+        assert await cache.get(username) is None
+        await cache.invalidate(username)
+
+    async def test_unavailable_redis_falls_back_to_database(self, user):
+        """A Redis outage only disables the shared level."""
+        cache = UserCache(ttl=60, max_entries=10, redis_url="redis://localhost:1")
+
+        await cache.set(user)
+        cache.clear()
+
+        assert await cache.get("cacheduser") is None